@@ -0,0 +1,233 @@
+"""
+analytics.py — Pipeline counters behind GET /analytics/pipeline.
+
+Three small tables (see models.py) hold everything the endpoint reports:
+
+  role_aggregates      roles and summed interview_probability per
+                       (go_no_go, status, probability decile)
+  step_aggregates      steps per (step_number, status) — the funnel
+  step_gap_aggregates  count and total seconds of the gaps between the
+                       completed_at stamps of step n-1 and step n
+
+Every write path in routes/roles.py and role_import.py records what it
+changed in a PipelineDelta and applies it in the same transaction, so the
+counters never drift from roles/steps and the endpoint reads a bounded
+number of rows however many roles exist. rebuild() recomputes them from
+scratch — used by the migration that introduced them.
+"""
+
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Mapping, Optional
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+
+from api.models import Role, RoleAggregate, Step, StepAggregate, StepGapAggregate, PIPELINE_STEPS
+
+# Role outcomes used for conversion and calibration: a role is "decided"
+# once it either reached interview or was rejected.
+INTERVIEW_STATUSES = ("interviewing", "offer")
+REJECTED_STATUSES  = ("rejected",)
+
+_STEP_NAMES = dict(PIPELINE_STEPS)
+
+
+def probability_bucket(probability: Optional[float]) -> int:
+    """Decile 0–9 of interview_probability; -1 when unset."""
+    if probability is None:
+        return -1
+    return min(max(int(probability * 10), 0), 9)
+
+
+def step_gaps(stamps: Mapping[int, Optional[datetime]]) -> dict[int, float]:
+    """step_number → seconds since the previous step's completed_at, where both are stamped and in order."""
+    gaps = {}
+    for step_number, stamp in stamps.items():
+        previous = stamps.get(step_number - 1)
+        if stamp is not None and previous is not None and stamp >= previous:
+            gaps[step_number] = (stamp - previous).total_seconds()
+    return gaps
+
+
+# ─── DELTAS ───────────────────────────────────────────────────────────────────
+
+class PipelineDelta:
+    """Counter changes collected during one transaction, written by apply()."""
+
+    def __init__(self):
+        self.roles       = Counter()   # (go_no_go, status, bucket) → roles
+        self.probability = Counter()   # (go_no_go, status, bucket) → summed probability
+        self.steps       = Counter()   # (step_number, status) → steps
+        self.gap_samples = Counter()   # step_number → gaps
+        self.gap_seconds = Counter()   # step_number → summed seconds
+
+    def role(self, go_no_go: Optional[str], status: str, probability: Optional[float], sign: int = 1) -> None:
+        key = (go_no_go or "", status, probability_bucket(probability))
+        self.roles[key]       += sign
+        self.probability[key] += sign * (probability or 0.0)
+
+    def step(self, step_number: int, status: str, sign: int = 1) -> None:
+        self.steps[(step_number, status)] += sign
+
+    def seeded_steps(self, roles: int) -> None:
+        """The 10 pending steps create_role / import_roles seed per role."""
+        for step_number, _ in PIPELINE_STEPS:
+            self.steps[(step_number, "pending")] += roles
+
+    def gaps(self, stamps: Mapping[int, Optional[datetime]], sign: int = 1) -> None:
+        for step_number, seconds in step_gaps(stamps).items():
+            self.gap_samples[step_number] += sign
+            self.gap_seconds[step_number] += sign * seconds
+
+    def restamp(self, before: Mapping[int, Optional[datetime]], after: Mapping[int, Optional[datetime]]) -> None:
+        """One role's completed_at stamps changed from before to after."""
+        self.gaps(before, -1)
+        self.gaps(after)
+
+    def apply(self, conn: Connection) -> None:
+        _increment(conn, RoleAggregate, ("go_no_go", "status", "probability_bucket"), [
+            {"go_no_go": key[0], "status": key[1], "probability_bucket": key[2],
+             "roles": self.roles[key], "probability_sum": self.probability[key]}
+            for key in set(self.roles) | set(self.probability)
+            if self.roles[key] or self.probability[key]
+        ])
+        _increment(conn, StepAggregate, ("step_number", "status"), [
+            {"step_number": n, "status": s, "steps": count}
+            for (n, s), count in self.steps.items() if count
+        ])
+        _increment(conn, StepGapAggregate, ("step_number",), [
+            {"step_number": n, "samples": self.gap_samples[n], "seconds": self.gap_seconds[n]}
+            for n in set(self.gap_samples) | set(self.gap_seconds)
+            if self.gap_samples[n] or self.gap_seconds[n]
+        ])
+
+
+def _increment(conn: Connection, model, keys: tuple[str, ...], rows: list[dict]) -> None:
+    """Add each row's counters to the matching aggregate row, creating it if needed."""
+    if not rows:
+        return
+    table    = model.__table__
+    counters = [name for name in rows[0] if name not in keys]
+    dialect  = {"sqlite": sqlite, "postgresql": postgresql}.get(conn.dialect.name)
+
+    if dialect is not None:
+        # One executemany INSERT … ON CONFLICT DO UPDATE SET n = n + excluded.n
+        statement = dialect.insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={name: table.c[name] + statement.excluded[name] for name in counters},
+        )
+        conn.execute(statement, rows)
+        return
+
+    for row in rows:
+        where  = [table.c[name] == row[name] for name in keys]
+        result = conn.execute(
+            update(table).where(*where).values({name: table.c[name] + row[name] for name in counters})
+        )
+        if result.rowcount == 0:
+            conn.execute(insert(table), [row])
+
+
+# ─── REBUILD ──────────────────────────────────────────────────────────────────
+
+def rebuild(conn: Connection) -> None:
+    """Recompute every counter from roles and steps."""
+    for model in (RoleAggregate, StepAggregate, StepGapAggregate):
+        conn.execute(delete(model))
+
+    delta = PipelineDelta()
+    for go_no_go, status, probability in conn.execute(
+        select(Role.go_no_go, Role.status, Role.interview_probability)
+    ).yield_per(5000):
+        delta.role(go_no_go, status, probability)
+
+    role_id, stamps = None, {}
+    for row in conn.execute(
+        select(Step.role_id, Step.step_number, Step.status, Step.completed_at)
+        .order_by(Step.role_id, Step.step_number)
+    ).yield_per(5000):
+        delta.step(row.step_number, row.status)
+        if row.role_id != role_id:
+            delta.gaps(stamps)
+            role_id, stamps = row.role_id, {}
+        stamps[row.step_number] = row.completed_at
+    delta.gaps(stamps)
+
+    delta.apply(conn)
+
+
+# ─── REPORT ───────────────────────────────────────────────────────────────────
+
+def _rate(numerator: float, denominator: float) -> Optional[float]:
+    return round(numerator / denominator, 4) if denominator else None
+
+
+def pipeline_report(conn: Connection) -> dict:
+    """Funnel, conversion, step timings and calibration from the counters alone."""
+    role_rows = conn.execute(select(RoleAggregate.__table__).where(RoleAggregate.roles != 0)).all()
+    step_rows = conn.execute(select(StepAggregate.__table__).where(StepAggregate.steps != 0)).all()
+    gap_rows  = conn.execute(
+        select(StepGapAggregate.__table__).where(StepGapAggregate.samples != 0)
+    ).all()
+
+    funnel: dict[int, dict[str, int]] = defaultdict(dict)
+    for row in step_rows:
+        funnel[row.step_number][row.status] = row.steps
+
+    conversion  = defaultdict(Counter)   # go_no_go → outcome counts
+    calibration = defaultdict(Counter)   # bucket → decided / interviewed / predicted sum
+    for row in role_rows:
+        outcome = ("interviewed" if row.status in INTERVIEW_STATUSES
+                   else "rejected" if row.status in REJECTED_STATUSES else "open")
+        conversion[row.go_no_go]["roles"] += row.roles
+        conversion[row.go_no_go][outcome] += row.roles
+        if outcome != "open" and row.probability_bucket >= 0:
+            bucket = calibration[row.probability_bucket]
+            bucket["decided"]       += row.roles
+            bucket["interviewed"]   += row.roles if outcome == "interviewed" else 0
+            bucket["predicted_sum"] += row.probability_sum
+
+    def outcome_summary(counts: Counter) -> dict:
+        decided = counts["interviewed"] + counts["rejected"]
+        return {
+            "roles":          counts["roles"],
+            "interviewed":    counts["interviewed"],
+            "rejected":       counts["rejected"],
+            "open":           counts["open"],
+            "interview_rate": _rate(counts["interviewed"], decided),
+        }
+
+    overall = sum(conversion.values(), Counter())
+    return {
+        "total_roles": overall["roles"],
+        "overall":     outcome_summary(overall),
+        "funnel": [
+            {"step_number": n, "step_name": name, "statuses": funnel.get(n, {})}
+            for n, name in PIPELINE_STEPS
+        ],
+        "conversion_by_go_no_go": {
+            (go_no_go or "unset"): outcome_summary(counts)
+            for go_no_go, counts in sorted(conversion.items())
+        },
+        "step_durations": [
+            {
+                "step_number": row.step_number,
+                "step_name":   _STEP_NAMES.get(row.step_number, ""),
+                "samples":     row.samples,
+                "avg_hours":   round(row.seconds / row.samples / 3600, 3),
+            }
+            for row in sorted(gap_rows, key=lambda row: row.step_number)
+        ],
+        "calibration": [
+            {
+                "bucket":    f"{b / 10:.1f}–{(b + 1) / 10:.1f}",
+                "decided":   counts["decided"],
+                "predicted": _rate(counts["predicted_sum"], counts["decided"]),
+                "observed":  _rate(counts["interviewed"], counts["decided"]),
+            }
+            for b, counts in sorted(calibration.items())
+        ],
+    }
@@ -0,0 +1 @@
+# Benchmarks — standalone scripts, run with `python -m api.bench.<name>`.
@@ -0,0 +1,141 @@
+"""
+bench/changes_feed.py — Re-polling GET /roles vs following GET /changes.
+
+Seeds --roles roles on a throwaway SQLite file, then runs --cycles sync
+cycles in which a few roles and steps change. Each cycle a "poller"
+re-downloads every page of GET /roles plus one role's steps, while a
+"follower" asks GET /changes for what happened since its cursor. Reports
+bytes and SQL statements per cycle for both, then the delay between a
+commit and a waiting long-poll (wait=5) returning it.
+
+Run from the repo root:
+  python -m api.bench.changes_feed [--roles 5000] [--cycles 20]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from api.database import Base, count_queries, get_db, make_engine
+from api.migrations import migrate
+from api.routes.changes import router as changes_router
+from api.routes.roles import bulk_router, router as roles_router
+
+
+def _client(engine) -> TestClient:
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def _get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(roles_router)
+    app.include_router(bulk_router)
+    app.include_router(changes_router)
+    app.dependency_overrides[get_db] = _get_db
+    return TestClient(app)
+
+
+def _poll_everything(client: TestClient, role_id: int) -> int:
+    """What the dashboard does today: every page of roles, plus one role's steps."""
+    received, cursor = 0, None
+    while True:
+        response  = client.get("/roles", params={"limit": 1000, **({"cursor": cursor} if cursor else {})})
+        received += len(response.content)
+        cursor    = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+    return received + len(client.get(f"/roles/{role_id}/steps").content)
+
+
+def _mutate(client: TestClient, rng: random.Random, role_ids: list[int]) -> None:
+    for _ in range(3):
+        client.patch(f"/roles/{rng.choice(role_ids)}", json={"notes": f"n{rng.random()}"})
+    client.patch(f"/roles/{rng.choice(role_ids)}/steps/{rng.randrange(10)}", json={"status": "complete"})
+
+
+def _latency(client: TestClient, samples: int) -> list[float]:
+    delays = []
+    for _ in range(samples):
+        cursor = client.get("/changes").json()["cursor"]
+        seen: dict[str, float] = {}
+
+        def follow():
+            client.get("/changes", params={"since": cursor, "wait": 5})
+            seen["at"] = time.perf_counter()
+
+        thread = threading.Thread(target=follow)
+        thread.start()
+        time.sleep(0.2)   # let the long-poll start waiting
+        wrote = time.perf_counter()
+        client.post("/roles", json={"company": "Latency", "role_title": "Probe"})
+        thread.join()
+        delays.append((seen["at"] - wrote) * 1000)
+    return delays
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--roles", type=int, default=5000, help="roles seeded before polling")
+    parser.add_argument("--cycles", type=int, default=20, help="sync cycles to compare")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(Path(tmp) / "changes.db")
+        migrate(engine, lambda: Base.metadata.create_all(bind=engine))
+        client = _client(engine)
+
+        role_ids = client.post("/roles:bulk", json=[
+            {"company": f"Company {i}", "role_title": f"Role {i}"} for i in range(args.roles)
+        ]).json()["role_ids"]
+        cursor = client.get("/changes").json()["cursor"]
+
+        totals = {"poll": [0, 0, 0.0], "feed": [0, 0, 0.0]}   # bytes, statements, seconds
+        for _ in range(args.cycles):
+            _mutate(client, rng, role_ids)
+
+            with count_queries(engine) as log:
+                start = time.perf_counter()
+                received = _poll_everything(client, rng.choice(role_ids))
+                totals["poll"][2] += time.perf_counter() - start
+            totals["poll"][0] += received
+            totals["poll"][1] += log.count
+
+            with count_queries(engine) as log:
+                start = time.perf_counter()
+                response = client.get("/changes", params={"since": cursor})
+                totals["feed"][2] += time.perf_counter() - start
+            cursor = response.json()["cursor"]
+            totals["feed"][0] += len(response.content)
+            totals["feed"][1] += log.count
+
+        print(f"per sync cycle ({args.roles} roles, 4 writes between cycles)")
+        print(f"{'':<16}{'bytes':>12}{'statements':>12}{'ms':>10}")
+        for name, label in (("poll", "poll /roles"), ("feed", "GET /changes")):
+            received, statements, seconds = totals[name]
+            print(f"{label:<16}{received / args.cycles:>12.0f}{statements / args.cycles:>12.1f}"
+                  f"{seconds / args.cycles * 1000:>10.1f}")
+
+        delays = _latency(client, 10)
+        print(f"\nlong-poll delivery after commit: median {statistics.median(delays):.1f} ms, "
+              f"max {max(delays):.1f} ms")
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
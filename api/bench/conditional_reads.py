@@ -0,0 +1,96 @@
+"""
+bench/conditional_reads.py — Cost of a role read: full render vs cached body vs 304.
+
+Seeds --roles roles on a throwaway SQLite file and times GET /roles/{id},
+GET /roles/{id}/steps and a 1000-role GET /roles page three ways: with the
+body cache cleared before every call (a full load + serialise), repeated
+(served from the body cache), and revalidated with If-None-Match (304).
+Also prints the SQL statements each variant runs.
+
+Run from the repo root:
+  python -m api.bench.conditional_reads [--roles 5000] [--runs 50]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from api.database import Base, count_queries, get_db, make_engine
+from api.migrations import migrate
+from api.response_cache import cache
+from api.routes.roles import bulk_router, router
+
+
+def _client(engine) -> TestClient:
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def _get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(router)
+    app.include_router(bulk_router)
+    app.dependency_overrides[get_db] = _get_db
+    return TestClient(app)
+
+
+def _time(engine, fn, runs: int, before=None) -> tuple[float, int]:
+    """Median ms and statements per call."""
+    timings, statements = [], 0
+    for _ in range(runs):
+        if before:
+            before()
+        with count_queries(engine) as log:
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        statements = log.count
+    return statistics.median(timings), statements
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--roles", type=int, default=5000, help="roles to seed")
+    parser.add_argument("--runs", type=int, default=50, help="calls per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(Path(tmp) / "conditional.db")
+        migrate(engine, lambda: Base.metadata.create_all(bind=engine))
+        client = _client(engine)
+        role_id = client.post("/roles:bulk", json=[
+            {"company": f"Company {i}", "role_title": f"Role {i}", "notes": "n" * 200}
+            for i in range(args.roles)
+        ]).json()["role_ids"][0]
+
+        targets = {
+            "GET /roles/{id}":       (f"/roles/{role_id}", {}),
+            "GET /roles/{id}/steps": (f"/roles/{role_id}/steps", {}),
+            "GET /roles limit=1000": ("/roles", {"limit": 1000}),
+        }
+        print(f"{'endpoint':<24}{'full ms':>10}{'cached ms':>11}{'304 ms':>9}   statements full/cached/304")
+        for name, (path, params) in targets.items():
+            etag = client.get(path, params=params).headers["etag"]
+            full, full_q = _time(engine, lambda: client.get(path, params=params), args.runs, before=cache.clear)
+            hit, hit_q   = _time(engine, lambda: client.get(path, params=params), args.runs)
+            not_modified, nm_q = _time(
+                engine, lambda: client.get(path, params=params, headers={"If-None-Match": etag}), args.runs,
+            )
+            print(f"{name:<24}{full:>10.2f}{hit:>11.2f}{not_modified:>9.2f}   {full_q}/{hit_q}/{nm_q}")
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+bench/cv_load.py — CV render throughput vs. process-pool worker count.
+
+For each worker count, starts a RenderPool (workers warmed up front), then
+fires the corpus at it from `--clients` concurrent threads — the same shape
+as concurrent POST /cv/generate requests — and reports renders/second and
+speed-up over a single worker. Near-linear speed-up means the GIL is no
+longer the bottleneck.
+
+Run from the repo root:
+  python -m api.bench.cv_load --corpus workflow/roles --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from api.pdf_pool import RenderPool
+from api.routes.cv import TEMPLATE_PATH, generate_body, parse_cv
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--corpus", type=Path, required=True,
+                        help="directory of [SECTION]-format CV .txt files")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=[1, 2, 4, os.cpu_count() or 1],
+                        help="worker counts to compare")
+    parser.add_argument("--clients", type=int, default=32,
+                        help="concurrent requesting threads")
+    parser.add_argument("--renders", type=int, default=200,
+                        help="total renders per worker count")
+    args = parser.parse_args()
+
+    bodies = [
+        generate_body(parse_cv(path.read_text(encoding="utf-8")))
+        for path in sorted(args.corpus.rglob("*.txt"))
+    ]
+    if not bodies:
+        print(f"No .txt CVs found under {args.corpus}", file=sys.stderr)
+        return 1
+    work = [bodies[i % len(bodies)] for i in range(args.renders)]
+
+    print(f"{args.renders} renders, {args.clients} clients, {len(bodies)} distinct CVs")
+    print(f"{'workers':>7} {'renders/s':>10} {'speed-up':>9}")
+
+    baseline = None
+    for workers in args.workers:
+        # Queue deep enough that the harness measures throughput, not 429s
+        pool = RenderPool(TEMPLATE_PATH, workers, max_queued=args.clients, timeout=120)
+        pool.start()
+        try:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.clients) as clients:
+                list(clients.map(pool.render, work))
+            rate = args.renders / (time.perf_counter() - start)
+        finally:
+            pool.shutdown()
+
+        baseline = baseline or rate
+        print(f"{workers:>7} {rate:>10.1f} {rate / baseline:>8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+bench/cv_render.py — Cold vs. warm CV render latency.
+
+Renders every CV in a corpus through both paths and reports p50/p95:
+  cold — what /cv/generate used to do: read the template and build a fresh
+         WeasyPrint document (stylesheets + fonts parsed from zero)
+  warm — the shared PDFRenderer with the template and fonts pre-loaded
+
+Run from the repo root:
+  python -m api.bench.cv_render --corpus workflow/roles --rounds 5
+
+--corpus is a directory searched recursively for *.txt files in the
+[SECTION]-marker format (e.g. tailored CVs under workflow/roles/).
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from api.pdf_render import PDFRenderer
+from api.routes.cv import TEMPLATE_PATH, generate_body, parse_cv
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def _render_cold(body: str) -> bytes:
+    """Pre-PDFRenderer path: template read + full parse on every call."""
+    from weasyprint import HTML  # type: ignore
+
+    template = TEMPLATE_PATH.read_text(encoding="utf-8")
+    html     = template.replace("{{BODY}}", body)
+    return HTML(string=html, base_url=str(TEMPLATE_PATH.parent)).write_pdf()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--corpus", type=Path, required=True,
+                        help="directory of [SECTION]-format CV .txt files")
+    parser.add_argument("--rounds", type=int, default=3,
+                        help="times to render the whole corpus per path")
+    args = parser.parse_args()
+
+    bodies = [
+        generate_body(parse_cv(path.read_text(encoding="utf-8")))
+        for path in sorted(args.corpus.rglob("*.txt"))
+    ]
+    if not bodies:
+        print(f"No .txt CVs found under {args.corpus}", file=sys.stderr)
+        return 1
+
+    renderer = PDFRenderer(TEMPLATE_PATH)
+    renderer.warm()
+
+    paths = {"cold": _render_cold, "warm": renderer.render}
+    print(f"{len(bodies)} CVs × {args.rounds} rounds")
+    print(f"{'path':<6} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} {'mean ms':>9}")
+
+    for name, render in paths.items():
+        samples: list[float] = []
+        for _ in range(args.rounds):
+            for body in bodies:
+                start = time.perf_counter()
+                render(body)
+                samples.append((time.perf_counter() - start) * 1000)
+        print(
+            f"{name:<6} {len(samples):>5} {_percentile(samples, 50):>9.1f} "
+            f"{_percentile(samples, 95):>9.1f} {statistics.mean(samples):>9.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
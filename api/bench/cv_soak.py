@@ -0,0 +1,78 @@
+"""
+bench/cv_soak.py — Disk and memory soak test for POST /cv/generate.
+
+Drives thousands of requests through the real app (lifespan included) and
+samples, every --every requests:
+  rss      — resident memory of the API process
+  tmp      — *.pdf files (and bytes) left in the system temp directory
+  cache    — bytes held by the PDF cache (bounded by CV_CACHE_MAX_MB)
+
+Each request varies its content so every one is a fresh render. A healthy run
+shows rss and tmp flat after warm-up, and cache capped at its limit.
+
+Run from the repo root (needs httpx for FastAPI's TestClient):
+  python -m api.bench.cv_soak --cv workflow/master/CV_master.txt --requests 5000
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.routes.cv import _pdf_cache
+
+
+def _rss_mb() -> float:
+    """Current resident set size (Linux /proc; falls back to peak RSS)."""
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _tmp_pdfs() -> tuple[int, int]:
+    files = list(Path(tempfile.gettempdir()).glob("*.pdf"))
+    return len(files), sum(f.stat().st_size for f in files if f.exists())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cv", type=Path, required=True,
+                        help="a [SECTION]-format CV .txt file")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--every", type=int, default=250,
+                        help="sample interval in requests")
+    args = parser.parse_args()
+
+    cv_text = args.cv.read_text(encoding="utf-8")
+    print(f"{'requests':>8} {'rss MB':>8} {'tmp files':>9} {'tmp KB':>8} {'cache KB':>9}")
+
+    with TestClient(app) as client:
+        for i in range(1, args.requests + 1):
+            # Trailing counter makes every request a distinct cache key
+            response = client.post(
+                "/cv/generate",
+                json={"cv_content": f"{cv_text}\n<!-- soak {i} -->"},
+            )
+            if response.status_code != 200:
+                print(f"request {i}: HTTP {response.status_code} {response.text[:200]}",
+                      file=sys.stderr)
+                return 1
+
+            if i % args.every == 0 or i == args.requests:
+                files, size = _tmp_pdfs()
+                print(
+                    f"{i:>8} {_rss_mb():>8.1f} {files:>9} {size / 1024:>8.1f} "
+                    f"{_pdf_cache.stats()['bytes'] / 1024:>9.1f}"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
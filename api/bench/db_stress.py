@@ -0,0 +1,124 @@
+"""
+bench/db_stress.py — Mixed read/write SQLite throughput: stock engine vs. tuned.
+
+Runs `--writers` threads creating roles and completing their steps while
+`--readers` threads page through GET /roles-style queries, for `--seconds`
+each, against two throwaway databases: one on a stock engine (rollback
+journal, default pragmas, as database.py used to build it) and one from
+`make_engine` (WAL, synchronous=NORMAL, busy_timeout, mmap, page cache,
+sized pool). Reports throughput, p95 latency and "database is locked" errors.
+Python threads share the GIL, so total ops/s is roughly fixed — the tuned
+engine shifts it toward writes and cuts the time operations spend waiting
+on each other's locks.
+
+Run from the repo root:
+  python -m api.bench.db_stress --writers 4 --readers 16 --seconds 10
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from api.database import Base, make_engine
+from api.models import Role, Step, PIPELINE_STEPS
+from api.routes.roles import query_role_page
+
+
+def _p95(samples: list[float]) -> float:
+    return statistics.quantiles(samples, n=20)[-1] * 1000 if len(samples) > 1 else 0.0
+
+
+def _writer(Session, stop: threading.Event, counts: dict, lock: threading.Lock) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            with Session() as db:
+                role = Role(company="Stress Co", role_title="Engineer")
+                db.add(role)
+                db.flush()
+                db.execute(insert(Step), [
+                    {"role_id": role.id, "step_number": number, "step_name": name}
+                    for number, name in PIPELINE_STEPS
+                ])
+                db.commit()
+                db.execute(
+                    update(Step)
+                    .where(Step.role_id == role.id, Step.step_number < 3)
+                    .values(status="complete")
+                )
+                db.commit()
+            key = "writes"
+        except OperationalError:
+            key = "errors"
+        with lock:
+            counts[key].append(time.perf_counter() - start)
+
+
+def _reader(Session, stop: threading.Event, counts: dict, lock: threading.Lock) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            with Session() as db:
+                query_role_page(db, limit=50, with_steps=True)
+            key = "reads"
+        except OperationalError:
+            key = "errors"
+        with lock:
+            counts[key].append(time.perf_counter() - start)
+
+
+def _run(engine, writers: int, readers: int, seconds: float) -> dict:
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    counts  = {"reads": [], "writes": [], "errors": []}
+    lock    = threading.Lock()
+    stop    = threading.Event()
+    threads = (
+        [threading.Thread(target=_writer, args=(Session, stop, counts, lock)) for _ in range(writers)]
+        + [threading.Thread(target=_reader, args=(Session, stop, counts, lock)) for _ in range(readers)]
+    )
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--writers", type=int, default=4, help="writing threads")
+    parser.add_argument("--readers", type=int, default=16, help="reading threads")
+    parser.add_argument("--seconds", type=float, default=10, help="duration per engine")
+    args = parser.parse_args()
+
+    print(f"{args.writers} writers, {args.readers} readers, {args.seconds:g}s per engine")
+    print(f"{'engine':<8} {'reads/s':>9} {'read p95':>9} {'writes/s':>9} {'write p95':>10} {'locked':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        engines = {
+            "stock": create_engine(
+                f"sqlite:///{Path(tmp) / 'stock.db'}",
+                connect_args={"check_same_thread": False},
+            ),
+            "tuned": make_engine(Path(tmp) / "tuned.db"),
+        }
+        for name, engine in engines.items():
+            counts = _run(engine, args.writers, args.readers, args.seconds)
+            print(f"{name:<8} {len(counts['reads']) / args.seconds:>9.0f} {_p95(counts['reads']):>7.0f}ms "
+                  f"{len(counts['writes']) / args.seconds:>9.0f} {_p95(counts['writes']):>8.0f}ms "
+                  f"{len(counts['errors']):>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
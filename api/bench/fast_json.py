@@ -0,0 +1,136 @@
+"""
+bench/fast_json.py — GET /roles through the response models vs FAST_JSON_RESPONSES.
+
+Grows a throwaway SQLite database to each --rows size (default 1000, 10000
+and 100000 roles) and at each size walks every page of GET /roles
+(limit=1000) with the body cache cleared, once on the default path and
+once with the fast JSON path. Reports throughput in roles per second, the
+median time per page request, and the peak memory traced while serving one
+page (tracemalloc, in a separate pass so it doesn't skew the timings).
+Also checks the two paths return the same JSON (parsed — encoders may
+format a float differently).
+
+Run from the repo root:
+  python -m api.bench.fast_json [--rows 1000,10000,100000] [--runs 3]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session, sessionmaker
+
+from api import fast_json
+from api.database import Base, get_db, make_engine
+from api.migrations import migrate
+from api.response_cache import cache
+from api.role_import import MAX_ROWS, import_roles
+from api.routes.roles import router
+
+_PAGE = 1000
+
+
+def _client(engine) -> TestClient:
+    Session_ = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def _get_db():
+        db = Session_()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db] = _get_db
+    return TestClient(app)
+
+
+def _crawl(client: TestClient) -> tuple[list[float], list]:
+    """Every page of GET /roles, uncached; per-page seconds and the parsed pages."""
+    timings, bodies, cursor = [], [], None
+    while cursor != "":
+        cache.clear()
+        start    = time.perf_counter()
+        response = client.get("/roles", params={"limit": _PAGE, **({"cursor": cursor} if cursor else {})})
+        timings.append(time.perf_counter() - start)
+        bodies.append(json.loads(response.content))
+        cursor = response.headers.get("x-next-cursor", "")
+    return timings, bodies
+
+
+def _peak_kib(client: TestClient) -> float:
+    """Median memory allocated at peak while serving one page, above what was live before it."""
+    peaks, cursor = [], None
+    tracemalloc.start()
+    try:
+        while cursor != "":
+            cache.clear()
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            response = client.get("/roles", params={"limit": _PAGE, **({"cursor": cursor} if cursor else {})})
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+            cursor = response.headers.get("x-next-cursor", "")
+    finally:
+        tracemalloc.stop()
+    return statistics.median(peaks) / 1024
+
+
+def _seed(engine, start: int, stop: int) -> None:
+    with Session(engine) as db:
+        for offset in range(start, stop, MAX_ROWS):
+            import_roles(db, [
+                {"company": f"Company {i}", "role_title": f"Engineer {i}", "status": "active",
+                 "interview_probability": (i % 100) / 100, "go_no_go": "go" if i % 2 else None}
+                for i in range(offset, min(offset + MAX_ROWS, stop))
+            ])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", default="1000,10000,100000", help="comma-separated role counts")
+    parser.add_argument("--runs", type=int, default=3, help="crawls per measurement")
+    args  = parser.parse_args()
+    sizes = sorted(int(size) for size in args.rows.split(","))
+
+    encoder = "orjson" if fast_json.orjson is not None else "stdlib json (orjson not installed)"
+    print(f"GET /roles, limit={_PAGE}, body cache cleared per request; fast path encoder: {encoder}")
+    print(f"{'roles':>8}  {'path':<8}{'roles/s':>12}{'ms/request':>12}{'peak KiB/request':>18}")
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(Path(tmp) / "fast_json.db")
+        migrate(engine, lambda: Base.metadata.create_all(bind=engine))
+        client = _client(engine)
+
+        seeded = 0
+        for size in sizes:
+            _seed(engine, seeded, size)
+            seeded = size
+
+            bodies = {}
+            for name, enabled in (("default", False), ("fast", True)):
+                fast_json.FAST_JSON_RESPONSES = enabled
+                _crawl(client)   # warm-up
+                totals, pages = [], []
+                for _ in range(args.runs):
+                    timings, bodies[name] = _crawl(client)
+                    totals.append(sum(timings))
+                    pages.extend(timings)
+                peak = _peak_kib(client)
+                print(f"{size:>8}  {name:<8}{size / statistics.median(totals):>12,.0f}"
+                      f"{statistics.median(pages) * 1000:>12.1f}{peak:>18,.0f}")
+            if bodies["default"] != bodies["fast"]:
+                print("  MISMATCH: the two paths returned different JSON")
+                return 1
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
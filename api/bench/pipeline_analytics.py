@@ -0,0 +1,174 @@
+"""
+bench/pipeline_analytics.py — Check and time GET /analytics/pipeline.
+
+Drives a random mix of role creates, imports, updates, step updates (single
+and bulk) and deletes through the API on a throwaway SQLite file, then
+checks the incrementally maintained counters against a full rebuild() and
+times the endpoint as the number of roles grows. The endpoint should stay
+flat; the rebuild — what a scan-based report would cost — grows with it.
+
+Run from the repo root (exit status 1 if the counters drift):
+  python -m api.bench.pipeline_analytics [--roles 20000] [--seed 7]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from api.analytics import rebuild
+from api.database import Base, get_db, make_engine
+from api.migrations import migrate
+from api.models import RoleAggregate, StepAggregate, StepGapAggregate
+from api.routes.analytics import router as analytics_router
+from api.routes.roles import bulk_router, router as roles_router
+
+_STATUSES = ("active", "submitted", "interviewing", "rejected", "offer", "archived")
+
+
+def _client(engine) -> TestClient:
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def _get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(roles_router)
+    app.include_router(bulk_router)
+    app.include_router(analytics_router)
+    app.dependency_overrides[get_db] = _get_db
+    return TestClient(app)
+
+
+def _ok(response, status: int = 200):
+    assert response.status_code == status, f"{response.request.url}: {response.status_code} {response.text[:200]}"
+    return response
+
+
+def _counters(conn) -> dict:
+    """Every non-zero counter row, floats rounded so rebuild order doesn't matter."""
+    snapshot = {}
+    for model in (RoleAggregate, StepAggregate, StepGapAggregate):
+        table = model.__table__
+        keys  = [column.name for column in table.primary_key]
+        for row in conn.execute(select(table)).mappings():
+            values = tuple(round(row[c.name], 3) for c in table.columns if c.name not in keys)
+            if any(values):
+                snapshot[(table.name, *(row[key] for key in keys))] = values
+    return snapshot
+
+
+def _drifted(engine) -> list[str]:
+    with engine.connect() as conn:
+        incremental = _counters(conn)
+        rebuild(conn)
+        rebuilt = _counters(conn)
+        conn.rollback()
+    return [
+        f"{key}: incremental {incremental.get(key)} != rebuilt {rebuilt.get(key)}"
+        for key in sorted(set(incremental) | set(rebuilt), key=str)
+        if incremental.get(key) != rebuilt.get(key)
+    ]
+
+
+def _workload(client: TestClient, rng: random.Random, role_ids: list[int], operations: int) -> None:
+    for _ in range(operations):
+        roll = rng.random()
+        if roll < 0.1 or not role_ids:
+            role = _ok(client.post("/roles", json={
+                "company": f"Company {rng.randrange(100)}", "role_title": "Engineer",
+                "status": rng.choice(_STATUSES), "go_no_go": rng.choice(["go", "no-go", None]),
+                "interview_probability": rng.choice([None, round(rng.random(), 2)]),
+            }), 201).json()
+            role_ids.append(role["id"])
+        elif roll < 0.3:
+            _ok(client.patch(f"/roles/{rng.choice(role_ids)}", json={
+                "status": rng.choice(_STATUSES),
+                "interview_probability": round(rng.random(), 2),
+                "go_no_go": rng.choice(["go", "no-go"]),
+            }))
+        elif roll < 0.6:
+            _ok(client.patch(
+                f"/roles/{rng.choice(role_ids)}/steps/{rng.randrange(10)}",
+                json={"status": rng.choice(["in_progress", "complete", "complete", "skipped"])},
+            ))
+        elif roll < 0.9:
+            role_id = rng.choice(role_ids)
+            _ok(client.patch(f"/roles/{role_id}/steps", json=[
+                {"step_number": n, "status": rng.choice(["complete", "in_progress"])}
+                for n in rng.sample(range(10), 3)
+            ]))
+        else:
+            role_id = role_ids.pop(rng.randrange(len(role_ids)))
+            _ok(client.delete(f"/roles/{role_id}"), 204)
+
+
+def _time_endpoint(client: TestClient, runs: int = 20) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        _ok(client.get("/analytics/pipeline"))
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def _time_rebuild(engine) -> float:
+    with engine.connect() as conn:
+        start = time.perf_counter()
+        rebuild(conn)
+        elapsed = (time.perf_counter() - start) * 1000
+        conn.rollback()
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--roles", type=int, default=20_000, help="roles imported by the final round")
+    parser.add_argument("--seed", type=int, default=7, help="random seed for the workload")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(Path(tmp) / "analytics.db")
+        migrate(engine, lambda: Base.metadata.create_all(bind=engine))
+        client   = _client(engine)
+        role_ids: list[int] = []
+
+        print(f"{'roles':>8} {'endpoint ms':>12} {'rebuild ms':>11}")
+        imported = 0
+        for target in (args.roles // 100, args.roles // 10, args.roles):
+            records = [
+                {"company": f"Company {i % 300}", "role_title": f"Role {i}",
+                 "status": rng.choice(_STATUSES), "go_no_go": rng.choice(["go", "no-go", None]),
+                 "interview_probability": rng.choice([None, round(rng.random(), 2)])}
+                for i in range(imported, target)
+            ]
+            result = _ok(client.post("/roles:bulk", json=records)).json()
+            role_ids.extend(result["role_ids"])
+            imported = target
+            _workload(client, rng, role_ids, 300)
+            print(f"{len(role_ids):>8} {_time_endpoint(client):>12.2f} {_time_rebuild(engine):>11.1f}")
+
+        drift = _drifted(engine)
+        engine.dispose()
+
+    for line in drift:
+        print(f"DRIFT {line}")
+    print("counters match a full rebuild" if not drift else f"{len(drift)} counters drifted")
+    return 1 if drift else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
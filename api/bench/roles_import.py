@@ -0,0 +1,87 @@
+"""
+bench/roles_import.py — Bulk role import vs. one-at-a-time role creation.
+
+Imports `--roles` generated records (default 10k) into a throwaway SQLite
+database with `import_roles`, and creates `--baseline` roles the way a loop
+of POST /roles calls would (ORM add + flush + 10 step rows + commit per
+role). Reports roles/second and SQL statements per role for each.
+
+Run from the repo root:
+  python -m api.bench.roles_import --roles 10000 --baseline 1000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from api.database import Base, count_queries
+from api.models import Role, Step, PIPELINE_STEPS
+from api.role_import import CHUNK_SIZE, import_roles
+
+
+def _records(count: int) -> list[dict]:
+    return [
+        {
+            "company":               f"Company {i}",
+            "role_title":            f"Role {i}",
+            "status":                "submitted",
+            "interview_probability": (i % 100) / 100,
+            "go_no_go":              "go",
+        }
+        for i in range(count)
+    ]
+
+
+def _one_at_a_time(Session, records: list[dict]) -> None:
+    with Session() as db:
+        for record in records:
+            role = Role(**record)
+            db.add(role)
+            db.flush()
+            for step_number, step_name in PIPELINE_STEPS:
+                db.add(Step(role_id=role.id, step_number=step_number, step_name=step_name))
+            db.commit()
+
+
+def _run(engine, label: str, count: int, fn) -> None:
+    with count_queries(engine) as log:
+        start   = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+    print(f"{label:<16} {count:>7} {elapsed:>8.2f} {count / elapsed:>10.0f} {log.count / count:>12.3f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--roles", type=int, default=10_000, help="roles to bulk-import")
+    parser.add_argument("--baseline", type=int, default=1_000,
+                        help="roles to create one at a time for comparison")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="roles per transaction")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+
+        print(f"{'mode':<16} {'roles':>7} {'seconds':>8} {'roles/s':>10} {'stmts/role':>12}")
+        _run(engine, "one-at-a-time", args.baseline,
+             lambda: _one_at_a_time(Session, _records(args.baseline)))
+
+        def bulk() -> None:
+            with Session() as db:
+                result = import_roles(db, _records(args.roles), chunk_size=args.chunk_size)
+            assert result.created == args.roles, result.errors[:5]
+
+        _run(engine, "bulk", args.roles, bulk)
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+bench/roles_page.py — GET /roles page latency vs. depth: keyset cursor vs. OFFSET.
+
+Seeds a throwaway SQLite database with `--roles` rows (default 100k), then
+walks the whole list with `query_role_page` and times selected pages. The
+same pages are fetched with LIMIT/OFFSET for comparison. Keyset pages should
+cost the same at any depth; OFFSET pages grow with the offset.
+
+Run from the repo root:
+  python -m api.bench.roles_page --roles 100000 --limit 100
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from api.database import Base
+from api.models import Role
+from api.routes.roles import query_role_page
+
+_STATUSES = ["active", "submitted", "rejected", "offer", "archived"]
+
+
+def _seed(engine, count: int) -> None:
+    start = datetime(2020, 1, 1)
+    rng   = random.Random(0)
+    rows  = [
+        {
+            "company":               f"Company {i % 5000}",
+            "role_title":            f"Role {i}",
+            "status":                rng.choice(_STATUSES),
+            "interview_probability": rng.random(),
+            "go_no_go":              rng.choice(["go", "no-go", None]),
+            "created_at":            start + timedelta(minutes=i),
+            "updated_at":            start + timedelta(minutes=i),
+        }
+        for i in range(count)
+    ]
+    with engine.begin() as conn:
+        for offset in range(0, count, 10_000):
+            conn.execute(insert(Role), rows[offset:offset + 10_000])
+
+
+def _time_ms(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--roles", type=int, default=100_000, help="rows to seed")
+    parser.add_argument("--limit", type=int, default=100, help="page size")
+    parser.add_argument("--repeat", type=int, default=5, help="timings per sampled page")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+
+        seed_s = _time_ms(lambda: _seed(engine, args.roles)) / 1000
+        pages  = -(-args.roles // args.limit)
+        sample = sorted({1, 10, pages // 10, pages // 2, pages} - {0})
+        print(f"Seeded {args.roles} roles in {seed_s:.1f}s; {pages} pages of {args.limit}")
+
+        # Walk every page by cursor, remembering where each sampled page starts
+        cursors = {}
+        with Session() as db:
+            cursor, page = None, 1
+            while True:
+                if page in sample:
+                    cursors[page] = cursor
+                _, cursor = query_role_page(db, cursor=cursor, limit=args.limit)
+                if cursor is None:
+                    break
+                page += 1
+
+        print(f"{'page':>6} {'keyset ms':>10} {'offset ms':>10}")
+        with Session() as db:
+            for page in sample:
+                keyset = [
+                    _time_ms(lambda: query_role_page(db, cursor=cursors[page], limit=args.limit))
+                    for _ in range(args.repeat)
+                ]
+                offset = [
+                    _time_ms(lambda: db.query(Role)
+                             .order_by(Role.created_at.desc(), Role.id.desc())
+                             .offset((page - 1) * args.limit)
+                             .limit(args.limit)
+                             .all())
+                    for _ in range(args.repeat)
+                ]
+                print(f"{page:>6} {statistics.median(keyset):>10.2f} {statistics.median(offset):>10.2f}")
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+bench/search.py — Time GET /search's FTS5 index against a LIKE scan.
+
+Builds a throwaway SQLite database of --roles roles (default 50000), each
+with generated notes and a completed analysis job carrying a positioning
+brief, so the index holds that many documents. Reports how long bulk
+import and indexing took, then the median latency of several queries
+through search() against the same filter as a LIKE scan over roles and
+briefs — the grep-everything approach it replaces.
+
+Run from the repo root:
+  python -m api.bench.search [--roles 50000]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from api.database import Base, make_engine
+from api.migrations import migrate
+from api.models import AnalysisJob
+from api.role_import import import_roles
+from api.search import rebuild, search
+
+_WORDS = (
+    "fintech payments platform growth infrastructure data ledger compliance "
+    "marketplace logistics health climate robotics security developer tooling "
+    "series seed founder operator scale hiring product strategy revenue enterprise "
+    "latency pipeline analytics retention onboarding pricing churn partnerships"
+).split()
+# Filler vocabulary, so the domain words above are as rare as real keywords
+_FILLER = [
+    "".join(random.Random(i).choice("abcdefghijklmnopqrstuvwxyz") for _ in range(3 + i % 7))
+    for i in range(20_000)
+]
+_FOUNDERS = ("Ada Lovelace", "Grace Hopper", "Alan Turing", "Katherine Johnson", "Edsger Dijkstra")
+
+_QUERIES = ("fintech", "grace hopper", '"developer tooling"', "climate ledger compliance", "pric*")
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS if rng.random() < 0.02 else _FILLER) for _ in range(words))
+
+
+def _brief(rng: random.Random) -> str:
+    return json.dumps({
+        "company_briefing":   _sentence(rng, 40),
+        "founder_profile":    f"{rng.choice(_FOUNDERS)} — {_sentence(rng, 20)}",
+        "recent_signals":     [_sentence(rng, 8) for _ in range(3)],
+        "positioning_angle":  _sentence(rng, 25),
+        "language_to_mirror": [_sentence(rng, 3) for _ in range(5)],
+        "proof_points":       [_sentence(rng, 10) for _ in range(3)],
+        "go_no_go":           "go",
+        "interview_probability": rng.randrange(100),
+    })
+
+
+def _like_scan(db: Session, query: str) -> list:
+    """Every term as a case-insensitive substring of any field, like a client-side grep."""
+    terms   = [term.strip('"*') for term in query.split()]
+    clauses = " AND ".join(
+        f"(r.company LIKE :t{i} OR r.role_title LIKE :t{i} OR r.notes LIKE :t{i} OR j.result LIKE :t{i})"
+        for i in range(len(terms))
+    )
+    return db.execute(text(f"""
+        SELECT DISTINCT r.id FROM roles r LEFT JOIN analysis_jobs j ON j.role_id = r.id
+        WHERE {clauses}
+    """), {f"t{i}": f"%{term}%" for i, term in enumerate(terms)}).all()
+
+
+def _median_ms(fn, runs: int = 15) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--roles", type=int, default=50_000, help="documents to index")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(Path(tmp) / "search.db")
+        migrate(engine, lambda: Base.metadata.create_all(bind=engine))
+
+        with Session(engine) as db:
+            start  = time.perf_counter()
+            result = import_roles(db, [
+                {"company": f"{rng.choice(_WORDS).title()} {rng.choice(_WORDS).title()} {i}",
+                 "role_title": f"{rng.choice(('Senior', 'Staff', 'Lead'))} {rng.choice(_WORDS).title()} Engineer",
+                 "notes": _sentence(rng, 30)}
+                for i in range(args.roles)
+            ])
+            imported = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for offset in range(0, len(result.role_ids), 5000):
+                db.execute(insert(AnalysisJob), [
+                    {"role_id": role_id, "status": "complete", "result": _brief(rng)}
+                    for role_id in result.role_ids[offset:offset + 5000]
+                ])
+            db.commit()
+            briefs = time.perf_counter() - start
+
+            conn  = db.connection()
+            start = time.perf_counter()
+            rebuild(conn)
+            db.commit()
+            reindexed = time.perf_counter() - start
+
+            print(f"import {args.roles} roles (indexed by trigger)  {imported:8.2f}s")
+            print(f"insert {args.roles} briefs (indexed by trigger) {briefs:8.2f}s")
+            print(f"full rebuild of the index                {reindexed:8.2f}s")
+            print()
+            print(f"{'query':<28}{'hits':>7}{'fts ms':>10}{'like ms':>10}")
+            for query in _QUERIES:
+                hits, _ = search(db.connection(), query, limit=20)
+                fts  = _median_ms(lambda: search(db.connection(), query, limit=20))
+                like = _median_ms(lambda: _like_scan(db, query), runs=3)
+                print(f"{query:<28}{len(hits):>7}{fts:>10.2f}{like:>10.1f}")
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
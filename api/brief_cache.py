@@ -0,0 +1,120 @@
+"""
+brief_cache.py — Persistent content-addressed cache for positioning briefs.
+
+A research run costs a full agentic loop, but its output depends only on its
+inputs: company, role title, identity.txt, profile_master.md, the system
+prompt and the model. `make_key()` hashes exactly those, so any change to a
+master file or prompt naturally misses and a repeat analysis of unchanged
+inputs is served from the `brief_cache` table in milliseconds.
+
+Entries expire after BRIEF_CACHE_TTL_HOURS (default 168 — one week; research
+signals go stale) and the table is capped at BRIEF_CACHE_MAX_ENTRIES (default
+500), evicting least-recently-used rows first.
+"""
+
+import hashlib
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from api.models import BriefCacheEntry, normalise_company
+
+# ─── CONFIG ───────────────────────────────────────────────────────────────────
+
+_TTL         = timedelta(hours=float(os.environ.get("BRIEF_CACHE_TTL_HOURS", "168")))
+_MAX_ENTRIES = int(os.environ.get("BRIEF_CACHE_MAX_ENTRIES", "500"))
+
+
+# ─── KEY ──────────────────────────────────────────────────────────────────────
+
+def make_key(*, company: str, role_title: str, identity: str, profile: str,
+             system_prompt: str, model: str) -> str:
+    """Return the sha256 hex digest of every input that shapes a brief."""
+    digest = hashlib.sha256()
+    for part in (
+        # Same folding as roles.company_key, applied to the title too
+        normalise_company(company), normalise_company(role_title),
+        identity, profile, system_prompt, model,
+    ):
+        encoded = part.encode("utf-8")
+        # Length-prefix each part so ("ab", "c") and ("a", "bc") differ
+        digest.update(len(encoded).to_bytes(8, "big"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+# ─── READ / WRITE ─────────────────────────────────────────────────────────────
+
+def get(db: Session, key: str) -> Optional[str]:
+    """
+    Return the cached brief JSON for key, or None on miss.
+
+    Expired entries are deleted on read. Hits bump last_used_at for LRU.
+    """
+    entry = db.get(BriefCacheEntry, key)
+    if entry is None:
+        return None
+
+    now = datetime.utcnow()
+    if now - entry.created_at > _TTL:
+        db.delete(entry)
+        db.commit()
+        return None
+
+    entry.last_used_at = now
+    db.commit()
+    return entry.result
+
+
+def put(db: Session, key: str, company: str, role_title: str, result: str) -> None:
+    """Store (or replace) a validated brief, then evict down to the size cap."""
+    now   = datetime.utcnow()
+    entry = dict(
+        key=key,
+        company=company,
+        role_title=role_title,
+        result=result,
+        created_at=now,
+        last_used_at=now,
+    )
+    try:
+        db.merge(BriefCacheEntry(**entry))
+        db.flush()
+    except IntegrityError:
+        # Another worker inserted the same key between merge's SELECT and
+        # INSERT — retry, which now finds the row and updates it.
+        db.rollback()
+        db.merge(BriefCacheEntry(**entry))
+        db.flush()
+    _evict(db)
+    db.commit()
+
+
+def _evict(db: Session) -> None:
+    """Drop expired rows, then least-recently-used rows beyond _MAX_ENTRIES."""
+    cutoff = datetime.utcnow() - _TTL
+    (
+        db.query(BriefCacheEntry)
+        .filter(BriefCacheEntry.created_at < cutoff)
+        .delete(synchronize_session=False)
+    )
+
+    overflow = db.query(BriefCacheEntry).count() - _MAX_ENTRIES
+    if overflow <= 0:
+        return
+
+    stale_keys = [
+        key for (key,) in (
+            db.query(BriefCacheEntry.key)
+            .order_by(BriefCacheEntry.last_used_at.asc())
+            .limit(overflow)
+        )
+    ]
+    (
+        db.query(BriefCacheEntry)
+        .filter(BriefCacheEntry.key.in_(stale_keys))
+        .delete(synchronize_session=False)
+    )
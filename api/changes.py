@@ -0,0 +1,165 @@
+"""
+changes.py — Change log for roles and steps, served by GET /changes.
+
+Every write in routes/roles.py (and the bulk importer) appends entries to
+`change_log` in the same transaction as the change, so a committed change
+always has its entry and a rolled-back one never does. Entry ids increase
+in commit order and double as the feed cursor: a client stores the last id
+it saw and asks only for what came after.
+
+Ordering: SQLite has a single writer, so ids are assigned in commit order.
+On PostgreSQL concurrent transactions could commit ids out of order and a
+reader would step past the one still in flight, so writers take a
+transaction-scoped advisory lock before appending — log writes serialise,
+nothing else does.
+
+Waiting: readers long-poll with wait_for_change(). Commits in this process
+wake them at once (an after_commit hook); writes from other processes are
+picked up by re-reading every CHANGES_POLL_INTERVAL_MS.
+"""
+
+import asyncio
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, event, func, insert, select, text
+from sqlalchemy.orm import Session
+
+from api.models import ChangeLogEntry
+from api.schemas import RoleOutSlim, StepOut
+
+# ─── CONFIG ───────────────────────────────────────────────────────────────────
+
+CHANGES_RETENTION_DAYS   = int(os.environ.get("CHANGES_RETENTION_DAYS", "7"))
+CHANGES_POLL_INTERVAL_MS = int(os.environ.get("CHANGES_POLL_INTERVAL_MS", "500"))
+
+_PG_LOCK_KEY = 0x6368616e   # "chan" — advisory lock serialising change_log appends
+
+
+# ─── WRITING ──────────────────────────────────────────────────────────────────
+
+def role_entry(op: str, role_id: int, role: Any = None) -> dict:
+    """Change row for a role; role is an ORM Role or a dict of RoleOutSlim fields."""
+    data = None
+    if role is not None:
+        model = RoleOutSlim.model_validate(role) if not isinstance(role, dict) else RoleOutSlim(**role)
+        data  = model.model_dump_json()
+    return {"entity": "role", "entity_id": role_id, "role_id": role_id, "op": op, "data": data}
+
+
+def step_entry(op: str, step: Any) -> dict:
+    """Change row for a step; step is an ORM Step or a dict of StepOut fields."""
+    model = StepOut.model_validate(step) if not isinstance(step, dict) else StepOut(**step)
+    return {
+        "entity": "step", "entity_id": model.id, "role_id": model.role_id,
+        "op": op, "data": model.model_dump_json(),
+    }
+
+
+def record(db: Session, entries: list[dict]) -> None:
+    """Append entries to the change log inside the caller's transaction."""
+    if not entries:
+        return
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _PG_LOCK_KEY})
+    now = datetime.utcnow()
+    db.execute(insert(ChangeLogEntry), [{**entry, "changed_at": now} for entry in entries])
+    db.info["changes_recorded"] = True
+
+
+# ─── READING ──────────────────────────────────────────────────────────────────
+
+def head(db: Session) -> int:
+    """Id of the newest entry — the cursor a client starts from after a full load."""
+    return db.execute(select(func.max(ChangeLogEntry.id))).scalar() or 0
+
+
+def read_since(db: Session, since: int, limit: int) -> tuple[list[ChangeLogEntry], bool]:
+    """
+    Entries after `since`, oldest first; the flag says whether more follow.
+
+    Raises LookupError when entries after `since` have already been pruned —
+    the client has to reload everything and start again from head().
+    """
+    rows = db.execute(
+        select(ChangeLogEntry)
+        .where(ChangeLogEntry.id > since)
+        .order_by(ChangeLogEntry.id)
+        .limit(limit + 1)
+    ).scalars().all()
+    if since and (not rows or rows[0].id != since + 1):
+        oldest = db.execute(select(func.min(ChangeLogEntry.id))).scalar()
+        if oldest is not None and oldest > since + 1:
+            raise LookupError(f"Changes after {since} have been pruned; reload and resume from the current cursor")
+    return rows[:limit], len(rows) > limit
+
+
+def prune(db: Session, retention_days: int = CHANGES_RETENTION_DAYS) -> int:
+    """
+    Delete entries older than the retention window; returns how many.
+
+    The newest entry is always kept, however old: head() — the feed cursor
+    and the GET /roles list version — must never fall back to a value it
+    has handed out before, or an old list ETag could match again.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    newest = select(func.max(ChangeLogEntry.id)).scalar_subquery()
+    result = db.execute(
+        delete(ChangeLogEntry).where(ChangeLogEntry.changed_at < cutoff, ChangeLogEntry.id < newest)
+    )
+    db.commit()
+    return result.rowcount
+
+
+# ─── WAITING ──────────────────────────────────────────────────────────────────
+
+_lock    = threading.Lock()
+_version = 0                                   # bumped by every commit that logged changes
+_waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+
+def version() -> int:
+    return _version
+
+
+def notify() -> None:
+    """Wake every waiting reader — called after a commit that logged changes."""
+    global _version
+    with _lock:
+        _version += 1
+        waiters = list(_waiters)
+    for loop, ready in waiters:
+        try:
+            loop.call_soon_threadsafe(ready.set)
+        except RuntimeError:   # that reader's loop has already closed
+            pass
+
+
+async def wait_for_change(seen: int, timeout: float) -> None:
+    """Return once version() moves past `seen`, or after timeout seconds."""
+    ready  = asyncio.Event()
+    waiter = (asyncio.get_running_loop(), ready)
+    with _lock:
+        if _version != seen:
+            return
+        _waiters.add(waiter)
+    try:
+        await asyncio.wait_for(ready.wait(), timeout)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        with _lock:
+            _waiters.discard(waiter)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    if session.info.pop("changes_recorded", False):
+        notify()
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop("changes_recorded", None)
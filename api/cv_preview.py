@@ -0,0 +1,100 @@
+"""
+cv_preview.py — Per-section HTML cache for fast CV edit previews.
+
+During the review / revise loop only one or two [SECTION] blocks change
+between iterations, yet `parse_cv` + `generate_body` rebuild the whole
+document. `SectionCache` splits the CV text on its section markers, keys
+each block by a hash of its text (plus the render fingerprint), and runs
+`parse_cv` / `generate_body` only for blocks it hasn't seen — the body is
+then reassembled from cached fragments in document order.
+
+Fragments are built one section at a time, so the preview assumes
+`generate_body` renders sections independently. The final PDF still goes
+through the full-document path in routes/cv.py.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+# A line holding only a [SECTION] marker starts a new block
+_MARKER_RE = re.compile(r"^\s*\[[^\[\]\n]+\]\s*$", re.MULTILINE)
+
+
+def split_sections(text: str) -> list[str]:
+    """
+    Split CV text into one chunk per [SECTION] block, in order.
+
+    Anything before the first marker stays attached to the first block so
+    that joining the chunks gives back the original text.
+    """
+    starts = [match.start() for match in _MARKER_RE.finditer(text)]
+    if not starts:
+        return [text]
+    starts[0] = 0
+    bounds = starts + [len(text)]
+    return [text[bounds[i]:bounds[i + 1]] for i in range(len(starts))]
+
+
+class SectionCache:
+    """Bounded LRU of section text hash → generated HTML fragment."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._lock    = threading.Lock()
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._hits    = 0
+        self._misses  = 0
+
+    @staticmethod
+    def _key(fingerprint: str, section: str) -> str:
+        return hashlib.sha256((fingerprint + "\0" + section).encode("utf-8")).hexdigest()
+
+    def build_body(
+        self,
+        text:          str,
+        fingerprint:   str,
+        parse:         Callable[[str], Any],
+        generate:      Callable[[Any], str],
+    ) -> tuple[str, int, int]:
+        """
+        Return (body_html, rebuilt, reused) for the CV text.
+
+        Only sections missing from the cache are parsed and generated;
+        parse/generate errors propagate to the caller.
+        """
+        fragments: list[str] = []
+        rebuilt = reused = 0
+
+        for section in split_sections(text):
+            key = self._key(fingerprint, section)
+            with self._lock:
+                html = self._entries.get(key)
+                if html is not None:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                else:
+                    self._misses += 1   # counted here, so a build that fails still shows
+
+            if html is None:
+                html = generate(parse(section))
+                rebuilt += 1
+                with self._lock:
+                    self._entries[key] = html
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            else:
+                reused += 1
+            fragments.append(html)
+
+        return "".join(fragments), rebuilt, reused
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits":    self._hits,
+                "misses":  self._misses,
+            }
@@ -1,28 +1,135 @@
 """
 database.py — SQLAlchemy engine, session factory, and table initialisation.
 
-Database lives at api/hiring_workflow.db (SQLite).
+The backend is chosen by DATABASE_URL. Unset, the database lives at
+api/hiring_workflow.db (SQLite), or wherever DATABASE_PATH points. SQLite
+connections are tuned on connect — WAL journal so readers don't block behind
+writers, synchronous=NORMAL, a busy timeout instead of instant "database is
+locked", plus mmap and page-cache sizing. Server databases (e.g.
+postgresql+psycopg://…) get a pre-pinged, recycled pool, so several uvicorn
+workers or hosts can share one database. Every setting has an environment
+override; the models use only portable column types.
+
 Import `SessionLocal` for a per-request DB session and `init_db()` on startup.
+`count_queries()` records the SQL statements run inside a block, so callers
+can assert an endpoint issues a fixed number of queries.
 """
 
+import os
+from contextlib import contextmanager
 from pathlib import Path
-from sqlalchemy import create_engine
+from typing import Iterator, Optional, Union
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.pool import QueuePool, StaticPool
 
 # ─── PATH ─────────────────────────────────────────────────────────────────────
 
 # Resolves to hiring_workflow/api/hiring_workflow.db regardless of cwd.
-DB_PATH = Path(__file__).parent / "hiring_workflow.db"
-DATABASE_URL = f"sqlite:///{DB_PATH}"
+DB_PATH = Path(os.environ.get("DATABASE_PATH", Path(__file__).parent / "hiring_workflow.db"))
+DATABASE_URL = os.environ.get("DATABASE_URL") or f"sqlite:///{DB_PATH}"
+
+# ─── TUNING ───────────────────────────────────────────────────────────────────
+
+# Applied to every new connection. journal_mode is persistent in the file;
+# the rest are per-connection.
+SQLITE_JOURNAL_MODE    = os.environ.get("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS     = os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE_MB    = int(os.environ.get("SQLITE_MMAP_SIZE_MB", "256"))
+SQLITE_CACHE_SIZE_MB   = int(os.environ.get("SQLITE_CACHE_SIZE_MB", "64"))
+
+# Connection pool — sized for the threadpool plus background workers
+DB_POOL_SIZE    = int(os.environ.get("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "30"))
+# Server databases only: test connections on checkout and replace them before
+# the server or a proxy drops them as idle.
+DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "1") == "1"
+DB_POOL_RECYCLE  = int(os.environ.get("DB_POOL_RECYCLE", "1800"))
+
+
+def _sqlite_pragmas(
+    journal_mode:    str,
+    synchronous:     str,
+    busy_timeout_ms: int,
+    mmap_size_mb:    int,
+    cache_size_mb:   int,
+) -> list[str]:
+    return [
+        f"PRAGMA journal_mode={journal_mode}",
+        f"PRAGMA synchronous={synchronous}",
+        f"PRAGMA busy_timeout={busy_timeout_ms}",
+        f"PRAGMA mmap_size={mmap_size_mb * 1024 * 1024}",
+        f"PRAGMA cache_size={-cache_size_mb * 1024}",   # negative = KiB
+    ]
+
 
 # ─── ENGINE ───────────────────────────────────────────────────────────────────
 
-# check_same_thread=False is required for SQLite when FastAPI shares a single
-# connection across async threads in the same process.
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},
-)
+def make_engine(
+    url:             Union[str, URL, Path],
+    *,
+    journal_mode:    str = SQLITE_JOURNAL_MODE,
+    synchronous:     str = SQLITE_SYNCHRONOUS,
+    busy_timeout_ms: int = SQLITE_BUSY_TIMEOUT_MS,
+    mmap_size_mb:    int = SQLITE_MMAP_SIZE_MB,
+    cache_size_mb:   int = SQLITE_CACHE_SIZE_MB,
+    pool_size:       int = DB_POOL_SIZE,
+    max_overflow:    int = DB_MAX_OVERFLOW,
+    pool_timeout:    float = DB_POOL_TIMEOUT,
+    pool_pre_ping:   bool = DB_POOL_PRE_PING,
+    pool_recycle:    int = DB_POOL_RECYCLE,
+) -> Engine:
+    """
+    Engine for a database URL (a Path means a SQLite file).
+
+    SQLite gets the tuning pragmas on every connect; anything else gets a
+    QueuePool with pre-ping and recycling.
+    """
+    url = make_url(f"sqlite:///{url}" if isinstance(url, Path) else url)
+
+    if url.get_backend_name() != "sqlite":
+        return create_engine(
+            url,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_pre_ping=pool_pre_ping,
+            pool_recycle=pool_recycle,
+        )
+
+    # check_same_thread=False is required for SQLite when FastAPI shares a single
+    # connection across async threads in the same process. The driver's lock
+    # wait is kept in step with busy_timeout.
+    connect_args = {"check_same_thread": False, "timeout": busy_timeout_ms / 1000}
+    if url.database in (None, "", ":memory:"):
+        # In-memory: every connection would otherwise see its own empty database
+        new_engine = create_engine(url, connect_args=connect_args, poolclass=StaticPool)
+    else:
+        new_engine = create_engine(
+            url,
+            connect_args=connect_args,
+            poolclass=QueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+        )
+    pragmas = _sqlite_pragmas(journal_mode, synchronous, busy_timeout_ms, mmap_size_mb, cache_size_mb)
+
+    @event.listens_for(new_engine, "connect")
+    def _tune(dbapi_connection, _record) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    return new_engine
+
+
+engine = make_engine(DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -45,10 +152,53 @@ def get_db():
         db.close()
 
 
+# ─── INSTRUMENTATION ──────────────────────────────────────────────────────────
+
+class QueryLog:
+    """Statements seen by count_queries(); `count` is len(statements)."""
+
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@contextmanager
+def count_queries(bind: Optional[Engine] = None) -> Iterator[QueryLog]:
+    """
+    Record every SQL statement executed on `bind` while the block runs.
+
+        with count_queries() as log:
+            client.get("/roles/1")
+        assert log.count == 2
+
+    Counts statements from every thread using the engine (FastAPI runs sync
+    endpoints on a worker thread), so keep it to single-request checks.
+    """
+    log  = QueryLog()
+    bind = bind or engine
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        log.statements.append(statement)
+
+    event.listen(bind, "before_cursor_execute", _record)
+    try:
+        yield log
+    finally:
+        event.remove(bind, "before_cursor_execute", _record)
+
+
 # ─── INIT ─────────────────────────────────────────────────────────────────────
 
 def init_db() -> None:
-    """Create all tables defined in models.py. Safe to call repeatedly."""
-    # Import here so models register against Base before create_all.
-    from api import models  # noqa: F401
-    Base.metadata.create_all(bind=engine)
+    """
+    Create all tables defined in models.py, then apply pending schema
+    migrations (api/migrations.py). Safe to call repeatedly.
+    """
+    # Import here so models (and the search index hook) register against
+    # Base before create_all.
+    from api import models, search  # noqa: F401
+    from api.migrations import migrate
+    migrate(engine, lambda: Base.metadata.create_all(bind=engine))
@@ -0,0 +1,103 @@
+"""
+fast_json.py — Opt-in direct-to-bytes JSON for the role and step reads.
+
+By default GET /roles, GET /roles/{id} and GET /roles/{id}/steps load ORM
+objects, validate each into RoleOutSlim / RoleOut / StepOut, dump that to a
+dict and hand the dicts to the stdlib encoder. With FAST_JSON_RESPONSES=1
+they instead select only the output columns as plain result tuples, zip
+each tuple with the schema's field names and encode the lot with orjson in
+one call — no identity map, no model instances, no model_dump walk.
+
+The JSON is equivalent to the default path — same keys in schema order,
+same values — but not always the same bytes: encoders format some floats
+differently (orjson writes 1e-7 where the stdlib writes 1e-07). encoder()
+names the path in use and goes into every ETag, so a strong validator or a
+cached body from one path is never taken for the other's. orjson is
+optional: without it the same rows go through the stdlib encoder, which
+still skips the ORM and Pydantic work. The speed-up varies by host and
+can be negative on small tables; measure with python -m api.bench.fast_json
+before enabling it.
+"""
+
+import json
+import os
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Iterable, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from api.models import Role, Step
+from api.schemas import RoleOut, RoleOutSlim, StepOut
+
+try:
+    import orjson
+except ImportError:   # optional — pip install orjson
+    orjson = None
+
+FAST_JSON_RESPONSES = os.environ.get("FAST_JSON_RESPONSES", "0") == "1"
+
+# Output fields in schema order — the key order the default path produces
+ROLE_SLIM_FIELDS = tuple(RoleOutSlim.model_fields)
+ROLE_FIELDS      = tuple(name for name in RoleOut.model_fields if name != "steps")
+STEP_FIELDS      = tuple(StepOut.model_fields)
+
+
+# ─── ENCODING ─────────────────────────────────────────────────────────────────
+
+def _default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encoder() -> str:
+    """The renderer behind role and step bodies right now — "models", "orjson" or "json"."""
+    if not FAST_JSON_RESPONSES:
+        return "models"
+    return "orjson" if orjson is not None else "json"
+
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON in the layout JSONResponse / model_dump_json emit."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_default,
+    ).encode("utf-8")
+
+
+def objects(names: Sequence[str], rows: Iterable[Sequence[Any]]) -> list[dict]:
+    """One {name: value} per row; extra trailing columns (e.g. cursor keys) are ignored."""
+    return [dict(zip(names, row)) for row in rows]
+
+
+# ─── ROWS ─────────────────────────────────────────────────────────────────────
+
+_ROLE_COLUMNS = tuple(getattr(Role, name) for name in ROLE_FIELDS)
+_STEP_COLUMNS = tuple(getattr(Step, name) for name in STEP_FIELDS)
+
+
+def role(db: Session, role_id: int) -> Optional[dict]:
+    """RoleOut content for one role, steps included, in two queries — None if missing."""
+    row = db.query(*_ROLE_COLUMNS).filter(Role.id == role_id).first()
+    if row is None:
+        return None
+    content = dict(zip(ROLE_FIELDS, row))
+    content["steps"] = steps_by_role(db, [role_id]).get(role_id, [])
+    return content
+
+
+def steps_by_role(db: Session, role_ids: Sequence[int]) -> dict[int, list[dict]]:
+    """Every step of these roles in one query, grouped by role_id in step_number order."""
+    grouped: dict[int, list[dict]] = defaultdict(list)
+    if not role_ids:
+        return grouped
+    rows = (
+        db.query(*_STEP_COLUMNS)
+        .filter(Step.role_id.in_(role_ids))
+        .order_by(Step.role_id, Step.step_number)
+    )
+    for row in rows:
+        grouped[row.role_id].append(dict(zip(STEP_FIELDS, row)))
+    return grouped
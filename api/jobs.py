@@ -0,0 +1,95 @@
+"""
+jobs.py — Bounded background worker pool for long-running API work.
+
+The analyze endpoint can run for minutes (up to _MAX_LOOPS sequential model
+calls), so instead of holding the HTTP request open it hands the work to a
+`JobQueue` and returns a job id immediately. Job state itself is persisted by
+the caller (see models.AnalysisJob) — this module only owns the threads.
+
+Capacity is bounded in two places:
+  max_workers — how many jobs run concurrently
+  max_queued  — how many more may wait for a free worker
+Once both are used up `submit()` returns None and the caller should shed load.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class JobQueue:
+    """Fixed-size thread pool with a hard cap on waiting work."""
+
+    def __init__(self, max_workers: int, max_queued: int, name: str = "job") -> None:
+        self.max_workers = max_workers
+        self.max_queued  = max_queued
+        self._executor   = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        # One permit per slot (running + waiting); released when a job finishes.
+        self._slots      = threading.BoundedSemaphore(max_workers + max_queued)
+        self._lock       = threading.Lock()
+        self._pending    = 0   # submitted, not yet finished
+        self._running    = 0   # currently executing on a worker
+
+    # ─── SUBMIT ───────────────────────────────────────────────────────────────
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Optional[Future]:
+        """
+        Schedule fn(*args, **kwargs) on the pool and return its Future.
+
+        Returns None without scheduling anything when the pool and its
+        waiting queue are both full. Cancelling the Future before it starts
+        frees its slot.
+        """
+        if not self._slots.acquire(blocking=False):
+            return None
+
+        with self._lock:
+            self._pending += 1
+
+        try:
+            future = self._executor.submit(self._run, fn, *args, **kwargs)
+        except RuntimeError:
+            # Executor already shut down — give the permit back and refuse.
+            self._finish()
+            return None
+
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Wrap the job so running/waiting counts stay accurate."""
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _on_done(self, _future: Future) -> None:
+        self._finish()
+
+    def _finish(self) -> None:
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    # ─── INTROSPECTION ────────────────────────────────────────────────────────
+
+    def stats(self) -> dict[str, int]:
+        """Snapshot of current load — running, queued and remaining capacity."""
+        with self._lock:
+            running = self._running
+            queued  = self._pending - self._running
+        return {
+            "workers":  self.max_workers,
+            "running":  running,
+            "queued":   queued,
+            "capacity": self.max_workers + self.max_queued - running - queued,
+        }
+
+    # ─── LIFECYCLE ────────────────────────────────────────────────────────────
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop accepting work; drop anything still waiting for a worker."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
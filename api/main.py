@@ -16,17 +16,32 @@ from fastapi import FastAPI
 
 from api.database import init_db
 from api.routes.roles import router as roles_router
+from api.routes.roles import bulk_router as roles_bulk_router
 from api.routes.cv import router as cv_router
+from api.routes.cv import shutdown_renderer, warm_renderer
 from api.routes.analyze import router as analyze_router
+from api.routes.analytics import router as analytics_router
+from api.routes.search import router as search_router
+from api.routes.changes import router as changes_router
+from api.routes.changes import prune_changes
+from api.routes.analyze import (
+    preload_master_files, recover_interrupted_jobs, shutdown_queue,
+)
 
 
 # ─── LIFESPAN ─────────────────────────────────────────────────────────────────
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Run startup tasks before serving requests."""
-    init_db()   # creates SQLite tables if they don't exist yet
-    yield       # hand off to the running app
+    """Run startup tasks before serving requests and cleanup on shutdown."""
+    init_db()                   # creates SQLite tables if they don't exist yet
+    recover_interrupted_jobs()  # fail analysis jobs orphaned by a previous run
+    prune_changes()             # drop change-log entries past their retention window
+    preload_master_files()      # read identity/profile once; reloaded on mtime change
+    warm_renderer()             # spawn CV render workers; each parses template/CSS/fonts once
+    yield                       # hand off to the running app
+    shutdown_queue()            # stop background analysis workers
+    shutdown_renderer()         # stop CV render worker processes
 
 
 # ─── APP ──────────────────────────────────────────────────────────────────────
@@ -45,8 +60,12 @@ app = FastAPI(
 # ─── ROUTERS ──────────────────────────────────────────────────────────────────
 
 app.include_router(roles_router)
+app.include_router(roles_bulk_router)
 app.include_router(cv_router)
 app.include_router(analyze_router)
+app.include_router(analytics_router)
+app.include_router(search_router)
+app.include_router(changes_router)
 
 
 # ─── HEALTH ───────────────────────────────────────────────────────────────────
@@ -0,0 +1,185 @@
+"""
+migrations.py — Versioned schema migrations, applied at startup by init_db().
+
+`Base.metadata.create_all` only creates missing tables; it never changes a
+table that already exists. Changes to existing tables are therefore written
+here as numbered migrations, and the `schema_migrations` table records which
+have run:
+
+  - a brand-new database is built by create_all from the current models and
+    stamped with every version, so migrations only ever run on older files
+  - a database from before this module existed has no schema_migrations
+    table and runs every migration from 1
+  - each migration runs in its own transaction together with its version row,
+    so when several processes start at once only one of them applies it
+
+Migrations must keep the models and migrated databases identical. Add new
+ones to the end of MIGRATIONS; never edit or renumber one that has shipped.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+
+from sqlalchemy import (
+    Column, DateTime, Integer, MetaData, String, Table, inspect, select, text,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+
+_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version",     Integer, primary_key=True),
+    Column("description", String(200), nullable=False),
+    Column("applied_at",  DateTime, nullable=False, default=datetime.utcnow),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version:     int
+    description: str
+    apply:       Callable[[Connection], None]
+
+
+# ─── MIGRATIONS ───────────────────────────────────────────────────────────────
+
+def _roles_listing_indexes(conn: Connection) -> None:
+    """Keyset pagination indexes for GET /roles (newest first, optionally filtered)."""
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_roles_created_at_id ON roles (created_at, id)"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_roles_status_created_at_id ON roles (status, created_at, id)"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_roles_go_no_go_created_at_id ON roles (go_no_go, created_at, id)"
+    ))
+
+
+def _unique_role_step(conn: Connection) -> None:
+    """One row per (role_id, step_number) — the update_step lookup."""
+    duplicates = conn.execute(text(
+        "SELECT role_id, step_number FROM steps "
+        "GROUP BY role_id, step_number HAVING COUNT(*) > 1"
+    )).all()
+    if duplicates:
+        listed = ", ".join(f"role {role_id} step {step}" for role_id, step in duplicates[:10])
+        raise RuntimeError(
+            f"Cannot add unique (role_id, step_number) to steps — {len(duplicates)} "
+            f"duplicated pairs, e.g. {listed}. Remove the extra rows and restart."
+        )
+    conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_steps_role_id_step_number ON steps (role_id, step_number)"
+    ))
+
+
+def _roles_company_key(conn: Connection) -> None:
+    """Normalised company column, backfilled, with a listing index."""
+    from api.models import normalise_company
+
+    if "company_key" not in {column["name"] for column in inspect(conn).get_columns("roles")}:
+        conn.execute(text("ALTER TABLE roles ADD COLUMN company_key VARCHAR(200)"))
+
+    rows = conn.execute(text("SELECT id, company FROM roles WHERE company_key IS NULL")).all()
+    if rows:
+        conn.execute(
+            text("UPDATE roles SET company_key = :key WHERE id = :role_id"),
+            [{"key": normalise_company(company), "role_id": role_id} for role_id, company in rows],
+        )
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_roles_company_key_created_at_id "
+        "ON roles (company_key, created_at, id)"
+    ))
+
+
+def _pipeline_aggregates(conn: Connection) -> None:
+    """Fill the analytics counter tables (created by create_all) from existing roles/steps."""
+    from api.analytics import rebuild
+
+    rebuild(conn)
+
+
+def _role_search_index(conn: Connection) -> None:
+    """FTS5 search table over roles + briefs, its sync triggers, and a full index (SQLite only)."""
+    from api.search import install, rebuild
+
+    install(conn)
+    rebuild(conn)
+
+
+def _analysis_job_usage(conn: Connection) -> None:
+    """Token-usage columns on analysis_jobs tables created before they existed."""
+    from api.models import AnalysisJob
+
+    existing = {column["name"] for column in inspect(conn).get_columns("analysis_jobs")}
+    for name in (
+        "input_tokens", "output_tokens", "cache_read_tokens", "cache_write_tokens",
+        "iteration_input_tokens",
+    ):
+        if name not in existing:
+            column_type = AnalysisJob.__table__.c[name].type.compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE analysis_jobs ADD COLUMN {name} {column_type}"))
+
+
+def _roles_insert_sentinel(conn: Connection) -> None:
+    """roles.insert_sentinel, which keeps bulk imports to one INSERT per chunk."""
+    existing = {column["name"] for column in inspect(conn).get_columns("roles")}
+    if "insert_sentinel" not in existing:
+        conn.execute(text("ALTER TABLE roles ADD COLUMN insert_sentinel INTEGER"))
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "roles keyset pagination indexes", _roles_listing_indexes),
+    Migration(2, "unique (role_id, step_number) on steps", _unique_role_step),
+    Migration(3, "roles.company_key with listing index", _roles_company_key),
+    Migration(4, "pipeline analytics counters", _pipeline_aggregates),
+    Migration(5, "full-text search index over roles and briefs", _role_search_index),
+    Migration(6, "analysis_jobs token usage columns", _analysis_job_usage),
+    Migration(7, "roles insert sentinel for ordered bulk inserts", _roles_insert_sentinel),
+]
+
+
+# ─── RUNNER ───────────────────────────────────────────────────────────────────
+
+def applied_versions(bind: Engine) -> set[int]:
+    with bind.connect() as conn:
+        if not inspect(conn).has_table("schema_migrations"):
+            return set()
+        return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def _record(conn: Connection, migration: Migration) -> None:
+    conn.execute(schema_migrations.insert().values(
+        version=migration.version, description=migration.description,
+    ))
+
+
+def migrate(bind: Engine, create_tables: Callable[[], None]) -> list[int]:
+    """
+    Bring the database up to date; returns the versions applied.
+
+    create_tables is Base.metadata.create_all — called here so a fresh
+    database can be told apart from an old one before it runs.
+    """
+    fresh = not inspect(bind).has_table("roles")
+    create_tables()
+    _metadata.create_all(bind=bind)
+
+    done    = applied_versions(bind)
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.version in done:
+            continue
+        try:
+            with bind.begin() as conn:
+                if not fresh:
+                    migration.apply(conn)
+                _record(conn, migration)
+        except IntegrityError:
+            # Another API process applied this version first; ours rolled back
+            continue
+        if not fresh:
+            applied.append(migration.version)
+    return applied
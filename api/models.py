@@ -1,31 +1,66 @@
 """
 models.py — SQLAlchemy ORM models for the hiring workflow API.
 
-Two tables:
-  Role  — one record per job application
-  Step  — 10 records per Role, tracking the fixed pipeline steps
+Tables:
+  Role            — one record per job application
+  Step            — 10 records per Role, tracking the fixed pipeline steps
+  AnalysisJob     — one record per POST /roles/{id}/analyze run (queued in background)
+  BriefCacheEntry — validated positioning briefs keyed by input hash
+  CompanyResearch — per-company research notes, one row per fact category
+  ChangeLogEntry  — ordered log of role/step writes behind GET /changes
+  RoleAggregate / StepAggregate / StepGapAggregate
+                  — pipeline analytics counters, maintained incrementally
 """
 
 from datetime import datetime
 from sqlalchemy import (
-    Column, Integer, String, Float, DateTime, ForeignKey, Text
+    Column, Integer, String, Float, DateTime, ForeignKey, Text, JSON,
+    Index, UniqueConstraint, insert_sentinel,
 )
 from sqlalchemy.orm import relationship
 
 from api.database import Base
 
 
+# ─── HELPERS ──────────────────────────────────────────────────────────────────
+
+def normalise_company(name: str) -> str:
+    """Case- and whitespace-insensitive company name — 'Acme  Inc' == 'acme inc'."""
+    return " ".join(name.split()).casefold()
+
+
+def _role_company_key(context) -> str:
+    """Column default for Role.company_key — applies to ORM and Core inserts alike."""
+    return normalise_company(context.get_current_parameters()["company"])
+
+
 # ─── ROLE ─────────────────────────────────────────────────────────────────────
 
 class Role(Base):
     """Represents a single job application (company + role title)."""
 
     __tablename__ = "roles"
+    # Keyset pagination for GET /roles walks (created_at, id) newest first —
+    # alone or after narrowing by status / go-no-go / company. Existing
+    # databases get these through api/migrations.py.
+    __table_args__ = (
+        Index("ix_roles_created_at_id", "created_at", "id"),
+        Index("ix_roles_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_roles_go_no_go_created_at_id", "go_no_go", "created_at", "id"),
+        Index("ix_roles_company_key_created_at_id", "company_key", "created_at", "id"),
+        # Client-filled sentinel so a multi-row INSERT … RETURNING can hand
+        # rows back in parameter order (sort_by_parameter_order) in one
+        # statement — SQLite doesn't guarantee RETURNING order otherwise
+        insert_sentinel("insert_sentinel"),
+    )
 
     id                   = Column(Integer, primary_key=True, index=True)
     company              = Column(String(200), nullable=False)
+    # normalise_company(company) — set on insert; nullable only because the
+    # migration that added it can't declare NOT NULL on SQLite
+    company_key          = Column(String(200), nullable=True, default=_role_company_key)
     role_title           = Column(String(200), nullable=False)
-    # Status values: "active" | "submitted" | "rejected" | "offer" | "archived"
+    # Status values: "active" | "submitted" | "interviewing" | "rejected" | "offer" | "archived"
     status               = Column(String(50), nullable=False, default="active")
     interview_probability = Column(Float, nullable=True)   # 0.0–1.0
     go_no_go             = Column(String(10), nullable=True)  # "go" | "no-go"
@@ -42,6 +77,13 @@ class Role(Base):
         order_by="Step.step_number",
     )
 
+    # One-to-many: a Role has many background analysis runs
+    analysis_jobs = relationship(
+        "AnalysisJob",
+        back_populates="role",
+        cascade="all, delete-orphan",
+    )
+
 
 # ─── STEP ─────────────────────────────────────────────────────────────────────
 
@@ -64,6 +106,10 @@ class Step(Base):
     """Tracks completion of a single pipeline step for a given Role."""
 
     __tablename__ = "steps"
+    # One row per (role, step) — also the lookup index for update_step
+    __table_args__ = (
+        Index("uq_steps_role_id_step_number", "role_id", "step_number", unique=True),
+    )
 
     id           = Column(Integer, primary_key=True, index=True)
     role_id      = Column(Integer, ForeignKey("roles.id"), nullable=False, index=True)
@@ -75,3 +121,134 @@ class Step(Base):
     completed_at = Column(DateTime, nullable=True)
 
     role = relationship("Role", back_populates="steps")
+
+
+# ─── ANALYSIS JOB ─────────────────────────────────────────────────────────────
+
+class AnalysisJob(Base):
+    """Tracks a background research run for a Role — state, result and error."""
+
+    __tablename__ = "analysis_jobs"
+
+    id          = Column(Integer, primary_key=True, index=True)
+    role_id     = Column(Integer, ForeignKey("roles.id"), nullable=False, index=True)
+    # Status values: "queued" | "running" | "complete" | "failed"
+    status      = Column(String(20), nullable=False, default="queued")
+    result      = Column(Text, nullable=True)   # CompanyAnalysisResponse as JSON
+    error       = Column(Text, nullable=True)
+    # Token usage summed over every loop iteration; cache_* are prompt-cache
+    # reads/writes of the stable system prefix (instructions + master files).
+    input_tokens       = Column(Integer, nullable=True)
+    output_tokens      = Column(Integer, nullable=True)
+    cache_read_tokens  = Column(Integer, nullable=True)
+    cache_write_tokens = Column(Integer, nullable=True)
+    # Input size of each loop request in order — flat once compaction kicks in
+    iteration_input_tokens = Column(JSON, nullable=True)
+    created_at  = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at  = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    role = relationship("Role", back_populates="analysis_jobs")
+
+
+# ─── BRIEF CACHE ──────────────────────────────────────────────────────────────
+
+class BriefCacheEntry(Base):
+    """
+    A validated positioning brief cached by content hash.
+
+    `key` hashes every input that shapes the brief (company, role title,
+    master files, system prompt, model) — see api/brief_cache.py.
+    """
+
+    __tablename__ = "brief_cache"
+
+    key          = Column(String(64), primary_key=True)   # sha256 hex digest
+    company      = Column(String(200), nullable=False)
+    role_title   = Column(String(200), nullable=False)
+    result       = Column(Text, nullable=False)            # CompanyAnalysisResponse as JSON
+    created_at   = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_used_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+
+# ─── COMPANY RESEARCH ─────────────────────────────────────────────────────────
+
+class CompanyResearch(Base):
+    """
+    Research notes for one fact category of one company, reused across roles.
+
+    `company_key` is the normalised company name (see normalise_company),
+    so "Acme Inc" and "acme  inc" share notes.
+    """
+
+    __tablename__ = "company_research"
+    __table_args__ = (UniqueConstraint("company_key", "category"),)
+
+    id            = Column(Integer, primary_key=True, index=True)
+    company_key   = Column(String(200), nullable=False, index=True)
+    company       = Column(String(200), nullable=False)   # name as last researched
+    # Category values: "company" | "founders" | "funding" | "signals" | "tech"
+    category      = Column(String(20), nullable=False)
+    notes         = Column(Text, nullable=False)
+    sources       = Column(JSON, nullable=False, default=list)   # list of source URLs
+    researched_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+# ─── CHANGE LOG ───────────────────────────────────────────────────────────────
+
+class ChangeLogEntry(Base):
+    """
+    One write to a role or step, numbered in commit order — the GET /changes feed.
+
+    Written in the same transaction as the change itself (see api/changes.py).
+    AUTOINCREMENT so ids are never reused once old entries are pruned.
+    """
+
+    __tablename__  = "change_log"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id         = Column(Integer, primary_key=True)
+    # Entity values: "role" | "step"; op values: "create" | "update" | "delete"
+    entity     = Column(String(10), nullable=False)
+    entity_id  = Column(Integer, nullable=False)
+    role_id    = Column(Integer, nullable=False)   # no FK — entries outlive deleted roles
+    op         = Column(String(10), nullable=False)
+    data       = Column(Text, nullable=True)       # RoleOutSlim / StepOut JSON; null on delete
+    changed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+# ─── PIPELINE ANALYTICS ───────────────────────────────────────────────────────
+# Counters behind GET /analytics/pipeline. Writers keep them in step with
+# roles/steps inside the same transaction (see api/analytics.py), so the
+# endpoint reads a few dozen rows instead of scanning every role and step.
+
+class RoleAggregate(Base):
+    """Role count and summed interview_probability per (go/no-go, status, probability decile)."""
+
+    __tablename__      = "role_aggregates"
+
+    go_no_go           = Column(String(10), primary_key=True)   # "" when unset
+    status             = Column(String(50), primary_key=True)
+    probability_bucket = Column(Integer, primary_key=True)     # 0–9, -1 when unset
+    roles              = Column(Integer, nullable=False, default=0)
+    probability_sum    = Column(Float, nullable=False, default=0.0)
+
+
+class StepAggregate(Base):
+    """Step count per (step_number, status) — the funnel."""
+
+    __tablename__ = "step_aggregates"
+
+    step_number = Column(Integer, primary_key=True)
+    status      = Column(String(20), primary_key=True)
+    steps       = Column(Integer, nullable=False, default=0)
+
+
+class StepGapAggregate(Base):
+    """Total and count of gaps between step n-1 and step n completed_at stamps."""
+
+    __tablename__ = "step_gap_aggregates"
+
+    step_number = Column(Integer, primary_key=True)
+    samples     = Column(Integer, nullable=False, default=0)
+    seconds     = Column(Float, nullable=False, default=0.0)
@@ -0,0 +1,123 @@
+"""
+pdf_cache.py — Bounded on-disk cache of rendered CV PDFs.
+
+The Revise CV loop regenerates the same CV many times, often byte-identical.
+Rendered PDFs are stored here under a content hash (see routes/cv.py — the
+key covers cv_content, the template bytes and generate_cv.py itself, so any
+change to the renderer inputs misses naturally).
+
+Size is bounded by total bytes with least-recently-used eviction. Recency is
+persisted as file mtime so the LRU order survives a restart. Hit / miss /
+eviction counters are kept for GET /cv/cache.
+
+open() hands back the cached file itself, so a hit can be streamed to the
+client from disk without reading the PDF into memory; an open file stays
+readable even if it is evicted while the response is being sent.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+
+class PDFCache:
+    """LRU-by-bytes cache of PDF files in a single directory."""
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock     = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()   # key → size, LRU first
+        self._bytes    = 0
+        self.hits      = 0
+        self.misses    = 0
+        self.evictions = 0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pdf"
+
+    def _load_index(self) -> None:
+        """Rebuild the in-memory index from disk, oldest-used first."""
+        files = sorted(self.directory.glob("*.pdf"), key=lambda p: p.stat().st_mtime)
+        for path in files:
+            size = path.stat().st_size
+            self._entries[path.stem] = size
+            self._bytes += size
+        with self._lock:
+            self._evict()
+
+    # ─── READ / WRITE ─────────────────────────────────────────────────────────
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached PDF for key, or None. Counts a hit or a miss."""
+        handle = self.open(key)
+        if handle is None:
+            return None
+        with handle:
+            return handle.read()
+
+    def open(self, key: str) -> Optional[BinaryIO]:
+        """Open the cached PDF for key for reading, or None. Counts a hit or a miss."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        path = self._path(key)
+        try:
+            os.utime(path)   # persist recency for the next restart
+            handle = path.open("rb")
+        except FileNotFoundError:
+            # Removed behind our back — treat as a miss
+            with self._lock:
+                self._bytes -= self._entries.pop(key, 0)
+                self.hits   -= 1
+                self.misses += 1
+            return None
+        return handle
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store data under key, then evict down to max_bytes."""
+        if len(data) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        tmp  = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)   # atomic — readers never see a partial PDF
+
+        with self._lock:
+            self._bytes -= self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._bytes += len(data)
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop least-recently-used files until under max_bytes. Caller holds lock."""
+        while self._bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            self._path(key).unlink(missing_ok=True)
+
+    # ─── INTROSPECTION ────────────────────────────────────────────────────────
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits":      self.hits,
+                "misses":    self.misses,
+                "hit_rate":  round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries":   len(self._entries),
+                "bytes":     self._bytes,
+                "max_bytes": self.max_bytes,
+            }
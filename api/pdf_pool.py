@@ -0,0 +1,157 @@
+"""
+pdf_pool.py — Pre-forked process pool for CPU-bound CV rendering.
+
+WeasyPrint layout is pure-Python CPU work, so renders on FastAPI's threadpool
+serialise on the GIL. `RenderPool` spreads them over worker processes instead;
+each worker builds its own warm PDFRenderer (template, CSS, fonts) once at
+start-up, so throughput scales with worker count.
+
+Load is bounded like api/jobs.py: `workers` renders in flight plus
+`max_queued` waiting. Beyond that `render()` raises PoolFull and the endpoint
+answers 429 with Retry-After. Each render also has a timeout: a render that
+overruns it has its worker processes terminated and the executor replaced,
+and gives its slot back at once — a hung WeasyPrint layout can't pin a
+worker and a slot for the life of the process.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Optional
+
+from api.pdf_render import PDFRenderer
+
+
+class PoolFull(Exception):
+    """Raised when every worker is busy and the waiting queue is full."""
+
+
+# ─── WORKER SIDE ──────────────────────────────────────────────────────────────
+
+# One renderer per worker process, created by the pool initializer.
+_worker_renderer: Optional[PDFRenderer] = None
+
+
+def _init_worker(template_path: str) -> None:
+    """Process initializer — load and warm the template once per worker."""
+    global _worker_renderer
+    _worker_renderer = PDFRenderer(Path(template_path))
+    _worker_renderer.warm()
+
+
+def _render_in_worker(body: str) -> bytes:
+    return _worker_renderer.render(body)
+
+
+def _ping() -> None:
+    """No-op task used to force every worker to spawn (and warm) up front."""
+
+
+# ─── PARENT SIDE ──────────────────────────────────────────────────────────────
+
+class RenderPool:
+    """Bounded process pool that turns CV bodies into PDF bytes."""
+
+    def __init__(self, template_path: Path, workers: int, max_queued: int,
+                 timeout: float) -> None:
+        self.template_path = template_path
+        self.workers       = workers
+        self.max_queued    = max_queued
+        self.timeout       = timeout
+        self._slots        = threading.BoundedSemaphore(workers + max_queued)
+        self._lock         = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    # ─── LIFECYCLE ────────────────────────────────────────────────────────────
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawn, not fork: the API process has live threads (uvicorn, job
+        # workers) and forking those is unsafe.
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(str(self.template_path),),
+        )
+
+    def start(self) -> None:
+        """Spawn and warm every worker now rather than on the first requests."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._new_executor()
+            executor = self._executor
+        for future in [executor.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._new_executor()
+            return self._executor
+
+    def _replace_broken(self, broken: ProcessPoolExecutor) -> None:
+        """Swap in a fresh executor after a worker crash (once per crash)."""
+        with self._lock:
+            if self._executor is broken:
+                self._executor = self._new_executor()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _kill(self, executor: ProcessPoolExecutor) -> None:
+        """Terminate a stuck executor's worker processes and replace it."""
+        # ProcessPoolExecutor has no public way to stop a running task before
+        # 3.14's terminate_workers(); its other in-flight renders fail with
+        # BrokenProcessPool and free their slots through their callbacks.
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+        self._replace_broken(executor)
+
+    # ─── RENDER ───────────────────────────────────────────────────────────────
+
+    def render(self, body: str) -> bytes:
+        """
+        Render body to PDF bytes on a worker process.
+
+        Raises PoolFull when at capacity, TimeoutError when the render takes
+        longer than self.timeout, and re-raises any render error from the
+        worker. A crashed worker pool is replaced before the error propagates;
+        a timed-out one is terminated and replaced.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise PoolFull()
+
+        # Released exactly once — by whichever of completion or timeout comes first
+        released = threading.Lock()
+
+        def release(_: object = None) -> None:
+            if released.acquire(blocking=False):
+                self._slots.release()
+
+        executor = self._get_executor()
+        try:
+            future: Future = executor.submit(_render_in_worker, body)
+        except BrokenProcessPool:
+            release()
+            self._replace_broken(executor)
+            raise
+        except BaseException:
+            release()
+            raise
+        future.add_done_callback(release)
+
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            release()
+            self._kill(executor)
+            raise
+        except BrokenProcessPool:
+            self._replace_broken(executor)
+            raise
@@ -0,0 +1,109 @@
+"""
+pdf_render.py — Warm, reusable WeasyPrint renderer for the CV template.
+
+Building a fresh `HTML` document per request makes WeasyPrint re-read the
+template and re-resolve every @font-face from zero. `PDFRenderer` does that
+work once:
+
+  - the template is read once and kept in memory
+  - each rendering thread keeps one `FontConfiguration`, so fonts are
+    loaded once per thread and stay registered — a FontConfiguration is
+    not safe to share between concurrent renders
+  - everything is reloaded automatically when the template's mtime changes
+
+The template's <style> blocks stay in the document. WeasyPrint treats
+`stylesheets=` as user-origin CSS, which loses to any author style — a
+`style=` attribute or a <style> in the CV body — so compiling them out of
+the document would change the cascade and the rendered output.
+
+For edit previews the renderer can also return the styled template HTML
+(`render_html`, which never imports WeasyPrint) or rasterise just the first
+page to PNG (`render_png`, needs the optional pypdfium2 package).
+"""
+
+import io
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+_BODY_MARKER = "{{BODY}}"
+
+
+class PDFRenderer:
+    """Renders CV bodies into PDFs using a cached template and shared fonts."""
+
+    def __init__(self, template_path: Path) -> None:
+        self.template_path = template_path
+        self._lock   = threading.Lock()
+        self._mtime: Optional[int] = None
+        self._template: str = ""
+        self._fonts  = threading.local()   # .config / .mtime — see _font_config
+
+    # ─── LOADING ──────────────────────────────────────────────────────────────
+
+    def _current(self) -> tuple[str, int]:
+        """Return (template, mtime), re-reading the template if it changed."""
+        mtime = self.template_path.stat().st_mtime_ns
+        with self._lock:
+            if mtime != self._mtime:
+                self._template = self.template_path.read_text(encoding="utf-8")
+                self._mtime    = mtime
+            return self._template, self._mtime
+
+    def _font_config(self, mtime: int) -> Any:
+        """This thread's FontConfiguration, started afresh when the template changes."""
+        # Lazy import so the API — and HTML previews — work without WeasyPrint
+        from weasyprint.text.fonts import FontConfiguration  # type: ignore
+
+        if getattr(self._fonts, "mtime", None) != mtime:
+            self._fonts.config = FontConfiguration()
+            self._fonts.mtime  = mtime
+        return self._fonts.config
+
+    # ─── RENDERING ────────────────────────────────────────────────────────────
+
+    def render_html(self, body: str) -> str:
+        """Full template — <style> blocks included — with the body inserted."""
+        template, _ = self._current()
+        return template.replace(_BODY_MARKER, body)
+
+    def layout(self, body: str) -> Any:
+        """Lay out a CV body into a WeasyPrint `Document` without writing it."""
+        from weasyprint import HTML  # type: ignore
+
+        template, mtime = self._current()
+        return HTML(
+            string=template.replace(_BODY_MARKER, body),
+            base_url=str(self.template_path.parent),
+        ).render(font_config=self._font_config(mtime))
+
+    def render(self, body: str, target: Any = None) -> Optional[bytes]:
+        """
+        Render a CV body to PDF.
+
+        Writes to target (path or file object) if given, otherwise returns
+        the PDF bytes — same contract as WeasyPrint's write_pdf.
+        """
+        return self.layout(body).write_pdf(target)
+
+    def render_png(self, body: str, resolution: int = 96) -> bytes:
+        """
+        Lay out a CV body and rasterise only its first page to PNG.
+
+        WeasyPrint no longer writes PNGs itself, so the one-page PDF is
+        rasterised with pypdfium2 (ImportError if it isn't installed).
+        """
+        import pypdfium2  # type: ignore
+
+        document   = self.layout(body)
+        first_page = document.copy(document.pages[:1]).write_pdf()
+
+        pdf    = pypdfium2.PdfDocument(first_page)
+        image  = pdf[0].render(scale=resolution / 72).to_pil()
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    def warm(self) -> None:
+        """Load the template and lay out a tiny document so fonts are resolved."""
+        self.render("<p>warm-up</p>")
@@ -0,0 +1,108 @@
+"""
+research_store.py — Company research notes reused across roles.
+
+Analysis is split in two phases (see routes/analyze.py): an expensive
+web-search research loop that produces notes about the company, and a cheap
+synthesis call that turns notes + candidate profile into a positioning brief.
+Research depends only on the company, so its notes are stored here per
+normalised company name and fact category, and a later role at the same
+company reuses whatever is still fresh.
+
+Freshness is per category — recent signals go stale far faster than founder
+background. Override the defaults with RESEARCH_STALE_DAYS_<CATEGORY>, e.g.
+RESEARCH_STALE_DAYS_SIGNALS=3.
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from api.models import CompanyResearch, normalise_company
+
+# ─── CATEGORIES ───────────────────────────────────────────────────────────────
+
+# category → (what to research, default staleness in days)
+CATEGORIES: dict[str, tuple[str, int]] = {
+    "company":  ("What the company does, its stage, and current focus", 30),
+    "founders": ("Founder background, career history, and what they publicly signal they care about", 90),
+    "funding":  ("Funding history, investors, and stage", 30),
+    "signals":  ("Recent product announcements, blog posts, press, and public posts", 7),
+    "tech":     ("Tech stack and engineering culture signals", 60),
+}
+
+_STALE_AFTER: dict[str, timedelta] = {
+    category: timedelta(days=float(
+        os.environ.get(f"RESEARCH_STALE_DAYS_{category.upper()}", default_days)
+    ))
+    for category, (_, default_days) in CATEGORIES.items()
+}
+
+
+def company_key(company: str) -> str:
+    """Normalised company name used to share notes across roles."""
+    return normalise_company(company)
+
+
+# ─── READ / WRITE ─────────────────────────────────────────────────────────────
+
+def load_fresh(db: Session, company: str) -> dict[str, dict[str, Any]]:
+    """
+    Return category → {"notes", "sources", "researched_at"} for every category
+    researched within its staleness threshold. Stale or missing categories
+    are simply absent.
+    """
+    now = datetime.utcnow()
+    rows = (
+        db.query(CompanyResearch)
+        .filter(CompanyResearch.company_key == company_key(company))
+        .all()
+    )
+    return {
+        row.category: {
+            "notes":         row.notes,
+            "sources":       row.sources or [],
+            "researched_at": row.researched_at,
+        }
+        for row in rows
+        if row.category in _STALE_AFTER
+        and now - row.researched_at <= _STALE_AFTER[row.category]
+    }
+
+
+def save(db: Session, company: str, notes: dict[str, dict[str, Any]]) -> None:
+    """Insert or replace notes for each category given; stamps researched_at."""
+    try:
+        _upsert(db, company, notes)
+    except IntegrityError:
+        # Another worker researched the same company concurrently and won the
+        # insert — retry as an update of its rows.
+        db.rollback()
+        _upsert(db, company, notes)
+
+
+def _upsert(db: Session, company: str, notes: dict[str, dict[str, Any]]) -> None:
+    key = company_key(company)
+    now = datetime.utcnow()
+    existing = {
+        row.category: row
+        for row in (
+            db.query(CompanyResearch)
+            .filter(CompanyResearch.company_key == key,
+                    CompanyResearch.category.in_(list(notes)))
+        )
+    }
+
+    for category, entry in notes.items():
+        row = existing.get(category)
+        if row is None:
+            row = CompanyResearch(company_key=key, category=category)
+            db.add(row)
+        row.company       = company
+        row.notes         = entry["notes"]
+        row.sources       = entry.get("sources") or []
+        row.researched_at = now
+
+    db.commit()
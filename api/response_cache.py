@@ -0,0 +1,171 @@
+"""
+response_cache.py — Conditional GETs and cached JSON bodies for role reads.
+
+GET /roles, GET /roles/{id} and GET /roles/{id}/steps each start with one
+cheap version lookup — the role's updated_at (which step writes bump too),
+or for role lists the newest change_log entry — and turn it into a strong
+ETag and a Last-Modified date. A client revalidating with If-None-Match /
+If-Modified-Since gets 304 before any rows are loaded or serialised.
+If-None-Match is checked first and, when sent, decides alone. Last-Modified
+only has one-second resolution, so it is only sent once the second it
+names is over: a later write then always lands in a later second, and a
+same-second write can't be mistaken for the version the client holds.
+
+Otherwise the serialised body is kept in a process-wide LRU keyed by the
+request and stamped with its ETag, so a repeat read of unchanged data skips
+the load and serialisation too. Entries are only served while their ETag
+still matches the current version, which keeps them correct across API
+processes; role writes also evict the entries they affect so memory goes
+to live data.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable, Iterable, Optional
+
+from fastapi import Request, Response
+
+RESPONSE_CACHE_MAX_MB = int(os.environ.get("RESPONSE_CACHE_MAX_MB", "64"))
+
+
+class ResponseCache:
+    """LRU-by-bytes cache of serialised JSON bodies, each stored with its ETag and headers."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._lock     = threading.Lock()
+        self._entries: "OrderedDict[str, tuple[str, bytes, dict]]" = OrderedDict()   # LRU first
+        self._bytes    = 0
+        self.hits      = 0
+        self.misses    = 0
+
+    def get(self, key: str, etag: str) -> Optional[tuple[bytes, dict]]:
+        """Body and headers cached for key at this etag, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != etag:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def put(self, key: str, etag: str, body: bytes, headers: dict) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (etag, body, headers)
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, role_ids: Iterable[int] = ()) -> None:
+        """Evict these roles' entries and every role list (any write can change a page)."""
+        doomed = {f"{kind}:{role_id}" for role_id in role_ids for kind in ("role", "steps")}
+        with self._lock:
+            for key in [key for key in self._entries if key in doomed or key.startswith("list:")]:
+                self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
+
+
+cache = ResponseCache(RESPONSE_CACHE_MAX_MB * 1024 * 1024)
+
+
+# ─── VALIDATORS ───────────────────────────────────────────────────────────────
+
+def version_tag(*parts: object) -> str:
+    """Strong ETag from version parts, e.g. ("role", 7, updated_at)."""
+    text = "-".join(
+        part.strftime("%Y%m%d%H%M%S%f") if isinstance(part, datetime) else str(part) for part in parts
+    )
+    return f'"{text}"'
+
+
+def query_key(request: Request) -> str:
+    """Order-insensitive digest of the query string, for keying list responses."""
+    items = sorted(request.query_params.multi_items())
+    return hashlib.sha256(repr(items).encode()).hexdigest()[:16]
+
+
+def _http_date(moment: datetime) -> str:
+    return format_datetime(moment.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def _second_is_over(moment: datetime) -> bool:
+    """True once the clock has left moment's second — only then is its HTTP date exact."""
+    return datetime.utcnow().replace(microsecond=0) > moment.replace(microsecond=0)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison, as If-None-Match requires."""
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """True if the request's validators show the client already has this version."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # If-None-Match wins over If-Modified-Since when both are sent
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+    return False
+
+
+# ─── RESPONSES ────────────────────────────────────────────────────────────────
+
+def cached_json(
+    request:       Request,
+    key:           str,
+    etag:          str,
+    last_modified: Optional[datetime],
+    render:        Callable[[], tuple[bytes, dict]],
+) -> Response:
+    """
+    304, a cached body, or render() — in that order of preference.
+
+    render returns the JSON body and any extra headers (e.g. X-Next-Cursor);
+    it only runs on a miss. last_modified is naive UTC; while its second is
+    still running it is left out, for revalidation by ETag only.
+    """
+    if last_modified is not None and not _second_is_over(last_modified):
+        last_modified = None
+    validators = {"ETag": etag, "Cache-Control": "no-cache"}   # store, but revalidate
+    if last_modified is not None:
+        validators["Last-Modified"] = _http_date(last_modified)
+    if not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=validators)
+
+    hit = cache.get(key, etag)
+    if hit is None:
+        body, headers = render()
+        cache.put(key, etag, body, headers)
+    else:
+        body, headers = hit
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={**headers, **validators, "X-Cache": "HIT" if hit else "MISS"},
+    )
@@ -0,0 +1,198 @@
+"""
+role_import.py — Bulk import of roles (e.g. the historical tracker).
+
+Creating roles one by one costs a flush per role plus ten step INSERTs.
+`import_roles` validates every record against `RoleCreate` and the `roles`
+column constraints up front, then writes valid ones in chunks — one
+transaction per chunk, containing one multi-row INSERT for the roles and one
+executemany INSERT seeding their pipeline steps. Invalid records are
+reported per row; a chunk the database still rejects is retried one row at
+a time, so only the offending rows fail and the rest of the import goes on.
+
+Used by POST /roles:bulk and from the command line:
+  python -m api.role_import tracker.csv
+  python -m api.role_import roles.json --chunk-size 1000
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+from pathlib import Path
+from typing import Any, Iterable
+
+from pydantic import ValidationError
+from sqlalchemy import String, insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from api import changes
+from api.analytics import PipelineDelta
+from api.models import Role, Step, PIPELINE_STEPS
+from api.schemas import RoleCreate, RoleImportError, RoleImportResult
+
+CHUNK_SIZE = 500
+MAX_ROWS   = 50_000
+
+
+# ─── PARSING ──────────────────────────────────────────────────────────────────
+
+def parse_csv(text: str) -> list[dict[str, Any]]:
+    """CSV with a header row of RoleCreate field names; blank cells take the field default."""
+    reader = csv.DictReader(io.StringIO(text))
+    return [
+        {key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()}
+        for row in reader
+    ]
+
+
+def parse_json(text: str) -> list[Any]:
+    """A JSON array of RoleCreate objects."""
+    records = json.loads(text)
+    if not isinstance(records, list):
+        raise ValueError("Expected a JSON array of roles")
+    return records
+
+
+# ─── IMPORT ───────────────────────────────────────────────────────────────────
+
+def _column_errors(values: dict) -> list[str]:
+    """
+    Check role values against the roles column constraints, in place.
+
+    A None for a NOT NULL column with a scalar default (status) takes the
+    default, as it would through the ORM; anything else that the database
+    would reject — a remaining None for a NOT NULL column, a string longer
+    than its column — is returned as a per-row error.
+    """
+    errors = []
+    for name, value in values.items():
+        column = Role.__table__.c[name]
+        if value is None and not column.nullable:
+            if column.default is not None and column.default.is_scalar:
+                values[name] = column.default.arg
+            else:
+                errors.append(f"{name}: may not be null")
+        elif isinstance(value, str) and isinstance(column.type, String) and column.type.length:
+            if len(value) > column.type.length:
+                errors.append(f"{name}: at most {column.type.length} characters")
+    return errors
+
+
+def _validate(records: Iterable[Any]) -> tuple[list[tuple[int, dict]], list[RoleImportError]]:
+    """Split records into (index, role values) for valid rows and per-row errors."""
+    valid, errors = [], []
+    for index, record in enumerate(records):
+        try:
+            values = RoleCreate.model_validate(record).model_dump()
+        except ValidationError as exc:
+            errors.append(RoleImportError(
+                index=index,
+                errors=[f"{'.'.join(map(str, e['loc'])) or 'row'}: {e['msg']}" for e in exc.errors()],
+            ))
+            continue
+        column_errors = _column_errors(values)
+        if column_errors:
+            errors.append(RoleImportError(index=index, errors=column_errors))
+        else:
+            valid.append((index, values))
+    return valid, errors
+
+
+def _insert_chunk(db: Session, chunk: list[dict]) -> list[int]:
+    """Insert one chunk of roles plus their seeded steps; return role ids in input order."""
+    # One multi-row INSERT … RETURNING, rows returned in parameter order
+    inserted = db.execute(
+        insert(Role).returning(Role.id, Role.created_at, Role.updated_at, sort_by_parameter_order=True),
+        chunk,
+    ).all()
+    role_ids = [row.id for row in inserted]
+
+    db.execute(insert(Step), [
+        {"role_id": role_id, "step_number": step_number, "step_name": step_name}
+        for role_id in role_ids
+        for step_number, step_name in PIPELINE_STEPS
+    ])
+
+    # Pipeline counters move in the same transaction, one upsert per table
+    delta = PipelineDelta()
+    for values in chunk:
+        delta.role(values.get("go_no_go"), values.get("status") or "active", values.get("interview_probability"))
+    delta.seeded_steps(len(role_ids))
+    delta.apply(db.connection())
+
+    changes.record(db, [
+        changes.role_entry("create", row.id, {**values, **row._asdict()})
+        for values, row in zip(chunk, inserted)
+    ])
+    return role_ids
+
+
+def import_roles(db: Session, records: list[Any], chunk_size: int = CHUNK_SIZE) -> RoleImportResult:
+    """
+    Validate and insert records, committing every chunk_size roles.
+
+    A chunk that fails in the database is rolled back and retried one row
+    per transaction, so only the rows the database rejects are reported as
+    errors; earlier and later chunks are unaffected.
+    """
+    valid, errors = _validate(records)
+    role_ids: list[int] = []
+
+    for start in range(0, len(valid), chunk_size):
+        chunk = valid[start:start + chunk_size]
+        try:
+            role_ids.extend(_insert_chunk(db, [values for _, values in chunk]))
+            db.commit()
+            continue
+        except SQLAlchemyError:
+            db.rollback()
+        for index, values in chunk:
+            try:
+                role_ids.extend(_insert_chunk(db, [values]))
+                db.commit()
+            except SQLAlchemyError as exc:
+                db.rollback()
+                detail = str(exc.orig if getattr(exc, "orig", None) else exc)
+                errors.append(RoleImportError(index=index, errors=[f"database: {detail}"]))
+
+    errors.sort(key=lambda error: error.index)
+    return RoleImportResult(
+        created=len(role_ids),
+        failed=len(errors),
+        role_ids=role_ids,
+        errors=errors,
+    )
+
+
+# ─── CLI ──────────────────────────────────────────────────────────────────────
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Bulk-import roles from a CSV or JSON file.")
+    parser.add_argument("path", type=Path, help=".csv (header row of role fields) or .json (array)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help="roles per transaction")
+    args = parser.parse_args()
+
+    from api.database import SessionLocal, init_db
+
+    text = args.path.read_text(encoding="utf-8")
+    try:
+        records = parse_csv(text) if args.path.suffix.lower() == ".csv" else parse_json(text)
+    except ValueError as exc:
+        print(f"Could not parse {args.path}: {exc}", file=sys.stderr)
+        return 1
+
+    init_db()
+    with SessionLocal() as db:
+        result = import_roles(db, records, chunk_size=args.chunk_size)
+
+    print(f"Created {result.created} roles, {result.failed} failed")
+    for error in result.errors:
+        print(f"  row {error.index}: {'; '.join(error.errors)}", file=sys.stderr)
+    return 0 if not result.failed else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
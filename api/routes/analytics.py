@@ -0,0 +1,36 @@
+"""
+routes/analytics.py — Pipeline analytics endpoint.
+
+Reads the counter tables kept current by every role/step write (see
+api/analytics.py), so the response costs three small SELECTs however many
+roles and steps exist.
+
+Endpoints
+─────────
+GET /analytics/pipeline → funnel per step, conversion by go/no-go,
+                          average time between steps, probability calibration
+"""
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from api.analytics import pipeline_report
+from api.database import get_db
+from api.schemas import PipelineAnalytics
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+@router.get("/pipeline", response_model=PipelineAnalytics)
+def pipeline(db: Session = Depends(get_db)):
+    """
+    Pipeline summary across all roles.
+
+    - `funnel` — steps per status for each of the 10 pipeline steps
+    - `conversion_by_go_no_go` / `overall` — roles that reached interview
+      ("interviewing" or "offer") vs were rejected, per go/no-go decision
+    - `step_durations` — mean hours from step n-1's completed_at to step n's
+    - `calibration` — per interview_probability decile, the mean prediction
+      against the observed interview rate of decided roles
+    """
+    return pipeline_report(db.connection())
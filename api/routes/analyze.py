@@ -1,15 +1,42 @@
 """
 routes/analyze.py — Autonomous company research + positioning endpoint.
 
-POST /roles/{id}/analyze
+POST /roles/{id}/analyze                      → queue a research run, returns job (202)
+                                                (cached brief → completed job, 200)
+POST /roles/{id}/analyze/stream               → run research inline, SSE progress stream
+POST /roles/analyze:batch                     → research many roles in parallel, NDJSON stream
+GET  /roles/{id}/analyze/jobs                 → list research runs for a role
+GET  /roles/{id}/analyze/jobs/{job_id}        → poll a single run (state, result, error)
 
-Given only a role record (company + role title from the DB), this endpoint:
+Given only a role record (company + role title from the DB), a research run:
   1. Reads identity.txt and profile_master.md from disk (the candidate's stable truth)
-  2. Runs Claude autonomously with the web_search tool — researching founders,
-     funding history, blog posts, LinkedIn activity, product focus, recent signals
-  3. Synthesises all research against the candidate's actual identity and experience
-  4. Returns a structured positioning brief: what to lead with, what language to
-     mirror, which proof points land hardest for this specific company and person
+  2. Research phase — runs Claude autonomously with the web_search tool,
+     researching founders, funding history, blog posts, LinkedIn activity,
+     product focus, recent signals. Notes are stored per company and fact
+     category (api/research_store.py); categories still fresh from an earlier
+     role at the same company are reused and not researched again
+  3. Synthesis phase — one tool-free call synthesises the notes against the
+     candidate's actual identity and experience
+  4. Stores a structured positioning brief on the job: what to lead with, what
+     language to mirror, which proof points land hardest for this specific
+     company and person
+
+The loop can take minutes, so it runs on a bounded background worker pool
+(api/jobs.py) and the request returns as soon as the job is recorded.
+Validated briefs are cached by a hash of their inputs (api/brief_cache.py);
+a repeat analysis of unchanged inputs completes immediately unless
+?refresh=true is passed (which also re-researches every category). The X-Cache header reports HIT / MISS / BYPASS.
+
+The batch endpoint runs its roles on the same worker pool, a few at a time
+per request, with optional per-role iteration and token budgets, streaming
+one job record per line as each role finishes. Batches and single runs
+share the pool's worker cap and queue depth, so however many arrive at
+once the number of loops in flight stays bounded.
+
+The stream endpoint is fully async (AsyncAnthropic): it emits iteration,
+search and partial-text events over SSE so a UI can render before the final
+JSON arrives, and it cancels the upstream model call as soon as the client
+disconnects instead of holding a threadpool slot.
 
 Nothing is invented. All claims are grounded in the master files.
 """
@@ -17,16 +44,28 @@ Nothing is invented. All claims are grounded in the master files.
 import json
 import os
 import re
+import threading
+import time
+from contextlib import aclosing
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator, Iterator, List, Optional, Sequence
 
 import anthropic
-from fastapi import APIRouter, Depends, HTTPException
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from api.database import get_db
-from api.models import Role
-from api.schemas import CompanyAnalysisResponse
+from api import brief_cache, research_store
+from api.database import SessionLocal, get_db
+from api.jobs import JobQueue
+from api.models import AnalysisJob, Role
+from api.schemas import AnalysisJobOut, AnalyzeBatchRequest, CompanyAnalysisResponse
 
 router = APIRouter(prefix="/roles", tags=["analyze"])
 
@@ -44,6 +83,37 @@ _MODEL        = "claude-opus-4-6"
 _MAX_TOKENS   = 8192
 _MAX_LOOPS    = 15   # hard cap on agentic iterations to prevent runaway costs
 
+# History compaction — assistant turns older than the most recent
+# _COMPACT_KEEP_TURNS have their search results replaced by short digests.
+# Each request's input is estimated before it is sent; if that reaches
+# _INPUT_TOKEN_CEILING, every earlier turn is compacted from then on, and if
+# even that doesn't fit, the loop stops without sending it.
+_COMPACT_KEEP_TURNS  = int(os.environ.get("ANALYZE_COMPACT_KEEP_TURNS", "2"))
+_INPUT_TOKEN_CEILING = int(os.environ.get("ANALYZE_INPUT_TOKEN_CEILING", "100000"))
+_DIGEST_RESULTS      = 5   # search results kept (title + url) per digested search
+_CHARS_PER_TOKEN     = 4   # estimate for the first request, before any is measured
+
+# Background pool — how many research runs execute at once, and how many more
+# may wait for a worker before new requests are rejected with 429.
+_WORKERS      = int(os.environ.get("ANALYZE_WORKERS", "2"))
+_QUEUE_DEPTH  = int(os.environ.get("ANALYZE_QUEUE_DEPTH", "16"))
+_RETRY_AFTER  = 30   # seconds suggested to clients when the queue is full
+# Fail jobs a previous process left queued/running — off when processes share a DB
+_RECOVER_ON_STARTUP = os.environ.get("ANALYZE_RECOVER_ON_STARTUP", "1") == "1"
+
+_queue = JobQueue(max_workers=_WORKERS, max_queued=_QUEUE_DEPTH, name="analyze")
+
+# Batch endpoint — default and ceiling for how many of one batch's runs may
+# hold a slot (running or waiting) on the shared pool, and the most role ids
+# a single batch may contain.
+_BATCH_CONCURRENCY     = int(os.environ.get("ANALYZE_BATCH_CONCURRENCY", "4"))
+_BATCH_MAX_CONCURRENCY = int(os.environ.get("ANALYZE_BATCH_MAX_CONCURRENCY", "8"))
+_BATCH_MAX_ROLES       = 200
+_BATCH_RESUBMIT_DELAY  = 1.0   # seconds between retries while other work fills the pool
+# Roles of a batch still waiting for a slot this long after it was accepted
+# are reported as failed instead of retried forever.
+_BATCH_DEADLINE        = float(os.environ.get("ANALYZE_BATCH_DEADLINE", "900"))
+
 # The web_search tool — Anthropic executes searches server-side
 _TOOLS: list[dict] = [
     {
@@ -55,25 +125,46 @@ _TOOLS: list[dict] = [
 
 # ─── PROMPTS ──────────────────────────────────────────────────────────────────
 
-_SYSTEM_PROMPT = """\
-You are a strategic career positioning agent with access to web search.
+# Phase 1 — research. Company-only (no candidate context), so its notes can
+# be stored and reused for any later role at the same company.
+_RESEARCH_SYSTEM_PROMPT = """\
+You are a company research agent with access to web search.
+
+Research the given company thoroughly and autonomously. Cover ONLY the
+categories listed in the request. Look for:
+  - LinkedIn posts, interviews, podcasts, essays, tweets/X posts
+  - Company blog posts, product announcements, press, funding announcements
+  - What problems they're actively trying to solve
+
+Record facts, not opinions. Quote distinctive words and phrases the company or
+founder uses verbatim — they will be mirrored later. Cite the URL of every
+source you rely on.
 
-Your task:
-1. Research the given company thoroughly and autonomously — use web search to find:
-   - What the company actually does and where they're focused right now
-   - Founder(s) background, career history, and what they personally signal they care about
-     (LinkedIn posts, interviews, podcasts, essays, tweets/X posts)
-   - Funding history and stage
-   - Recent product announcements, company blog posts, or press
-   - Tech stack and engineering culture signals
-   - What problems they're actively trying to solve
+Output format:
+Return ONLY a valid JSON object — no prose, no markdown, no code fences.
+One key per requested category:
+
+{
+  "<category>": {
+    "notes": "dense factual notes for this category, including verbatim phrases",
+    "sources": ["https://...", "..."]
+  }
+}
+"""
+
+# Phase 2 — synthesis. Research notes + candidate context → positioning brief.
+_SYSTEM_PROMPT = """\
+You are a strategic career positioning agent.
 
-2. After thorough research, synthesise everything against the candidate profile provided.
-   Produce a precise positioning brief showing how THIS candidate fits THIS company.
+You are given research notes about a company (gathered via web search, with
+sources) and the candidate's identity and profile. Synthesise the research
+against the candidate profile and produce a precise positioning brief showing
+how THIS candidate fits THIS company.
 
 Critical constraints:
 - NEVER invent or extrapolate experience beyond what is explicitly stated in the candidate profile
 - If a proof point isn't in the profile, do not use it
+- Base company and founder claims only on the research notes provided
 - If you are uncertain about a fit signal, mark it as partial, not strong
 - Identity is stable — only the framing changes per company
 
@@ -93,15 +184,25 @@ The JSON must match this exact structure:
 }
 """
 
+# No cache_control: tools + this prompt are a few hundred tokens, below the
+# model's minimum cacheable prefix, so a breakpoint here would cache nothing
+# and use up one of the four a request may carry.
+_RESEARCH_SYSTEM: tuple[dict[str, Any], ...] = (
+    {"type": "text", "text": _RESEARCH_SYSTEM_PROMPT},
+)
 
-def _build_user_prompt(company: str, role_title: str, identity: str, profile: str) -> str:
-    """Construct the initial user message with all candidate context."""
-    return f"""\
-Company: {company}
-Role: {role_title}
 
----
+@lru_cache(maxsize=4)
+def _build_system(identity: str, profile: str) -> tuple[dict[str, Any], ...]:
+    """
+    Build the synthesis system prompt as content blocks, stable prefix cacheable.
 
+    Instructions + candidate context are identical for every role, so they go
+    first and end on a cache_control breakpoint — later roles read them from
+    the prompt cache instead of reprocessing them. Memoised, so the blocks are
+    built once per master file revision.
+    """
+    candidate_context = f"""\
 CANDIDATE IDENTITY (stable — do not alter or invent beyond this):
 {identity}
 
@@ -109,19 +210,257 @@ CANDIDATE IDENTITY (stable — do not alter or invent beyond this):
 
 CANDIDATE PROFILE — verified experience and proof points only:
 {profile}
+"""
+    return (
+        {"type": "text", "text": _SYSTEM_PROMPT},
+        {"type": "text", "text": candidate_context, "cache_control": {"type": "ephemeral"}},
+    )
+
+
+def _build_research_prompt(company: str, categories: Sequence[str]) -> str:
+    """Construct the research-phase user message for the categories still needed."""
+    wanted = "\n".join(
+        f"- {category}: {research_store.CATEGORIES[category][0]}" for category in categories
+    )
+    return f"""\
+Company: {company}
+
+Research these categories:
+{wanted}
+
+Use as many web searches as you need to build a complete picture.
+When you have enough, produce the research JSON as instructed.
+"""
+
+
+def _synthesis_messages(
+    system: Sequence[dict[str, Any]], company: str, role_title: str, notes: dict[str, dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """The synthesis request's messages — raises if they are over the input ceiling."""
+    messages = [{"role": "user", "content": _build_user_prompt(company, role_title, notes)}]
+    _fit_input_ceiling(messages, system, 0, 1 / _CHARS_PER_TOKEN, tools=())
+    return messages
+
+
+def _build_user_prompt(company: str, role_title: str, notes: dict[str, dict[str, Any]]) -> str:
+    """Construct the synthesis user message — role plus the research notes."""
+    research = "\n\n".join(
+        f"## {category}\n{entry['notes']}\nSources: {', '.join(entry['sources']) or 'none'}"
+        for category, entry in notes.items()
+    )
+    return f"""\
+Company: {company}
+Role: {role_title}
+
+---
+
+RESEARCH NOTES:
+{research or "(no research notes available)"}
 
 ---
 
-Research {company} now. Use as many web searches as you need to build a complete picture.
-When you have enough, produce the positioning JSON as instructed.
+Produce the positioning JSON as instructed.
 """
 
 
 # ─── AGENTIC LOOP ─────────────────────────────────────────────────────────────
 
+def _new_usage() -> dict[str, Any]:
+    """Zeroed token counters for one analysis."""
+    return {
+        "input_tokens":           0,
+        "output_tokens":          0,
+        "cache_read_tokens":      0,
+        "cache_write_tokens":     0,
+        "iteration_input_tokens": [],   # full input size of each request, in order
+    }
+
+
+def _add_usage(totals: dict[str, Any], usage: Any) -> int:
+    """Accumulate one response's usage into totals; return total tokens so far."""
+    cache_read  = getattr(usage, "cache_read_input_tokens", None) or 0
+    cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+
+    totals["input_tokens"]       += usage.input_tokens or 0
+    totals["output_tokens"]      += usage.output_tokens or 0
+    totals["cache_read_tokens"]  += cache_read
+    totals["cache_write_tokens"] += cache_write
+    totals["iteration_input_tokens"].append((usage.input_tokens or 0) + cache_read + cache_write)
+
+    return (
+        totals["input_tokens"] + totals["output_tokens"]
+        + totals["cache_read_tokens"] + totals["cache_write_tokens"]
+    )
+
+
+# ─── HISTORY COMPACTION ───────────────────────────────────────────────────────
+
+def _field(block: Any, name: str) -> Any:
+    """Read a content-block field from either an SDK object or a plain dict."""
+    if isinstance(block, dict):
+        return block.get(name)
+    return getattr(block, name, None)
+
+
+def _compact_turn(content: Any) -> list[Any]:
+    """
+    Rewrite one assistant turn with its web searches reduced to digests.
+
+    server_tool_use + web_search_tool_result pairs (the bulk of the tokens —
+    result pages come back as encrypted content) collapse into one text block
+    listing each query and its top result titles/urls. Text keeps its words
+    but drops citations, which point into the removed results. Any other
+    block (e.g. client tool_use) is left untouched so pairing still holds.
+    """
+    compacted: list[Any] = []
+    digest:    list[str] = []
+
+    def flush() -> None:
+        if digest:
+            compacted.append({"type": "text", "text": "\n".join(digest)})
+            digest.clear()
+
+    for block in content:
+        block_type = _field(block, "type")
+
+        if block_type == "server_tool_use":
+            query = (_field(block, "input") or {}).get("query")
+            digest.append(f"[Earlier search] {query}")
+        elif block_type == "web_search_tool_result":
+            results = _field(block, "content")
+            if isinstance(results, list):
+                for result in results[:_DIGEST_RESULTS]:
+                    digest.append(f"  - {_field(result, 'title')} — {_field(result, 'url')}")
+            else:
+                digest.append("  (search returned no results)")
+        elif block_type == "text":
+            flush()
+            text = _field(block, "text")
+            if text:
+                compacted.append({"type": "text", "text": text})
+        else:
+            flush()
+            compacted.append(block)
+
+    flush()
+    return compacted or [{"type": "text", "text": "[Earlier research turn compacted]"}]
+
+
+def _compact_messages(messages: list[dict[str, Any]], keep_recent: int) -> None:
+    """Compact, in place, every assistant turn except the last keep_recent."""
+    assistant_turns = [i for i, m in enumerate(messages) if m["role"] == "assistant"]
+    for i in assistant_turns[:max(len(assistant_turns) - keep_recent, 0)]:
+        messages[i] = {"role": "assistant", "content": _compact_turn(messages[i]["content"])}
+
+
+def _block_json(block: Any) -> Any:
+    """json.dumps fallback for SDK content blocks (pydantic models)."""
+    if hasattr(block, "model_dump"):
+        return block.model_dump(mode="json", exclude_none=True)
+    raise TypeError(f"Object of type {type(block).__name__} is not JSON serializable")
+
+
+def _request_chars(
+    system: Sequence[dict[str, Any]],
+    messages: list[dict[str, Any]],
+    tools: Sequence[dict[str, Any]] = _TOOLS,
+) -> int:
+    """Serialised size of what a request sends as input — system, tools and messages."""
+    return len(json.dumps([list(system), list(tools), messages], default=_block_json))
+
+
+def _fit_input_ceiling(
+    messages: list[dict[str, Any]],
+    system: Sequence[dict[str, Any]],
+    keep_recent: int,
+    tokens_per_char: float,
+    tools: Sequence[dict[str, Any]] = _TOOLS,
+) -> tuple[int, int]:
+    """
+    Compact history so the next request fits under the ceiling before it is sent.
+
+    The request's size is estimated from its serialised length times the
+    tokens-per-char measured on the previous request (the first one
+    assumes _CHARS_PER_TOKEN). At or over the ceiling, every earlier turn
+    is compacted (keep_recent drops to 0 for the rest of the loop); if it
+    still doesn't fit, raise instead of sending it. Returns the keep_recent
+    to carry on with and the request's size in chars. Pass tools=() for a
+    tool-free request such as synthesis.
+    """
+    _compact_messages(messages, keep_recent)
+    chars = _request_chars(system, messages, tools)
+    if chars * tokens_per_char >= _INPUT_TOKEN_CEILING and keep_recent:
+        keep_recent = 0
+        _compact_messages(messages, keep_recent)
+        chars = _request_chars(system, messages, tools)
+
+    estimate = int(chars * tokens_per_char)
+    if estimate >= _INPUT_TOKEN_CEILING:
+        raise ValueError(
+            f"Next request is estimated at {estimate} input tokens, over the ceiling of "
+            f"{_INPUT_TOKEN_CEILING} even with all earlier turns compacted."
+        )
+    return keep_recent, chars
+
+
+def _measured_tokens_per_char(usage: dict[str, Any], chars: int, previous: float) -> float:
+    """Tokens per char of the request just answered, for estimating the next one."""
+    tokens = usage["iteration_input_tokens"][-1]
+    return tokens / chars if tokens and chars else previous
+
+
+def _final_text(response: Any) -> str:
+    """Extract the final text block from an end_turn response."""
+    for block in response.content:
+        if hasattr(block, "text"):
+            return block.text
+    raise ValueError("end_turn reached but no text block found in response")
+
+
+def _tool_results(response: Any) -> list[dict[str, Any]]:
+    """
+    Build tool_result acknowledgements for every tool_use block.
+
+    web_search is server-side — Anthropic executes the search and returns
+    results embedded in the response content. We still need to send back
+    tool_result entries to continue the conversation.
+    """
+    return [
+        {
+            "type": "tool_result",
+            "tool_use_id": block.id,
+            "content": "Search executed.",
+        }
+        for block in response.content
+        if hasattr(block, "type") and block.type == "tool_use"
+    ]
+
+
+def _check_token_budget(
+    token_budget: Optional[int], tokens_used: int, iteration: int,
+) -> None:
+    """Raise once cumulative usage reaches token_budget without a final answer."""
+    if token_budget is not None and tokens_used >= token_budget:
+        raise ValueError(
+            f"Token budget of {token_budget} exhausted after {iteration + 1} "
+            f"iterations ({tokens_used} tokens used) without a final answer."
+        )
+
+
+def _loop_exhausted(max_loops: int) -> ValueError:
+    return ValueError(
+        f"Research loop did not reach end_turn after {max_loops} iterations. "
+        "The model may have hit a token limit or entered an unexpected state."
+    )
+
+
 def _run_research_loop(
     client: anthropic.Anthropic,
+    system: Sequence[dict[str, Any]],
     user_prompt: str,
+    max_loops: int = _MAX_LOOPS,
+    token_budget: Optional[int] = None,
+    usage: Optional[dict[str, Any]] = None,
 ) -> str:
     """
     Run the agentic tool-use loop until Claude returns a final answer.
@@ -130,45 +469,43 @@ def _run_research_loop(
       - Send message with web_search tool available
       - If stop_reason == "tool_use": add assistant turn, continue
       - If stop_reason == "end_turn": extract and return text content
-      - Hard cap at _MAX_LOOPS iterations
+      - Hard cap at max_loops iterations (default _MAX_LOOPS)
+      - Optional token_budget caps total input + output tokens across iterations
+      - Token counts (including prompt-cache reads/writes) accumulate into usage
+      - Older search results are compacted into digests before each request
+        (see _compact_messages) so input size stays roughly flat, and a
+        request estimated over _INPUT_TOKEN_CEILING is never sent
+        (see _fit_input_ceiling)
     """
     messages: list[dict[str, Any]] = [
         {"role": "user", "content": user_prompt}
     ]
+    usage = _new_usage() if usage is None else usage
+    keep_recent     = _COMPACT_KEEP_TURNS
+    tokens_per_char = 1 / _CHARS_PER_TOKEN
 
-    for iteration in range(_MAX_LOOPS):
+    for iteration in range(max_loops):
+        keep_recent, chars = _fit_input_ceiling(messages, system, keep_recent, tokens_per_char)
         response = client.messages.create(
             model=_MODEL,
             max_tokens=_MAX_TOKENS,
-            system=_SYSTEM_PROMPT,
+            system=list(system),
             tools=_TOOLS,
             messages=messages,
         )
+        tokens_used     = _add_usage(usage, response.usage)
+        tokens_per_char = _measured_tokens_per_char(usage, chars, tokens_per_char)
 
         # Always append the assistant turn to maintain conversation history
         messages.append({"role": "assistant", "content": response.content})
 
         if response.stop_reason == "end_turn":
-            # Extract the final text block from the response content
-            for block in response.content:
-                if hasattr(block, "text"):
-                    return block.text
-            raise ValueError("end_turn reached but no text block found in response")
+            return _final_text(response)
+
+        _check_token_budget(token_budget, tokens_used, iteration)
 
         if response.stop_reason == "tool_use":
-            # Build tool_result acknowledgements for every tool_use block.
-            # web_search is server-side — Anthropic executes the search and
-            # returns results embedded in the response content. We still need
-            # to send back tool_result entries to continue the conversation.
-            tool_results = [
-                {
-                    "type": "tool_result",
-                    "tool_use_id": block.id,
-                    "content": "Search executed.",
-                }
-                for block in response.content
-                if hasattr(block, "type") and block.type == "tool_use"
-            ]
+            tool_results = _tool_results(response)
             if tool_results:
                 messages.append({"role": "user", "content": tool_results})
             continue
@@ -176,10 +513,104 @@ def _run_research_loop(
         # Any other stop_reason (e.g. max_tokens) — break and use what we have
         break
 
-    raise ValueError(
-        f"Research loop did not reach end_turn after {_MAX_LOOPS} iterations. "
-        "The model may have hit a token limit or entered an unexpected state."
-    )
+    raise _loop_exhausted(max_loops)
+
+
+# ─── ASYNC LOOP ───────────────────────────────────────────────────────────────
+
+async def _research_events(
+    client: anthropic.AsyncAnthropic,
+    system: Sequence[dict[str, Any]],
+    user_prompt: str,
+    max_loops: int = _MAX_LOOPS,
+    token_budget: Optional[int] = None,
+    usage: Optional[dict[str, Any]] = None,
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    """
+    Async, streaming twin of _run_research_loop that yields progress events.
+
+    Same control flow, but each iteration streams from AsyncAnthropic so the
+    caller sees work as it happens. Yields (event, data) pairs:
+      iteration — {"iteration", "max_iterations"} at the start of each call
+      search    — {"tool", "query"} when a search tool call completes
+      text      — {"text"} for each partial text delta
+      input     — {"iteration", "input_tokens"} size of the request just sent
+      final     — {"text"} the complete final answer (always last)
+
+    Cancelling the consuming task closes the upstream stream, so abandoned
+    runs stop spending tokens immediately.
+    """
+    messages: list[dict[str, Any]] = [
+        {"role": "user", "content": user_prompt}
+    ]
+    usage = _new_usage() if usage is None else usage
+    keep_recent     = _COMPACT_KEEP_TURNS
+    tokens_per_char = 1 / _CHARS_PER_TOKEN
+
+    for iteration in range(max_loops):
+        yield "iteration", {"iteration": iteration + 1, "max_iterations": max_loops}
+        keep_recent, chars = _fit_input_ceiling(messages, system, keep_recent, tokens_per_char)
+
+        async with client.messages.stream(
+            model=_MODEL,
+            max_tokens=_MAX_TOKENS,
+            system=list(system),
+            tools=_TOOLS,
+            messages=messages,
+        ) as stream:
+            async for event in stream:
+                if event.type == "text":
+                    yield "text", {"text": event.text}
+                elif event.type == "content_block_stop":
+                    block = event.content_block
+                    if block.type in ("server_tool_use", "tool_use"):
+                        query = (getattr(block, "input", None) or {}).get("query")
+                        yield "search", {"tool": block.name, "query": query}
+            response = await stream.get_final_message()
+
+        tokens_used     = _add_usage(usage, response.usage)
+        tokens_per_char = _measured_tokens_per_char(usage, chars, tokens_per_char)
+        yield "input", {
+            "iteration":    iteration + 1,
+            "input_tokens": usage["iteration_input_tokens"][-1],
+        }
+
+        # Always append the assistant turn to maintain conversation history
+        messages.append({"role": "assistant", "content": response.content})
+
+        if response.stop_reason == "end_turn":
+            yield "final", {"text": _final_text(response)}
+            return
+
+        _check_token_budget(token_budget, tokens_used, iteration)
+
+        if response.stop_reason == "tool_use":
+            tool_results = _tool_results(response)
+            if tool_results:
+                messages.append({"role": "user", "content": tool_results})
+            continue
+
+        # Any other stop_reason (e.g. max_tokens) — break and use what we have
+        break
+
+    raise _loop_exhausted(max_loops)
+
+
+async def _run_research_loop_async(
+    client: anthropic.AsyncAnthropic,
+    system: Sequence[dict[str, Any]],
+    user_prompt: str,
+    max_loops: int = _MAX_LOOPS,
+    token_budget: Optional[int] = None,
+    usage: Optional[dict[str, Any]] = None,
+) -> str:
+    """Async equivalent of _run_research_loop — returns the final text only."""
+    events = _research_events(client, system, user_prompt, max_loops, token_budget, usage)
+    async with aclosing(events) as events:
+        async for name, data in events:
+            if name == "final":
+                return data["text"]
+    raise _loop_exhausted(max_loops)
 
 
 # ─── OUTPUT PARSING ───────────────────────────────────────────────────────────
@@ -201,69 +632,756 @@ def _parse_json_response(raw: str) -> dict:
         raise ValueError(f"Claude response was not valid JSON: {exc}\n\nRaw:\n{raw[:500]}")
 
 
-# ─── ENDPOINT ─────────────────────────────────────────────────────────────────
+# ─── MASTER FILES ─────────────────────────────────────────────────────────────
+
+# Loaded once (preload_master_files at startup) and re-read only when a
+# file's mtime changes. path → (mtime_ns, stripped text)
+_master_cache: dict[Path, tuple[int, str]] = {}
+_master_lock  = threading.Lock()
+
+
+def _read_master_file(path: Path, label: str) -> str:
+    """Return a master file's text, from memory unless it changed on disk."""
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Master file not found: {label} (expected at {path})"
+        )
+
+    with _master_lock:
+        cached = _master_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    text = path.read_text(encoding="utf-8").strip()
+    with _master_lock:
+        _master_cache[path] = (mtime, text)
+    return text
+
+
+def _read_master_files() -> tuple[str, str]:
+    """Return (identity, profile), or raise 500 if either file is missing."""
+    identity = _read_master_file(_IDENTITY_PATH, "identity.txt")
+    profile  = _read_master_file(_PROFILE_PATH, "profile_master.md")
+    return identity, profile
+
+
+def preload_master_files() -> None:
+    """Warm the master-file cache at startup. Missing files surface per request."""
+    try:
+        _read_master_files()
+    except HTTPException:
+        pass
+
+
+# ─── ANALYSIS ─────────────────────────────────────────────────────────────────
+
+def _analyze(
+    client: anthropic.Anthropic,
+    db: Session,
+    company: str,
+    role_title: str,
+    identity: str,
+    profile: str,
+    max_loops: int = _MAX_LOOPS,
+    token_budget: Optional[int] = None,
+    usage: Optional[dict[str, Any]] = None,
+    reuse_research: bool = True,
+) -> CompanyAnalysisResponse:
+    """
+    Research (only what isn't already fresh) then synthesise a positioning brief.
+
+    Phase 1 runs the web-search loop for categories with no fresh stored
+    notes and saves what it finds; a known company can skip it entirely.
+    Phase 2 is a single tool-free call over notes + candidate context.
+    """
+    usage = _new_usage() if usage is None else usage
+    notes = research_store.load_fresh(db, company) if reuse_research else {}
+    missing = [c for c in research_store.CATEGORIES if c not in notes]
+
+    if missing:
+        try:
+            raw_notes = _run_research_loop(
+                client, _RESEARCH_SYSTEM, _build_research_prompt(company, missing),
+                max_loops, token_budget, usage,
+            )
+            new_notes = _parse_research_notes(raw_notes, missing)
+        except Exception as exc:
+            raise RuntimeError(f"Research loop failed: {exc}") from exc
+        research_store.save(db, company, new_notes)
+        notes.update(new_notes)
+
+    try:
+        system   = _build_system(identity, profile)
+        response = client.messages.create(
+            model=_MODEL,
+            max_tokens=_MAX_TOKENS,
+            system=list(system),
+            messages=_synthesis_messages(system, company, role_title, notes),
+        )
+        _add_usage(usage, response.usage)
+        raw_response = _final_text(response)
+    except Exception as exc:
+        raise RuntimeError(f"Synthesis failed: {exc}") from exc
+
+    return _parse_brief(raw_response)
 
-@router.post("/{role_id}/analyze", response_model=CompanyAnalysisResponse)
-def analyze_role(role_id: int, db: Session = Depends(get_db)):
+
+def _parse_research_notes(raw: str, categories: Sequence[str]) -> dict[str, dict[str, Any]]:
+    """
+    Parse the research loop's JSON into category → {"notes", "sources"}.
+
+    Categories the model skipped or left empty are dropped, so they are
+    researched again next time rather than stored blank.
     """
-    Autonomously research a company and return a positioning brief.
+    data = _parse_json_response(raw)
+    notes: dict[str, dict[str, Any]] = {}
+    for category in categories:
+        entry = data.get(category)
+        if not isinstance(entry, dict) or not entry.get("notes"):
+            continue
+        notes[category] = {
+            "notes":   str(entry["notes"]),
+            "sources": [str(url) for url in entry.get("sources") or []],
+        }
+    return notes
+
 
-    Requires ANTHROPIC_API_KEY in the environment.
+def _parse_brief(raw_response: str) -> CompanyAnalysisResponse:
+    """Parse and validate the loop's final text into a positioning brief."""
+    try:
+        data = _parse_json_response(raw_response)
+        return CompanyAnalysisResponse(**data)
+    except (ValueError, TypeError) as exc:
+        raise ValueError(
+            f"Failed to parse model output into positioning brief: {exc}"
+        ) from exc
 
-    The endpoint reads identity.txt and profile_master.md from disk,
-    then runs an agentic Claude loop (with web_search) to research the
-    company before synthesising everything into a structured positioning brief.
+
+def _run_job(
+    job_id: int,
+    api_key: str,
+    company: str,
+    role_title: str,
+    identity: str,
+    profile: str,
+    cache_key: str,
+    max_loops: int = _MAX_LOOPS,
+    token_budget: Optional[int] = None,
+    reuse_research: bool = True,
+) -> Optional[AnalysisJobOut]:
     """
-    # ── 1. Fetch role record ──────────────────────────────────────────────────
+    Worker entry point — executes one AnalysisJob and persists the outcome.
+    Successful briefs are also written to the brief cache under cache_key.
+
+    Runs on a worker thread, so it opens its own DB session rather than
+    borrowing the (already closed) request session. Returns the final job
+    record, or None if the job was deleted before it started.
+    """
+    db = SessionLocal()
+    try:
+        job = db.get(AnalysisJob, job_id)
+        if job is None:
+            return None  # role (and its jobs) deleted while queued
+
+        job.status     = "running"
+        job.started_at = datetime.utcnow()
+        db.commit()
+
+        usage = _new_usage()
+        try:
+            client = anthropic.Anthropic(api_key=api_key)
+            result = _analyze(
+                client, db, company, role_title, identity, profile,
+                max_loops=max_loops, token_budget=token_budget, usage=usage,
+                reuse_research=reuse_research,
+            )
+        except Exception as exc:
+            job.status = "failed"
+            job.error  = str(exc)
+        else:
+            job.status = "complete"
+            job.result = result.model_dump_json()
+
+        for field, value in usage.items():
+            setattr(job, field, value)
+        job.finished_at = datetime.utcnow()
+        db.commit()
+
+        if job.status == "complete":
+            _cache_brief(db, cache_key, company, role_title, job.result)
+
+        return AnalysisJobOut.model_validate(job)
+    finally:
+        db.close()
+
+
+def _cache_brief(db: Session, cache_key: str, company: str, role_title: str, result: str) -> None:
+    """
+    Write a finished brief to the brief cache, best effort.
+
+    The brief is already stored on its job, so a failed cache write only
+    costs a later re-run — it must not fail the job or whoever is waiting
+    on it.
+    """
+    try:
+        brief_cache.put(db, cache_key, company, role_title, result)
+    except Exception:
+        db.rollback()
+
+
+def recover_interrupted_jobs() -> None:
+    """
+    Mark jobs left queued/running by a previous process as failed.
+
+    Worker threads do not survive a restart, so without this those records
+    would poll as in-progress forever. Called once from the app lifespan.
+
+    With several API processes sharing one database a starting process
+    can't tell its own orphans from jobs another process is still running,
+    so ANALYZE_RECOVER_ON_STARTUP=0 disables this there.
+    """
+    if not _RECOVER_ON_STARTUP:
+        return
+    db = SessionLocal()
+    try:
+        (
+            db.query(AnalysisJob)
+            .filter(AnalysisJob.status.in_(("queued", "running")))
+            .update(
+                {
+                    AnalysisJob.status:      "failed",
+                    AnalysisJob.error:       "Interrupted by server restart",
+                    AnalysisJob.finished_at: datetime.utcnow(),
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _fail_unstarted_jobs(job_ids: list[int]) -> None:
+    """Mark any of job_ids still queued as failed (their batch was abandoned)."""
+    db = SessionLocal()
+    try:
+        (
+            db.query(AnalysisJob)
+            .filter(AnalysisJob.id.in_(job_ids), AnalysisJob.status == "queued")
+            .update(
+                {
+                    AnalysisJob.status:      "failed",
+                    AnalysisJob.error:       "Batch cancelled before this role started",
+                    AnalysisJob.finished_at: datetime.utcnow(),
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _fail_batch_jobs(job_ids: list[int], error: str) -> list[AnalysisJobOut]:
+    """Mark any of job_ids not yet finished as failed; return their records in order."""
+    db = SessionLocal()
+    try:
+        (
+            db.query(AnalysisJob)
+            .filter(AnalysisJob.id.in_(job_ids), AnalysisJob.status.in_(("queued", "running")))
+            .update(
+                {
+                    AnalysisJob.status:      "failed",
+                    AnalysisJob.error:       error,
+                    AnalysisJob.finished_at: datetime.utcnow(),
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        jobs = {job.id: job for job in db.query(AnalysisJob).filter(AnalysisJob.id.in_(job_ids))}
+        return [AnalysisJobOut.model_validate(jobs[job_id]) for job_id in job_ids if job_id in jobs]
+    finally:
+        db.close()
+
+
+def _finish_job(job_id: int, status_: str, result: Optional[str] = None,
+                error: Optional[str] = None,
+                usage: Optional[dict[str, Any]] = None) -> None:
+    """Write the terminal state of a job that ran outside the worker pool."""
+    db = SessionLocal()
+    try:
+        job = db.get(AnalysisJob, job_id)
+        if job is None:
+            return
+        for field, value in (usage or {}).items():
+            setattr(job, field, value)
+        job.status      = status_
+        job.result      = result
+        job.error       = error
+        job.finished_at = datetime.utcnow()
+        db.commit()
+    finally:
+        db.close()
+
+
+def shutdown_queue() -> None:
+    """Stop the background pool — waiting jobs are dropped, not run."""
+    _queue.shutdown(wait=False)
+
+
+# ─── ENDPOINTS ────────────────────────────────────────────────────────────────
+
+def _get_role_or_404(role_id: int, db: Session) -> Role:
+    """Fetch a Role by id or raise 404."""
     role = db.get(Role, role_id)
     if not role:
         raise HTTPException(status_code=404, detail=f"Role {role_id} not found")
+    return role
 
-    # ── 2. Read master files from disk ───────────────────────────────────────
-    for path, label in [(_IDENTITY_PATH, "identity.txt"), (_PROFILE_PATH, "profile_master.md")]:
-        if not path.exists():
-            raise HTTPException(
-                status_code=500,
-                detail=f"Master file not found: {label} (expected at {path})"
-            )
-
-    identity = _IDENTITY_PATH.read_text(encoding="utf-8").strip()
-    profile  = _PROFILE_PATH.read_text(encoding="utf-8").strip()
 
-    # ── 3. Initialise Anthropic client ───────────────────────────────────────
+def _get_api_key_or_500() -> str:
+    """Return ANTHROPIC_API_KEY or raise 500 if it is not configured."""
     api_key = os.environ.get("ANTHROPIC_API_KEY")
     if not api_key:
         raise HTTPException(
             status_code=500,
             detail="ANTHROPIC_API_KEY environment variable is not set",
         )
+    return api_key
 
-    client = anthropic.Anthropic(api_key=api_key)
 
-    # ── 4. Build prompt and run agentic research loop ────────────────────────
-    user_prompt = _build_user_prompt(
+def _cache_key_for(role: Role, identity: str, profile: str) -> str:
+    """Brief-cache key for this role under the current prompt and model."""
+    return brief_cache.make_key(
         company=role.company,
         role_title=role.role_title,
         identity=identity,
         profile=profile,
+        system_prompt=_RESEARCH_SYSTEM_PROMPT + _SYSTEM_PROMPT,
+        model=_MODEL,
     )
 
-    try:
-        raw_response = _run_research_loop(client, user_prompt)
-    except Exception as exc:
+
+def _record_cached_job(db: Session, role: Role, cached: str) -> AnalysisJob:
+    """Persist an already-complete job whose result came from the brief cache."""
+    now = datetime.utcnow()
+    job = AnalysisJob(
+        role_id=role.id,
+        status="complete",
+        result=cached,
+        started_at=now,
+        finished_at=now,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+@router.post(
+    "/{role_id}/analyze",
+    response_model=AnalysisJobOut,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def analyze_role(
+    role_id: int,
+    response: Response,
+    refresh: bool = Query(False, description="Ignore any cached brief and re-run research"),
+    db: Session = Depends(get_db),
+):
+    """
+    Queue an autonomous company research run and return its job record.
+
+    Requires ANTHROPIC_API_KEY in the environment (not needed on a cache hit).
+
+    Master files and the API key are checked up front so configuration errors
+    surface on this request rather than on the job. Poll
+    GET /roles/{id}/analyze/jobs/{job_id} for the positioning brief.
+    Returns 429 with Retry-After when the worker pool and queue are full.
+
+    If an unexpired brief exists for the same inputs, the job is created
+    already complete and returned with 200 and X-Cache: HIT.
+    """
+    # ── 1. Fetch role record ──────────────────────────────────────────────────
+    role = _get_role_or_404(role_id, db)
+
+    # ── 2. Read master files from disk ───────────────────────────────────────
+    identity, profile = _read_master_files()
+
+    # ── 3. Serve from the brief cache when inputs are unchanged ──────────────
+    cache_key = _cache_key_for(role, identity, profile)
+    cached = None if refresh else brief_cache.get(db, cache_key)
+    response.headers["X-Cache"] = "BYPASS" if refresh else ("HIT" if cached else "MISS")
+
+    if cached is not None:
+        response.status_code = status.HTTP_200_OK
+        return _record_cached_job(db, role, cached)
+
+    # ── 4. Check Anthropic credentials ───────────────────────────────────────
+    api_key = _get_api_key_or_500()
+
+    # ── 5. Record the job, then hand it to the worker pool ───────────────────
+    job = AnalysisJob(role_id=role.id, status="queued")
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    future = _queue.submit(
+        _run_job, job.id, api_key, role.company, role.role_title, identity, profile,
+        cache_key, reuse_research=not refresh,
+    )
+    if future is None:
+        db.delete(job)
+        db.commit()
         raise HTTPException(
-            status_code=502,
-            detail=f"Research loop failed: {exc}",
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Analysis queue is full — retry later",
+            headers={"Retry-After": str(_RETRY_AFTER)},
         )
 
-    # ── 5. Parse and validate Claude's JSON output ───────────────────────────
+    return job
+
+
+def _sse(event: str, data: Any) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@dataclass
+class _StreamSetup:
+    """Everything analyze_role_stream needs from the database before streaming."""
+    job:        AnalysisJobOut
+    cached:     bool
+    company:    str = ""
+    role_title: str = ""
+    api_key:    str = ""
+    cache_key:  str = ""
+    identity:   str = ""
+    profile:    str = ""
+    notes:      Optional[dict[str, dict[str, Any]]] = None
+
+
+def _prepare_stream(role_id: int, refresh: bool, db: Session) -> _StreamSetup:
+    """
+    Blocking setup for the stream endpoint — run in the threadpool.
+
+    Returns the recorded cache-hit job, or the new running job plus the
+    inputs for research: any fresh stored notes, and the credentials.
+    """
+    role = _get_role_or_404(role_id, db)
+    identity, profile = _read_master_files()
+
+    cache_key = _cache_key_for(role, identity, profile)
+    cached = None if refresh else brief_cache.get(db, cache_key)
+    if cached is not None:
+        return _StreamSetup(AnalysisJobOut.model_validate(_record_cached_job(db, role, cached)), cached=True)
+
+    api_key = _get_api_key_or_500()
+    job = AnalysisJob(role_id=role.id, status="running", started_at=datetime.utcnow())
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    return _StreamSetup(
+        job=AnalysisJobOut.model_validate(job),
+        cached=False,
+        company=role.company,
+        role_title=role.role_title,
+        api_key=api_key,
+        cache_key=cache_key,
+        identity=identity,
+        profile=profile,
+        notes=research_store.load_fresh(db, role.company) if not refresh else {},
+    )
+
+
+def _save_research(company: str, notes: dict[str, dict[str, Any]]) -> None:
+    """Store a stream's research notes on a session of its own (threadpool)."""
+    db = SessionLocal()
     try:
-        data = _parse_json_response(raw_response)
-        result = CompanyAnalysisResponse(**data)
-    except (ValueError, TypeError) as exc:
+        research_store.save(db, company, notes)
+    finally:
+        db.close()
+
+
+def _finish_stream_job(setup: _StreamSetup, outcome: tuple, usage: dict[str, Any]) -> None:
+    """Persist a stream's terminal job state and cache a successful brief (threadpool)."""
+    _finish_job(setup.job.id, *outcome, usage=usage)
+    if outcome[0] != "complete":
+        return
+    db = SessionLocal()
+    try:
+        _cache_brief(db, setup.cache_key, setup.company, setup.role_title, outcome[1])
+    finally:
+        db.close()
+
+
+@router.post("/{role_id}/analyze/stream")
+async def analyze_role_stream(
+    role_id: int,
+    request: Request,
+    refresh: bool = Query(False, description="Ignore any cached brief and re-run research"),
+    db: Session = Depends(get_db),
+):
+    """
+    Run the research loop inline and stream its progress as server-sent events.
+
+    Events: `job` (the AnalysisJob record, first), `research` (categories
+    reused vs. researched), `iteration` / `input` / `search` / `text` during
+    research, `synthesis` then `text` (partial brief), `usage` (token counts
+    incl. prompt cache), then `result` (validated brief) or `error`.
+    A cache hit skips straight to `result`.
+
+    Model calls run on the event loop via AsyncAnthropic; every database
+    call goes through the threadpool so a slow lock or a busy pool never
+    stalls other requests. If the client disconnects the upstream stream is
+    closed immediately and the job is marked failed. The run is still
+    recorded as an AnalysisJob, and a successful brief is written to the
+    brief cache.
+    """
+    setup = await run_in_threadpool(_prepare_stream, role_id, refresh, db)
+    if setup.cached:
+        async def replay() -> AsyncIterator[str]:
+            yield _sse("job", setup.job.model_dump(mode="json", exclude={"result"}))
+            yield _sse("result", setup.job.result.model_dump())
+
+        return StreamingResponse(
+            replay(), media_type="text/event-stream", headers={"X-Cache": "HIT"},
+        )
+
+    company, role_title = setup.company, setup.role_title
+    notes   = setup.notes
+    missing = [c for c in research_store.CATEGORIES if c not in notes]
+    system  = _build_system(setup.identity, setup.profile)
+
+    async def stream() -> AsyncIterator[str]:
+        client  = anthropic.AsyncAnthropic(api_key=setup.api_key)
+        usage   = _new_usage()
+        outcome = ("failed", None, "Client disconnected")
+        phase   = "Research loop"
+        try:
+            yield _sse("job", setup.job.model_dump(mode="json"))
+            yield _sse("research", {"reused": list(notes), "researching": missing})
+
+            # ── Phase 1: research only the categories without fresh notes ────
+            if missing:
+                raw_notes = None
+                events = _research_events(
+                    client, _RESEARCH_SYSTEM, _build_research_prompt(company, missing),
+                    usage=usage,
+                )
+                async with aclosing(events) as events:
+                    async for name, data in events:
+                        if name == "iteration" and await request.is_disconnected():
+                            return
+                        if name == "final":
+                            raw_notes = data["text"]
+                        else:
+                            yield _sse(name, data)
+
+                new_notes = _parse_research_notes(raw_notes, missing)
+                await run_in_threadpool(_save_research, company, new_notes)
+                notes.update(new_notes)
+
+            # ── Phase 2: single synthesis call, streamed as partial text ─────
+            phase = "Synthesis"
+            if await request.is_disconnected():
+                return
+            yield _sse("synthesis", {"categories": list(notes)})
+            async with client.messages.stream(
+                model=_MODEL,
+                max_tokens=_MAX_TOKENS,
+                system=list(system),
+                messages=_synthesis_messages(system, company, role_title, notes),
+            ) as synthesis:
+                async for text in synthesis.text_stream:
+                    yield _sse("text", {"text": text})
+                response = await synthesis.get_final_message()
+            _add_usage(usage, response.usage)
+
+            result  = _parse_brief(_final_text(response))
+            outcome = ("complete", result.model_dump_json(), None)
+            yield _sse("usage", usage)
+            yield _sse("result", result.model_dump())
+        except Exception as exc:
+            outcome = ("failed", None, f"{phase} failed: {exc}")
+            yield _sse("error", {"detail": outcome[2]})
+        finally:
+            # Shielded: the task may be cancelled because the client went away,
+            # and the job still has to reach a terminal state.
+            with anyio.CancelScope(shield=True):
+                await run_in_threadpool(_finish_stream_job, setup, outcome, usage)
+                await client.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={
+            "X-Cache":        "BYPASS" if refresh else "MISS",
+            "Cache-Control":  "no-cache",
+        },
+    )
+
+
+@router.post("/analyze:batch")
+def analyze_roles_batch(payload: AnalyzeBatchRequest, db: Session = Depends(get_db)):
+    """
+    Research many roles concurrently and stream results as NDJSON.
+
+    Each output line is an AnalysisJobOut, written as soon as that role
+    finishes — cache hits first, then research runs in completion order.
+    Every role gets a persisted AnalysisJob, so results remain pollable via
+    GET /roles/{id}/analyze/jobs afterwards.
+
+    Runs go through the shared worker pool, so they count against the same
+    worker cap and queue depth as POST /roles/{id}/analyze. `concurrency`
+    caps how many of this batch's runs hold a pool slot at once (default
+    ANALYZE_BATCH_CONCURRENCY, ceiling ANALYZE_BATCH_MAX_CONCURRENCY); the
+    rest are submitted as those finish. Returns 429 with Retry-After when
+    the pool can't take any of them. Roles still waiting for a slot
+    ANALYZE_BATCH_DEADLINE seconds after the batch was accepted, and runs
+    whose worker raised, are written as failed lines; the stream always
+    ends with one line per role. `max_iterations` and `token_budget` apply
+    to each role individually.
+    """
+    # ── 1. Validate request ──────────────────────────────────────────────────
+    role_ids = list(dict.fromkeys(payload.role_ids))   # de-dupe, keep order
+    if not role_ids:
+        raise HTTPException(status_code=422, detail="role_ids must not be empty")
+    if len(role_ids) > _BATCH_MAX_ROLES:
         raise HTTPException(
             status_code=422,
-            detail=f"Failed to parse model output into positioning brief: {exc}",
+            detail=f"At most {_BATCH_MAX_ROLES} roles per batch",
         )
 
-    return result
+    roles = {r.id: r for r in db.query(Role).filter(Role.id.in_(role_ids))}
+    missing = [rid for rid in role_ids if rid not in roles]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Roles not found: {missing}")
+
+    concurrency = max(1, min(payload.concurrency or _BATCH_CONCURRENCY, _BATCH_MAX_CONCURRENCY))
+    max_loops   = max(1, min(payload.max_iterations or _MAX_LOOPS, _MAX_LOOPS))
+
+    identity, profile = _read_master_files()
+
+    # ── 2. Split into cache hits and research runs ───────────────────────────
+    ready:   list[AnalysisJobOut] = []
+    pending: list[tuple[int, Role, str]] = []   # (job_id, role, cache_key)
+
+    for rid in role_ids:
+        role      = roles[rid]
+        cache_key = _cache_key_for(role, identity, profile)
+        cached    = None if payload.refresh else brief_cache.get(db, cache_key)
+        if cached is not None:
+            ready.append(AnalysisJobOut.model_validate(_record_cached_job(db, role, cached)))
+            continue
+
+        job = AnalysisJob(role_id=role.id, status="queued")
+        db.add(job)
+        db.flush()
+        pending.append((job.id, role, cache_key))
+    db.commit()
+
+    api_key = _get_api_key_or_500() if pending else ""
+    waiting = [
+        (job_id, api_key, role.company, role.role_title, identity, profile, cache_key)
+        for job_id, role, cache_key in pending
+    ]
+    waiting.reverse()   # popped from the end, so submitted in request order
+    in_flight: dict[Future, int] = {}   # future → job id
+    deadline = time.monotonic() + _BATCH_DEADLINE
+
+    def top_up() -> None:
+        """Submit waiting runs until this batch holds `concurrency` slots or the pool is full."""
+        while waiting and len(in_flight) < concurrency:
+            future = _queue.submit(
+                _run_job, *waiting[-1],
+                max_loops=max_loops, token_budget=payload.token_budget,
+                reuse_research=not payload.refresh,
+            )
+            if future is None:
+                return
+            in_flight[future] = waiting.pop()[0]
+
+    # ── 3. Admit the batch onto the shared pool ──────────────────────────────
+    top_up()
+    if waiting and not in_flight:
+        db.query(AnalysisJob).filter(AnalysisJob.id.in_([job_id for job_id, _, _ in pending])).delete(
+            synchronize_session=False,
+        )
+        db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Analysis queue is full — retry later",
+            headers={"Retry-After": str(_RETRY_AFTER)},
+        )
+
+    # ── 4. Stream each result as it completes, refilling as slots free up ───
+    def stream() -> Iterator[str]:
+        try:
+            for job in ready:
+                yield job.model_dump_json() + "\n"
+            while in_flight or waiting:
+                remaining = deadline - time.monotonic()
+                if waiting and remaining <= 0:
+                    # Never got a slot — report them rather than wait on
+                    expired = [job_id for job_id, *_ in reversed(waiting)]
+                    waiting.clear()
+                    for job in _fail_batch_jobs(
+                        expired, f"Batch deadline of {_BATCH_DEADLINE:g}s passed before this role started",
+                    ):
+                        yield job.model_dump_json() + "\n"
+                    continue
+                if not in_flight:
+                    # Other requests hold every slot — retry shortly
+                    time.sleep(min(_BATCH_RESUBMIT_DELAY, remaining))
+                    top_up()
+                    continue
+                done, _ = wait(
+                    in_flight, timeout=remaining if waiting else None, return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    job_id = in_flight.pop(future)
+                    try:
+                        job = future.result()
+                    except Exception as exc:
+                        failed = _fail_batch_jobs([job_id], f"Analysis worker failed: {exc}")
+                        job    = failed[0] if failed else None   # deleted along with its role
+                    if job is not None:
+                        yield job.model_dump_json() + "\n"
+                top_up()
+        finally:
+            # Client gone or stream finished — don't start loops nobody will read
+            for future in in_flight:
+                future.cancel()
+            _fail_unstarted_jobs([job_id for job_id, _, _ in pending])
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.get("/{role_id}/analyze/jobs", response_model=List[AnalysisJobOut])
+def list_analysis_jobs(role_id: int, db: Session = Depends(get_db)):
+    """Return every research run for a role, newest first."""
+    _get_role_or_404(role_id, db)
+    return (
+        db.query(AnalysisJob)
+        .filter(AnalysisJob.role_id == role_id)
+        .order_by(AnalysisJob.created_at.desc(), AnalysisJob.id.desc())
+        .all()
+    )
+
+
+@router.get("/{role_id}/analyze/jobs/{job_id}", response_model=AnalysisJobOut)
+def get_analysis_job(role_id: int, job_id: int, db: Session = Depends(get_db)):
+    """Return a single research run — poll until status is complete or failed."""
+    job = db.get(AnalysisJob, job_id)
+    if not job or job.role_id != role_id:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Analysis job {job_id} not found for role {role_id}",
+        )
+    return job
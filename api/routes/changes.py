@@ -0,0 +1,155 @@
+"""
+routes/changes.py — Change feed for roles and steps.
+
+Clients load roles once, then follow the change log (api/changes.py)
+instead of re-polling GET /roles: each response carries only the writes
+since the cursor they hold, and waits server-side for the next one.
+
+Endpoints
+─────────
+GET /changes?since=&wait=   → entries after the cursor (long-poll up to `wait` s)
+GET /changes/stream?since=  → the same entries as server-sent events, live
+"""
+
+import asyncio
+import json
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from api import changes
+from api.database import SessionLocal, get_db
+from api.schemas import ChangeOut, ChangePage
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+_PAGE_DEFAULT = 100
+_PAGE_MAX     = 1000
+_WAIT_MAX     = 60     # seconds a long-poll may hold the request
+_KEEPALIVE    = 15     # seconds between SSE comments on an idle stream
+_POLL         = changes.CHANGES_POLL_INTERVAL_MS / 1000
+
+
+def _read(db: Session, since: int, limit: int) -> tuple[list[ChangeOut], bool]:
+    """One page after `since`; closes the session so each read sees fresh commits."""
+    try:
+        rows, more = changes.read_since(db, since, limit)
+        return [ChangeOut.model_validate(row) for row in rows], more
+    finally:
+        db.close()
+
+
+def _head(db: Session) -> int:
+    try:
+        return changes.head(db)
+    finally:
+        db.close()
+
+
+def prune_changes() -> None:
+    """Drop change-log entries past CHANGES_RETENTION_DAYS. Called once from the app lifespan."""
+    db = SessionLocal()
+    try:
+        changes.prune(db)
+    finally:
+        db.close()
+
+
+@router.get("", response_model=ChangePage)
+async def list_changes(
+    since: Optional[int] = Query(None, ge=0),
+    limit: int           = Query(_PAGE_DEFAULT, ge=1, le=_PAGE_MAX),
+    wait:  float         = Query(0, ge=0, le=_WAIT_MAX),
+    db:    Session       = Depends(get_db),
+):
+    """
+    Role and step writes after `since`, oldest first.
+
+    - no `since` — returns no entries, just the current cursor; call this
+      before loading roles, then follow the feed from it
+    - `wait` — seconds to hold the request open when nothing is new yet
+      (long-poll); it returns as soon as a change is committed
+    - `more` — true when a full page came back and more are waiting
+
+    410 means the entries after `since` were pruned (older than
+    CHANGES_RETENTION_DAYS): reload roles and start again without `since`.
+    """
+    if since is None:
+        return ChangePage(changes=[], cursor=await run_in_threadpool(_head, db), more=False)
+
+    loop     = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    while True:
+        seen = changes.version()
+        try:
+            entries, more = await run_in_threadpool(_read, db, since, limit)
+        except LookupError as exc:
+            raise HTTPException(status_code=410, detail=str(exc))
+        remaining = deadline - loop.time()
+        if entries or remaining <= 0:
+            break
+        # Woken at once by commits in this process; other processes' writes
+        # are picked up by the next read
+        await changes.wait_for_change(seen, min(remaining, _POLL))
+
+    cursor = entries[-1].id if entries else since
+    return ChangePage(changes=entries, cursor=cursor, more=more)
+
+
+def _sse(event: str, data: dict, event_id: Optional[int] = None) -> str:
+    """Format one server-sent event; the id lets EventSource resume via Last-Event-ID."""
+    prefix = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{prefix}event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.get("/stream")
+async def stream_changes(
+    request:       Request,
+    since:         Optional[int] = Query(None, ge=0),
+    last_event_id: Optional[str] = Header(None),
+    db:            Session       = Depends(get_db),
+):
+    """
+    Follow the change log as server-sent events.
+
+    Starts after `since`, else after the Last-Event-ID an EventSource sends
+    on reconnect, else at the current head. Each entry is a `change` event
+    whose SSE id is the entry id. A `reset` event (then end of stream)
+    means the cursor was pruned: reload and reconnect without `since`.
+    Idle streams get a comment every 15s to keep proxies from closing them.
+    """
+    if since is None and last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    if since is None:
+        since = await run_in_threadpool(_head, db)
+
+    async def events() -> AsyncIterator[str]:
+        cursor = since
+        loop   = asyncio.get_running_loop()
+        idle   = loop.time()
+        yield _sse("cursor", {"cursor": cursor})
+        while not await request.is_disconnected():
+            seen = changes.version()
+            try:
+                entries, more = await run_in_threadpool(_read, db, cursor, _PAGE_MAX)
+            except LookupError as exc:
+                yield _sse("reset", {"detail": str(exc)})
+                return
+            for entry in entries:
+                yield _sse("change", entry.model_dump(mode="json"), entry.id)
+                cursor = entry.id
+            if entries:
+                idle = loop.time()
+                if more:
+                    continue
+            elif loop.time() - idle >= _KEEPALIVE:
+                yield ": keepalive\n\n"
+                idle = loop.time()
+            await changes.wait_for_change(seen, _POLL)
+
+    return StreamingResponse(
+        events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"},
+    )
@@ -5,19 +5,55 @@ Wraps workflow/master/generate_cv.py without rewriting its logic.
 Accepts CV text in the standard [SECTION]-marker format, renders a PDF via
 WeasyPrint, and streams it back as a file download.
 
-Endpoint
-────────
-POST /cv/generate   → multipart or JSON body → PDF file download
+Rendering goes through a shared PDFRenderer (api/pdf_render.py) that keeps
+the template and its fonts warm between requests. By default renders run on
+a pre-forked process pool (api/pdf_pool.py) so they spread across cores;
+CV_RENDER_WORKERS=0 renders in-process instead.
+
+Rendered PDFs are cached on disk by content hash (api/pdf_cache.py) and
+served with a strong ETag, so an unchanged CV costs no render at all and a
+client that already has it gets 304 Not Modified.
+
+A cache hit is streamed from the cached file without being read into
+memory; a fresh render is streamed from the bytes just rendered. No temp
+files are written, so nothing is left on disk when a client disconnects.
+
+The batch endpoint renders many CVs in parallel and streams them back as a
+ZIP built incrementally — each PDF is written to the archive (and flushed to
+the client) as soon as it finishes, so memory stays bounded by the number of
+renders in flight rather than the size of the batch.
+
+The preview endpoint is for the edit loop: it caches the HTML generated for
+each [SECTION] block (api/cv_preview.py), rebuilds only the blocks that
+changed, and returns styled HTML — or a PNG of the first page — without a
+full PDF render.
+
+Endpoints
+─────────
+POST /cv/generate         → multipart or JSON body → PDF file download
+POST /cv/generate:batch   → JSON list of CV payloads → streamed ZIP of PDFs
+POST /cv/preview          → CV text → styled HTML or first-page PNG
+GET  /cv/cache            → PDF and section cache counters
 """
 
+import hashlib
+import json
+import os
 import sys
-import tempfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Union
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Header, HTTPException, Response
+from fastapi.responses import HTMLResponse, StreamingResponse
 
-from api.schemas import CVGenerateRequest
+from api.cv_preview import SectionCache
+from api.pdf_cache import PDFCache
+from api.pdf_pool import PoolFull, RenderPool
+from api.pdf_render import PDFRenderer
+from api.schemas import CVGenerateRequest, CVPreviewRequest
 
 router = APIRouter(prefix="/cv", tags=["cv"])
 
@@ -35,6 +71,7 @@ if str(_WORKFLOW_ROOT) not in sys.path:
 try:
     from master.generate_cv import parse_cv, generate_body  # type: ignore
     from master.generate_cv import TEMPLATE_PATH             # type: ignore
+    from master import generate_cv as _generate_cv_module    # type: ignore
 except ImportError as exc:
     raise RuntimeError(
         "Could not import workflow/master/generate_cv.py. "
@@ -42,22 +79,375 @@ except ImportError as exc:
     ) from exc
 
 
+# ─── RENDERER ─────────────────────────────────────────────────────────────────
+
+# Process pool sizing — workers rendering at once, renders allowed to wait,
+# and the per-render timeout. 0 workers renders in-process on the threadpool.
+_RENDER_WORKERS     = int(os.environ.get("CV_RENDER_WORKERS", str(os.cpu_count() or 1)))
+_RENDER_QUEUE_DEPTH = int(os.environ.get("CV_RENDER_QUEUE_DEPTH", "16"))
+_RENDER_TIMEOUT     = float(os.environ.get("CV_RENDER_TIMEOUT", "30"))
+_RETRY_AFTER        = 2   # seconds suggested to clients when the pool is full
+
+# In-process renderer — template and CSS are parsed once, reloaded on
+# template mtime change. Used directly only when the pool is disabled.
+_renderer = PDFRenderer(TEMPLATE_PATH)
+
+_pool = (
+    RenderPool(TEMPLATE_PATH, _RENDER_WORKERS, _RENDER_QUEUE_DEPTH, _RENDER_TIMEOUT)
+    if _RENDER_WORKERS > 0 else None
+)
+
+
+def warm_renderer() -> None:
+    """Start and warm the render workers at startup; failures surface per request."""
+    try:
+        if _pool is not None:
+            _pool.start()
+        else:
+            _renderer.warm()
+    except Exception:
+        pass
+
+
+def shutdown_renderer() -> None:
+    """Stop the render worker processes."""
+    if _pool is not None:
+        _pool.shutdown()
+
+
+# ─── PDF CACHE ────────────────────────────────────────────────────────────────
+
+_CACHE_DIR       = Path(os.environ.get("CV_CACHE_DIR", _REPO_ROOT / "api" / "cv_cache"))
+_CACHE_MAX_BYTES = int(float(os.environ.get("CV_CACHE_MAX_MB", "256")) * 1024 * 1024)
+
+_pdf_cache = PDFCache(_CACHE_DIR, _CACHE_MAX_BYTES)
+
+_GENERATE_CV_PATH = Path(_generate_cv_module.__file__)
+
+# (template mtime, generate_cv.py mtime) → digest of both files' bytes
+_fingerprint: tuple[tuple[int, int], str] = ((0, 0), "")
+
+
+def _render_fingerprint() -> str:
+    """Hash of everything besides the CV text that shapes the PDF; re-hashed on mtime change."""
+    global _fingerprint
+    mtimes = (TEMPLATE_PATH.stat().st_mtime_ns, _GENERATE_CV_PATH.stat().st_mtime_ns)
+    if _fingerprint[0] != mtimes:
+        digest = hashlib.sha256()
+        digest.update(TEMPLATE_PATH.read_bytes())
+        digest.update(_GENERATE_CV_PATH.read_bytes())
+        _fingerprint = (mtimes, digest.hexdigest())
+    return _fingerprint[1]
+
+
+def _pdf_cache_key(cv_content: str) -> str:
+    return hashlib.sha256(
+        (_render_fingerprint() + "\0" + cv_content).encode("utf-8")
+    ).hexdigest()
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if the If-None-Match header lists etag (or is *)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _render_pdf(body: str) -> bytes:
+    """Render an HTML body to PDF bytes, mapping pool pressure to HTTP errors."""
+    if _pool is None:
+        try:
+            return _renderer.render(body)
+        except Exception as exc:
+            raise HTTPException(status_code=500, detail=f"PDF render error: {exc}")
+
+    try:
+        return _pool.render(body)
+    except PoolFull:
+        raise HTTPException(
+            status_code=429,
+            detail="CV render queue is full — retry shortly",
+            headers={"Retry-After": str(_RETRY_AFTER)},
+        )
+    except TimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail=f"PDF render timed out after {_RENDER_TIMEOUT:g}s",
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=f"PDF render error: {exc}")
+
+
+# ─── RESPONSE ─────────────────────────────────────────────────────────────────
+
+_STREAM_CHUNK = 64 * 1024
+
+
+def _iter_chunks(data: bytes) -> Iterator[memoryview]:
+    view = memoryview(data)
+    for start in range(0, len(view), _STREAM_CHUNK):
+        yield view[start:start + _STREAM_CHUNK]
+
+
+def _iter_file(handle: BinaryIO) -> Iterator[bytes]:
+    with handle:
+        while chunk := handle.read(_STREAM_CHUNK):
+            yield chunk
+
+
+def _pdf_response(pdf: Union[bytes, BinaryIO], headers: dict[str, str]) -> Response:
+    """Stream a PDF from rendered bytes or from an open PDF cache file."""
+    if isinstance(pdf, bytes):
+        chunks, size = _iter_chunks(pdf), len(pdf)
+    else:
+        chunks, size = _iter_file(pdf), os.fstat(pdf.fileno()).st_size
+    return StreamingResponse(
+        chunks,
+        media_type="application/pdf",
+        headers={**headers, "Content-Length": str(size)},
+    )
+
+
+# ─── RENDER PIPELINE ──────────────────────────────────────────────────────────
+
+def _check_render_ready() -> None:
+    """Raise 500 if the template or WeasyPrint is missing — before any work."""
+    if not TEMPLATE_PATH.exists():
+        raise HTTPException(
+            status_code=500,
+            detail=f"CV template not found at {TEMPLATE_PATH}",
+        )
+
+    try:
+        # Import here to keep the error message clear if WeasyPrint missing
+        import weasyprint  # type: ignore  # noqa: F401
+    except ImportError:
+        raise HTTPException(
+            status_code=500,
+            detail="WeasyPrint is not installed. Run: pip install weasyprint",
+        )
+
+
+def _get_or_render(cache_key: str, cv_content: str, wait_for_slot: bool = False) -> tuple[bytes, str]:
+    """
+    Return (pdf, "HIT" | "MISS") — from the PDF cache, or parsed and rendered.
+
+    With wait_for_slot, a full render pool is retried until CV_RENDER_TIMEOUT
+    instead of failing fast with 429 (used by the batch endpoint, which has
+    already committed to a 200 response).
+    """
+    pdf = _pdf_cache.get(cache_key)
+    if pdf is not None:
+        return pdf, "HIT"
+    return _render_and_store(cache_key, cv_content, wait_for_slot), "MISS"
+
+
+def _render_and_store(cache_key: str, cv_content: str, wait_for_slot: bool = False) -> bytes:
+    """Parse and render cv_content, and store the PDF in the PDF cache under cache_key."""
+    try:
+        sections = parse_cv(cv_content)
+        body     = generate_body(sections)
+    except Exception as exc:
+        raise HTTPException(status_code=422, detail=f"CV parse error: {exc}")
+
+    deadline = time.monotonic() + _RENDER_TIMEOUT
+    while True:
+        try:
+            pdf = _render_pdf(body)
+            break
+        except HTTPException as exc:
+            if not (wait_for_slot and exc.status_code == 429 and time.monotonic() < deadline):
+                raise
+            time.sleep(0.05)
+
+    _pdf_cache.put(cache_key, pdf)
+    return pdf
+
+
+def _safe_filename(name: Optional[str]) -> str:
+    """Sanitise a filename for Content-Disposition / ZIP entries."""
+    return (name or "CV.pdf").replace('"', "").replace("/", "_")
+
+
 # ─── ENDPOINT ─────────────────────────────────────────────────────────────────
 
 @router.post("/generate")
-def generate_cv(payload: CVGenerateRequest):
+def generate_cv(
+    payload: CVGenerateRequest,
+    if_none_match: Optional[str] = Header(None),
+):
     """
     Generate a CV PDF from raw CV content (section-marker format).
 
     - Parses content with `parse_cv`
     - Assembles HTML body with `generate_body`
-    - Renders PDF via WeasyPrint using the master HTML template
-    - Returns the PDF as a file download
+    - Renders PDF on a warm render worker using the master HTML template
+    - Streams the PDF back as a file download
+
+    Returns 429 with Retry-After when every render worker is busy and the
+    queue is full, and 504 if the render exceeds CV_RENDER_TIMEOUT.
+
+    The ETag is the cache key, so it is known before rendering: a matching
+    If-None-Match returns 304 immediately. Otherwise a cached PDF is served
+    without re-rendering. X-Cache reports HIT / MISS.
 
-    The temp file is created with delete=False so FileResponse can stream it;
-    cleanup is left to the OS (temp dir is purged on reboot).
+    A cached PDF streams straight from its cache file; a fresh render
+    streams from memory. Nothing is written to a temp file.
     """
     # Validate template exists before doing any work
+    _check_render_ready()
+
+    cache_key = _pdf_cache_key(payload.cv_content)
+    etag      = f'"{cache_key}"'
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    pdf = _pdf_cache.open(cache_key)
+    cache_status = "HIT"
+    if pdf is None:
+        pdf, cache_status = _render_and_store(cache_key, payload.cv_content), "MISS"
+
+    # Sanitise filename for Content-Disposition header
+    filename = _safe_filename(payload.output_filename)
+
+    return _pdf_response(pdf, {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "ETag":                etag,
+        "Cache-Control":       "no-cache",   # store, but revalidate via ETag
+        "X-Cache":             cache_status,
+    })
+
+
+# ─── BATCH ────────────────────────────────────────────────────────────────────
+
+_BATCH_MAX_CVS = 500
+
+
+class _ZipSink:
+    """
+    Write-only, non-seekable file object that zipfile writes into.
+
+    zipfile falls back to data descriptors when it can't seek, so each entry
+    can be drained and sent as soon as it is written.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def _unique_names(payloads: List[CVGenerateRequest]) -> list[str]:
+    """Sanitised archive names, suffixed (-2, -3…) where they collide."""
+    seen: dict[str, int] = {}
+    names = []
+    for payload in payloads:
+        name = _safe_filename(payload.output_filename)
+        count = seen.get(name, 0) + 1
+        seen[name] = count
+        if count > 1:
+            stem, dot, ext = name.rpartition(".")
+            name = f"{stem}-{count}.{ext}" if dot else f"{name}-{count}"
+        names.append(name)
+    return names
+
+
+@router.post("/generate:batch")
+def generate_cv_batch(payloads: List[CVGenerateRequest]):
+    """
+    Generate many CV PDFs in parallel and stream them back as a ZIP archive.
+
+    Entries are added in completion order. Each is parsed with `parse_cv` /
+    `generate_body` and rendered on the render pool (served from the PDF
+    cache when unchanged). At most one render per pool worker is in flight
+    at a time, so memory use doesn't grow with batch size.
+
+    Failures don't abort the archive: the final entry, manifest.json, lists
+    every input's index, filename, status and error detail.
+    """
+    if not payloads:
+        raise HTTPException(status_code=422, detail="Batch must contain at least one CV")
+    if len(payloads) > _BATCH_MAX_CVS:
+        raise HTTPException(status_code=422, detail=f"At most {_BATCH_MAX_CVS} CVs per batch")
+
+    _check_render_ready()
+
+    names   = _unique_names(payloads)
+    window  = max(_RENDER_WORKERS, 1)
+
+    def render_one(index: int) -> tuple[int, Optional[bytes], dict]:
+        entry = {"index": index, "filename": names[index]}
+        try:
+            cv_content = payloads[index].cv_content
+            pdf, cache_status = _get_or_render(
+                _pdf_cache_key(cv_content), cv_content, wait_for_slot=True,
+            )
+        except HTTPException as exc:
+            return index, None, {**entry, "status": "error", "detail": exc.detail}
+        return index, pdf, {**entry, "status": "ok", "cache": cache_status}
+
+    def stream() -> Iterator[bytes]:
+        sink     = _ZipSink()
+        manifest = [None] * len(payloads)
+        pending  = iter(range(len(payloads)))
+
+        with ThreadPoolExecutor(max_workers=window, thread_name_prefix="cv-batch") as executor, \
+             zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as archive:
+            # Sliding window: keep `window` renders in flight, refill as each lands
+            in_flight = {executor.submit(render_one, i) for _, i in zip(range(window), pending)}
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, pdf, entry = future.result()
+                    manifest[index] = entry
+                    if pdf is not None:
+                        archive.writestr(names[index], pdf)   # PDFs are already compressed
+                        yield sink.drain()
+                    next_index = next(pending, None)
+                    if next_index is not None:
+                        in_flight.add(executor.submit(render_one, next_index))
+
+            archive.writestr("manifest.json", json.dumps(manifest, indent=2))
+
+        yield sink.drain()   # manifest + central directory
+
+    return StreamingResponse(
+        stream(),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="CVs.zip"'},
+    )
+
+
+# ─── PREVIEW ──────────────────────────────────────────────────────────────────
+
+_PREVIEW_CACHE_ENTRIES = int(os.environ.get("CV_PREVIEW_CACHE_ENTRIES", "2000"))
+
+_section_cache = SectionCache(_PREVIEW_CACHE_ENTRIES)
+
+
+@router.post("/preview")
+def preview_cv(payload: CVPreviewRequest):
+    """
+    Fast edit-loop preview of a CV — styled HTML, or a PNG of page one.
+
+    Each [SECTION] block's generated HTML is cached by content hash, so only
+    the blocks edited since the last preview are re-parsed and regenerated.
+    X-Sections-Rebuilt / X-Sections-Reused report how many were which.
+
+    HTML previews need no layout at all. PNG previews lay out the document
+    in-process and rasterise the first page only; they need pypdfium2
+    (501 otherwise). Use POST /cv/generate for the final PDF.
+    """
     if not TEMPLATE_PATH.exists():
         raise HTTPException(
             status_code=500,
@@ -65,36 +455,39 @@ def generate_cv(payload: CVGenerateRequest):
         )
 
     try:
-        # Lazy import here to keep the error message clear if WeasyPrint missing
-        from weasyprint import HTML  # type: ignore
-    except ImportError:
-        raise HTTPException(
-            status_code=500,
-            detail="WeasyPrint is not installed. Run: pip install weasyprint",
+        body, rebuilt, reused = _section_cache.build_body(
+            payload.cv_content, _render_fingerprint(), parse_cv, generate_body,
         )
-
-    try:
-        sections = parse_cv(payload.cv_content)
-        body     = generate_body(sections)
-        template = TEMPLATE_PATH.read_text(encoding="utf-8")
-        html     = template.replace("{{BODY}}", body)
     except Exception as exc:
         raise HTTPException(status_code=422, detail=f"CV parse error: {exc}")
 
-    # Write PDF to a named temp file
+    headers = {
+        "X-Sections-Rebuilt": str(rebuilt),
+        "X-Sections-Reused":  str(reused),
+        "Cache-Control":      "no-store",
+    }
+
+    if payload.format == "html":
+        return HTMLResponse(_renderer.render_html(body), headers=headers)
+
+    _check_render_ready()
+    resolution = min(max(payload.resolution, 36), 300)
     try:
-        tmp = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
-        tmp.close()
-        HTML(string=html, base_url=str(TEMPLATE_PATH.parent)).write_pdf(tmp.name)
+        png = _renderer.render_png(body, resolution)
+    except ImportError:
+        raise HTTPException(
+            status_code=501,
+            detail="PNG previews need pypdfium2. Run: pip install pypdfium2",
+        )
     except Exception as exc:
-        raise HTTPException(status_code=500, detail=f"PDF render error: {exc}")
+        raise HTTPException(status_code=500, detail=f"Preview render error: {exc}")
+    return Response(png, media_type="image/png", headers=headers)
 
-    # Sanitise filename for Content-Disposition header
-    filename = (payload.output_filename or "CV.pdf").replace('"', "").replace("/", "_")
 
-    return FileResponse(
-        path=tmp.name,
-        media_type="application/pdf",
-        filename=filename,
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
-    )
+@router.get("/cache")
+def cv_cache_stats():
+    """
+    PDF cache counters — hits, misses, hit rate, evictions, entries, bytes —
+    plus the preview section cache under `sections`.
+    """
+    return {**_pdf_cache.stats(), "sections": _section_cache.stats()}
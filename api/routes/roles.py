@@ -3,30 +3,65 @@ routes/roles.py — CRUD endpoints for roles and their pipeline steps.
 
 Endpoints
 ─────────
-GET    /roles                          → list all roles (slim, no steps)
+GET    /roles                          → page of roles (slim; ?include=steps adds steps), filterable
 POST   /roles                          → create role; auto-seeds 10 pending steps
+POST   /roles:bulk                     → import many roles from JSON or CSV
 GET    /roles/{role_id}                → single role + steps
 PATCH  /roles/{role_id}                → update status / probability / notes / go-no-go
 DELETE /roles/{role_id}                → delete role + cascade steps
 GET    /roles/{role_id}/steps          → list steps for a role
+PATCH  /roles/{role_id}/steps          → update many steps of one role in one transaction
 PATCH  /roles/{role_id}/steps/{step_number} → update step status / output_file
+PATCH  /roles/steps:batch              → update steps across many roles in one transaction
+
+Reads that return steps load them with one `selectinload` query rather than
+lazily per role, so every endpoint runs a fixed number of SQL statements
+(see database.count_queries).
+
+GET /roles pages with a keyset cursor on (created_at, id) rather than an
+offset, so fetching page 1,000 costs the same as page 1. The next page's
+cursor is returned in the X-Next-Cursor header (and a Link rel="next").
+
+The three reads answer conditional requests (api/response_cache.py): a
+role's ETag / Last-Modified come from its updated_at, which step writes
+bump as well, and a list's from the newest change-log entry. A matching
+If-None-Match / If-Modified-Since gets 304 after that one lookup; other
+hits are served from an in-process cache of serialised bodies that every
+write here invalidates. With FAST_JSON_RESPONSES=1 those bodies are
+encoded straight from column rows (api/fast_json.py) instead of through
+the response models — the same JSON for far less work on large pages. The
+encoder is part of every ETag, since the paths can format floats
+differently.
 """
 
+import base64
+from collections import Counter, defaultdict
 from datetime import datetime
-from typing import List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import insert, tuple_, update
+from sqlalchemy.orm import Query as OrmQuery, Session, load_only, selectinload
 
+from api import changes, fast_json, response_cache
+from api.analytics import PipelineDelta
 from api.database import get_db
-from api.models import Role, Step, PIPELINE_STEPS
+from api.models import ChangeLogEntry, Role, Step, PIPELINE_STEPS, normalise_company
+from api.role_import import CHUNK_SIZE, MAX_ROWS, import_roles, parse_csv, parse_json
 from api.schemas import (
-    RoleCreate, RoleUpdate, RoleOut, RoleOutSlim,
-    StepOut, StepUpdate,
+    RoleCreate, RoleImportResult, RoleUpdate, RoleOut, RoleOutSlim,
+    StepOut, StepUpdate, StepBulkItem, RoleStepBulkItem,
 )
 
 router = APIRouter(prefix="/roles", tags=["roles"])
 
+# Collection-level actions ("/roles:bulk") can't sit under the "/roles" prefix,
+# which only allows "/..." suffixes.
+bulk_router = APIRouter(tags=["roles"])
+
 
 # ─── HELPER ───────────────────────────────────────────────────────────────────
 
@@ -38,12 +73,397 @@ def _get_role_or_404(role_id: int, db: Session) -> Role:
     return role
 
 
+def _load_role_with_steps(role_id: int, db: Session) -> Role:
+    """Fetch a Role with its steps in two queries (role + selectin steps), or 404."""
+    role = (
+        db.query(Role)
+        .options(selectinload(Role.steps))
+        .filter(Role.id == role_id)
+        .populate_existing()
+        .first()
+    )
+    if not role:
+        raise HTTPException(status_code=404, detail=f"Role {role_id} not found")
+    return role
+
+
+def _role_version(role_id: int, db: Session) -> datetime:
+    """The role's updated_at — its cache validator — or 404."""
+    updated_at = db.query(Role.updated_at).filter(Role.id == role_id).scalar()
+    if updated_at is None:
+        raise HTTPException(status_code=404, detail=f"Role {role_id} not found")
+    return updated_at
+
+
+def _list_version(db: Session) -> tuple[int, Optional[datetime]]:
+    """Newest change-log entry (id, changed_at) — every write that can alter a page adds one."""
+    row = (
+        db.query(ChangeLogEntry.id, ChangeLogEntry.changed_at)
+        .order_by(ChangeLogEntry.id.desc())
+        .first()
+    )
+    return (row.id, row.changed_at) if row else (0, None)
+
+
+# ─── LISTING ──────────────────────────────────────────────────────────────────
+
+_PAGE_DEFAULT = 100
+_PAGE_MAX     = 1000
+
+# Fields selectable via ?fields= — the slim list schema
+_LIST_FIELDS = tuple(RoleOutSlim.model_fields)
+
+# Relationships that ?include= may eager-load alongside each role
+_INCLUDES = ("steps",)
+
+
+def encode_cursor(created_at: datetime, role_id: int) -> str:
+    """Opaque cursor pointing just past (created_at, id) in list order."""
+    raw = f"{created_at.isoformat()}|{role_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of encode_cursor; raises 400 on anything malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, role_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(role_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[list[str]]:
+    """Split ?fields=a,b into a validated list; None means every slim field."""
+    if not fields:
+        return None
+    selected = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown  = [name for name in selected if name not in _LIST_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(_LIST_FIELDS)}",
+        )
+    return selected
+
+
+def _parse_include(include: Optional[str]) -> set[str]:
+    """Split ?include=steps into a validated set of relationship names."""
+    if not include:
+        return set()
+    selected = {name.strip() for name in include.split(",") if name.strip()}
+    unknown  = sorted(selected - set(_INCLUDES))
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown include: {', '.join(unknown)}. Allowed: {', '.join(_INCLUDES)}",
+        )
+    return selected
+
+
+def _escape_like(text: str) -> str:
+    """Escape LIKE wildcards (and the escape character) so text matches literally."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def role_page_query(
+    db:               Session,
+    *,
+    cursor:           Optional[tuple[datetime, int]] = None,
+    limit:            int = _PAGE_DEFAULT,
+    statuses:         Optional[List[str]] = None,
+    go_no_go:         Optional[str] = None,
+    company:          Optional[str] = None,
+    company_contains: Optional[str] = None,
+    min_probability:  Optional[float] = None,
+    max_probability:  Optional[float] = None,
+    fields:           Optional[List[str]] = None,
+    with_steps:       bool = False,
+    columns:          Optional[List[str]] = None,
+) -> OrmQuery:
+    """
+    The query behind one page of roles: filters, newest-first order and a
+    limit one past the page size (to detect a next page).
+
+    Seeks straight to the cursor position on the (created_at, id) indexes
+    instead of counting past an offset. Only the selected columns (plus the
+    cursor columns) are loaded. with_steps loads every role's steps in one
+    extra IN query. columns selects just those Role columns as plain rows
+    instead of Role objects (the fast JSON path); fields and with_steps
+    don't apply then.
+    """
+    if columns is not None:
+        query = db.query(*(getattr(Role, name) for name in columns))
+    else:
+        query = db.query(Role)
+    if with_steps and columns is None:
+        query = query.options(selectinload(Role.steps))
+
+    if fields is not None and columns is None:
+        columns = {"id", "created_at", *fields}
+        query = query.options(load_only(*(getattr(Role, name) for name in columns)))
+    if statuses:
+        query = query.filter(Role.status.in_(statuses))
+    if go_no_go is not None:
+        query = query.filter(Role.go_no_go == go_no_go)
+    if company:
+        query = query.filter(Role.company_key == normalise_company(company))
+    if company_contains:
+        query = query.filter(Role.company.ilike(f"%{_escape_like(company_contains)}%", escape="\\"))
+    if min_probability is not None:
+        query = query.filter(Role.interview_probability >= min_probability)
+    if max_probability is not None:
+        query = query.filter(Role.interview_probability <= max_probability)
+    if cursor is not None:
+        query = query.filter(tuple_(Role.created_at, Role.id) < tuple_(*cursor))
+
+    # Fetch one extra row to learn whether another page exists
+    return (
+        query
+        .order_by(Role.created_at.desc(), Role.id.desc())
+        .limit(limit + 1)
+    )
+
+
+def query_role_page(
+    db:    Session,
+    *,
+    limit: int = _PAGE_DEFAULT,
+    **filters: Any,
+) -> tuple[list[Any], Optional[tuple[datetime, int]]]:
+    """One page of roles (or column rows), newest first, plus the cursor for the next page."""
+    rows = role_page_query(db, limit=limit, **filters).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, (rows[-1].created_at, rows[-1].id)
+
+
+# ─── BULK STEP UPDATES ────────────────────────────────────────────────────────
+
+_BULK_STEPS_MAX = 2000
+_STEP_FIELDS    = set(StepUpdate.model_fields)   # writable step columns
+
+
+def step_lookup_query(db: Session, keys: List[tuple[int, int]]) -> OrmQuery:
+    """Steps covering every (role_id, step_number) in keys — possibly a few more."""
+    return (
+        db.query(
+            Step.id, Step.role_id, Step.step_number, Step.step_name,
+            Step.status, Step.output_file, Step.completed_at,
+        )
+        .filter(
+            Step.role_id.in_({role_id for role_id, _ in keys}),
+            Step.step_number.in_({step_number for _, step_number in keys}),
+        )
+    )
+
+
+def _record_step_changes(db: Session, updates: List[tuple]) -> None:
+    """
+    Move the pipeline counters along with updated steps.
+
+    updates holds (role_id, step_number, old status, new status, new
+    completed_at stamp or None). Newly stamped roles cost one extra SELECT
+    for their other stamps, which the step-gap counters depend on.
+    """
+    delta   = PipelineDelta()
+    stamped = defaultdict(dict)
+    for role_id, step_number, old_status, new_status, stamp in updates:
+        if old_status != new_status:
+            delta.step(step_number, old_status, -1)
+            delta.step(step_number, new_status)
+        if stamp is not None:
+            stamped[role_id][step_number] = stamp
+
+    if stamped:
+        stamps = defaultdict(dict)
+        for row in db.query(Step.role_id, Step.step_number, Step.completed_at).filter(Step.role_id.in_(stamped)):
+            stamps[row.role_id][row.step_number] = row.completed_at
+        for role_id, new in stamped.items():
+            # Only previously unstamped steps get a stamp
+            delta.restamp({**stamps[role_id], **dict.fromkeys(new)}, {**stamps[role_id], **new})
+
+    delta.apply(db.connection())
+
+
+def _apply_step_updates(db: Session, items: List[RoleStepBulkItem]) -> List[Step]:
+    """
+    Apply many step updates in one transaction and return the updated steps.
+
+    One SELECT resolves every (role_id, step_number) to its current row, one
+    executemany UPDATE writes all changes, and one SELECT reads the results
+    back. completed_at is stamped exactly as in update_step; the pipeline
+    counters and change log move in the same transaction. Nothing is
+    written if any target is missing (404) or listed twice (422).
+    """
+    if not items:
+        return []
+    if len(items) > _BULK_STEPS_MAX:
+        raise HTTPException(status_code=422, detail=f"At most {_BULK_STEPS_MAX} step updates per request")
+
+    keys = [(item.role_id, item.step_number) for item in items]
+    duplicates = sorted(key for key, count in Counter(keys).items() if count > 1)
+    if duplicates:
+        raise HTTPException(
+            status_code=422,
+            detail="Duplicate step updates: " + ", ".join(f"role {r} step {n}" for r, n in duplicates),
+        )
+
+    # role_id IN (…) seeks the (role_id, step_number) index; a row-value IN
+    # would scan it. Pairs not asked for are dropped here.
+    wanted   = set(keys)
+    existing = {
+        (row.role_id, row.step_number): row
+        for row in step_lookup_query(db, keys)
+        if (row.role_id, row.step_number) in wanted
+    }
+    missing = [key for key in keys if key not in existing]
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail="Steps not found: " + ", ".join(f"role {r} step {n}" for r, n in missing),
+        )
+
+    now     = datetime.utcnow()
+    rows    = []
+    changed = []
+    logged  = []
+    for item in items:
+        current = existing[(item.role_id, item.step_number)]
+        values  = {"id": current.id, **item.model_dump(include=_STEP_FIELDS, exclude_none=True)}
+        # Auto-stamp completion time
+        if item.status == "complete" and current.completed_at is None:
+            values["completed_at"] = now
+        if len(values) > 1:
+            rows.append(values)
+            changed.append((item.role_id, item.step_number, current.status,
+                            values.get("status", current.status), values.get("completed_at")))
+            logged.append(changes.step_entry("update", {**current._asdict(), **values}))
+
+    if rows:
+        db.execute(update(Step), rows)   # bulk UPDATE by primary key
+        # Step writes bump the role's updated_at, its cache validator
+        touched = {role_id for role_id, *_ in changed}
+        db.execute(update(Role).where(Role.id.in_(touched)).values(updated_at=now))
+        _record_step_changes(db, changed)
+        changes.record(db, logged)
+    db.commit()
+    if rows:
+        response_cache.cache.invalidate(touched)
+
+    return (
+        db.query(Step)
+        .filter(Step.id.in_([row.id for row in existing.values()]))
+        .order_by(Step.role_id, Step.step_number)
+        .all()
+    )
+
+
+@router.patch("/steps:batch", response_model=List[StepOut])
+def update_steps_across_roles(payload: List[RoleStepBulkItem], db: Session = Depends(get_db)):
+    """
+    Update steps across many roles in one transaction (tracker sync).
+
+    Each item names role_id + step_number and the fields to change. All or
+    nothing: any unknown role/step returns 404 and no change is written.
+    Returns the updated steps ordered by role_id, step_number.
+    """
+    return _apply_step_updates(db, payload)
+
+
 # ─── ROLE ENDPOINTS ───────────────────────────────────────────────────────────
 
+def _page_body(selected: Optional[List[str]], roles: List[Role], with_steps: bool) -> bytes:
+    """Serialise Role objects through the response schemas (the default path)."""
+    if selected is None:
+        content = [RoleOutSlim.model_validate(role).model_dump(mode="json") for role in roles]
+    else:
+        content = jsonable_encoder([{name: getattr(role, name) for name in selected} for role in roles])
+    if with_steps:
+        for item, role in zip(content, roles):
+            item["steps"] = [StepOut.model_validate(step).model_dump(mode="json") for step in role.steps]
+    return JSONResponse(content).body
+
+
+def _fast_page_body(db: Session, names: List[str], rows: List[Any], with_steps: bool) -> bytes:
+    """Same JSON as _page_body, encoded straight from column rows (FAST_JSON_RESPONSES)."""
+    content = fast_json.objects(names, rows)
+    if with_steps:
+        steps = fast_json.steps_by_role(db, [row.id for row in rows])
+        for item, row in zip(content, rows):
+            item["steps"] = steps.get(row.id, [])
+    return fast_json.dumps(content)
+
+
 @router.get("", response_model=List[RoleOutSlim])
-def list_roles(db: Session = Depends(get_db)):
-    """Return all roles, newest first, without step detail."""
-    return db.query(Role).order_by(Role.created_at.desc()).all()
+def list_roles(
+    request:          Request,
+    cursor:           Optional[str]   = None,
+    limit:            int             = Query(_PAGE_DEFAULT, ge=1, le=_PAGE_MAX),
+    status_:          Optional[List[str]] = Query(None, alias="status"),
+    go_no_go:         Optional[str]   = None,
+    company:          Optional[str]   = None,
+    company_contains: Optional[str]   = None,
+    min_probability:  Optional[float] = Query(None, ge=0.0, le=1.0),
+    max_probability:  Optional[float] = Query(None, ge=0.0, le=1.0),
+    fields:           Optional[str]   = None,
+    include:          Optional[str]   = None,
+    db:               Session         = Depends(get_db),
+):
+    """
+    Return a page of roles, newest first, without step detail.
+
+    - `cursor` — value of X-Next-Cursor from the previous page
+    - `limit` — page size (default 100, max 1000)
+    - `status` (repeatable), `go_no_go`, `company` (exact, ignoring case
+      and spacing — indexed), `company_contains` (case-insensitive
+      substring), `min_probability` / `max_probability` — filters
+    - `fields` — comma-separated subset of the slim role fields
+    - `include=steps` — embed each role's steps (one extra query per page)
+
+    X-Next-Cursor (and a Link rel="next" header) is set only when another
+    page exists. Supports If-None-Match / If-Modified-Since (304).
+    """
+    selected = _parse_fields(fields)
+    included = _parse_include(include)
+    decoded  = decode_cursor(cursor) if cursor else None
+    head, changed_at = _list_version(db)
+
+    def render() -> tuple[bytes, dict]:
+        names = selected or list(_LIST_FIELDS)
+        fast  = fast_json.FAST_JSON_RESPONSES
+        rows, next_position = query_role_page(
+            db,
+            cursor=decoded,
+            limit=limit,
+            statuses=status_,
+            go_no_go=go_no_go,
+            company=company,
+            company_contains=company_contains,
+            min_probability=min_probability,
+            max_probability=max_probability,
+            fields=selected,
+            with_steps="steps" in included,
+            # The cursor needs id and created_at even when ?fields= leaves them out
+            columns=[*names, *(name for name in ("id", "created_at") if name not in names)] if fast else None,
+        )
+
+        if fast:
+            body = _fast_page_body(db, names, rows, "steps" in included)
+        else:
+            body = _page_body(selected, rows, "steps" in included)
+
+        headers = {}
+        if next_position is not None:
+            next_cursor = encode_cursor(*next_position)
+            headers["X-Next-Cursor"] = next_cursor
+            headers["Link"] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+        return body, headers
+
+    key  = response_cache.query_key(request)
+    etag = response_cache.version_tag("roles", head, key, fast_json.encoder())
+    return response_cache.cached_json(request, f"list:{key}", etag, changed_at, render)
 
 
 @router.post("", response_model=RoleOut, status_code=status.HTTP_201_CREATED)
@@ -55,60 +475,148 @@ def create_role(payload: RoleCreate, db: Session = Depends(get_db)):
     role = Role(**payload.model_dump())
     db.add(role)
     db.flush()  # assign role.id before seeding steps
+    role_id = role.id
 
-    # Seed one Step row per pipeline entry
-    for step_number, step_name in PIPELINE_STEPS:
-        db.add(Step(
-            role_id=role.id,
-            step_number=step_number,
-            step_name=step_name,
-        ))
+    # Seed one Step row per pipeline entry — a single executemany, not 10 INSERTs
+    db.execute(insert(Step), [
+        {"role_id": role_id, "step_number": step_number, "step_name": step_name}
+        for step_number, step_name in PIPELINE_STEPS
+    ])
+
+    delta = PipelineDelta()
+    delta.role(role.go_no_go, role.status, role.interview_probability)
+    delta.seeded_steps(1)
+    delta.apply(db.connection())
+    changes.record(db, [changes.role_entry("create", role_id, role)])
 
     db.commit()
-    db.refresh(role)
-    return role
+    response_cache.cache.invalidate()
+    return _load_role_with_steps(role_id, db)
+
+
+@bulk_router.post("/roles:bulk", response_model=RoleImportResult)
+async def import_roles_bulk(
+    request:    Request,
+    chunk_size: int     = Query(CHUNK_SIZE, ge=1, le=5000),
+    db:         Session = Depends(get_db),
+):
+    """
+    Import many roles at once, each seeded with the 10 pending pipeline steps.
+
+    Body is a JSON array of RoleCreate objects, or CSV (Content-Type: text/csv)
+    with a header row of RoleCreate field names. Rows are written in chunked
+    transactions with bulk INSERTs; invalid rows are reported in `errors`
+    without aborting the import.
+    """
+    text = (await request.body()).decode("utf-8-sig")
+    try:
+        if request.headers.get("content-type", "").startswith("text/csv"):
+            records = parse_csv(text)
+        else:
+            records = parse_json(text)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=f"Could not parse body: {exc}")
+
+    if len(records) > MAX_ROWS:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_ROWS} roles per import")
+
+    result = await run_in_threadpool(import_roles, db, records, chunk_size)
+    response_cache.cache.invalidate()
+    return result
 
 
 @router.get("/{role_id}", response_model=RoleOut)
-def get_role(role_id: int, db: Session = Depends(get_db)):
-    """Return a single role with its full step list."""
-    return _get_role_or_404(role_id, db)
+def get_role(role_id: int, request: Request, db: Session = Depends(get_db)):
+    """Return a single role with its full step list. Supports If-None-Match / If-Modified-Since (304)."""
+    updated_at = _role_version(role_id, db)
+
+    def render() -> tuple[bytes, dict]:
+        if not fast_json.FAST_JSON_RESPONSES:
+            return RoleOut.model_validate(_load_role_with_steps(role_id, db)).model_dump_json().encode(), {}
+        content = fast_json.role(db, role_id)
+        if content is None:
+            raise HTTPException(status_code=404, detail=f"Role {role_id} not found")
+        return fast_json.dumps(content), {}
+
+    etag = response_cache.version_tag("role", role_id, updated_at, fast_json.encoder())
+    return response_cache.cached_json(request, f"role:{role_id}", etag, updated_at, render)
 
 
 @router.patch("/{role_id}", response_model=RoleOut)
 def update_role(role_id: int, payload: RoleUpdate, db: Session = Depends(get_db)):
     """Partial update — only provided fields are written."""
-    role = _get_role_or_404(role_id, db)
+    role   = _get_role_or_404(role_id, db)
+    before = (role.go_no_go, role.status, role.interview_probability)
 
     for field, value in payload.model_dump(exclude_none=True).items():
         setattr(role, field, value)
 
+    after = (role.go_no_go, role.status, role.interview_probability)
+    if after != before:
+        delta = PipelineDelta()
+        delta.role(*before, sign=-1)
+        delta.role(*after)
+        delta.apply(db.connection())
+
     role.updated_at = datetime.utcnow()
+    changes.record(db, [changes.role_entry("update", role_id, role)])
     db.commit()
-    db.refresh(role)
-    return role
+    response_cache.cache.invalidate([role_id])
+    return _load_role_with_steps(role_id, db)
 
 
 @router.delete("/{role_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_role(role_id: int, db: Session = Depends(get_db)):
     """Delete a role and cascade-delete its steps."""
     role = _get_role_or_404(role_id, db)
+
+    delta = PipelineDelta()
+    delta.role(role.go_no_go, role.status, role.interview_probability, sign=-1)
+    for step in role.steps:   # loaded for the cascade anyway
+        delta.step(step.step_number, step.status, sign=-1)
+    delta.gaps({step.step_number: step.completed_at for step in role.steps}, sign=-1)
+    delta.apply(db.connection())
+    changes.record(db, [changes.role_entry("delete", role_id)])
+
     db.delete(role)
     db.commit()
+    response_cache.cache.invalidate([role_id])
 
 
 # ─── STEP ENDPOINTS ───────────────────────────────────────────────────────────
 
 @router.get("/{role_id}/steps", response_model=List[StepOut])
-def list_steps(role_id: int, db: Session = Depends(get_db)):
-    """Return all steps for a role, ordered by step_number."""
-    _get_role_or_404(role_id, db)  # 404 if role missing
-    return (
-        db.query(Step)
-        .filter(Step.role_id == role_id)
-        .order_by(Step.step_number)
-        .all()
-    )
+def list_steps(role_id: int, request: Request, db: Session = Depends(get_db)):
+    """Return all steps for a role, ordered by step_number. Supports If-None-Match / If-Modified-Since (304)."""
+    updated_at = _role_version(role_id, db)  # 404 if role missing
+
+    def render() -> tuple[bytes, dict]:
+        if fast_json.FAST_JSON_RESPONSES:
+            return fast_json.dumps(fast_json.steps_by_role(db, [role_id]).get(role_id, [])), {}
+        steps = (
+            db.query(Step)
+            .filter(Step.role_id == role_id)
+            .order_by(Step.step_number)
+            .all()
+        )
+        return JSONResponse([StepOut.model_validate(step).model_dump(mode="json") for step in steps]).body, {}
+
+    etag = response_cache.version_tag("steps", role_id, updated_at, fast_json.encoder())
+    return response_cache.cached_json(request, f"steps:{role_id}", etag, updated_at, render)
+
+
+@router.patch("/{role_id}/steps", response_model=List[StepOut])
+def update_steps(role_id: int, payload: List[StepBulkItem], db: Session = Depends(get_db)):
+    """
+    Update several steps of one role in one transaction.
+
+    Same fields and completed_at stamping as the single-step endpoint;
+    all or nothing if any step_number doesn't exist.
+    """
+    _get_role_or_404(role_id, db)
+    return _apply_step_updates(db, [
+        RoleStepBulkItem(role_id=role_id, **item.model_dump()) for item in payload
+    ])
 
 
 @router.patch("/{role_id}/steps/{step_number}", response_model=StepOut)
@@ -122,7 +630,7 @@ def update_step(
     Update a step's status or output_file.
     Automatically sets completed_at when status is set to 'complete'.
     """
-    _get_role_or_404(role_id, db)
+    role = _get_role_or_404(role_id, db)
 
     step = (
         db.query(Step)
@@ -135,13 +643,20 @@ def update_step(
             detail=f"Step {step_number} not found for role {role_id}",
         )
 
+    old_status = step.status
     for field, value in payload.model_dump(exclude_none=True).items():
         setattr(step, field, value)
 
     # Auto-stamp completion time
+    now   = datetime.utcnow()
+    stamp = None
     if payload.status == "complete" and step.completed_at is None:
-        step.completed_at = datetime.utcnow()
+        stamp = step.completed_at = now
+    role.updated_at = now   # step writes bump the role's cache validator
 
+    _record_step_changes(db, [(role_id, step_number, old_status, step.status, stamp)])
+    changes.record(db, [changes.step_entry("update", step)])
     db.commit()
+    response_cache.cache.invalidate([role_id])
     db.refresh(step)
     return step
@@ -0,0 +1,52 @@
+"""
+routes/search.py — Full-text search across roles, notes and positioning briefs.
+
+Backed by the SQLite FTS5 index in api/search.py, which triggers keep in
+step with roles and completed analysis jobs.
+
+Endpoints
+─────────
+GET /search?q= → ranked, highlighted page of matching roles
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from api.database import get_db
+from api.schemas import SearchPage
+from api.search import SearchUnavailable, match_expression, search
+
+router = APIRouter(tags=["search"])
+
+_PAGE_DEFAULT = 20
+_PAGE_MAX     = 100
+
+
+@router.get("/search", response_model=SearchPage)
+def search_roles(
+    q:      str     = Query(..., min_length=1, max_length=500),
+    limit:  int     = Query(_PAGE_DEFAULT, ge=1, le=_PAGE_MAX),
+    offset: int     = Query(0, ge=0),
+    db:     Session = Depends(get_db),
+):
+    """
+    Search company, role title, notes and the latest brief of every role.
+
+    - `q` — words and "quoted phrases", all of which must match; `fin*`
+      matches by prefix
+    - `limit` (default 20, max 100) / `offset` — paging; pass `next_offset`
+      back as `offset` for the next page
+
+    Results are ranked by BM25 with company and title matches weighted
+    above notes and brief text.
+    """
+    if not match_expression(q):
+        raise HTTPException(status_code=422, detail="Query has no searchable terms")
+    try:
+        hits, more = search(db.connection(), q, limit=limit, offset=offset)
+    except SearchUnavailable as exc:
+        raise HTTPException(status_code=501, detail=str(exc))
+    except OperationalError as exc:
+        raise HTTPException(status_code=422, detail=f"Could not run search: {exc.orig}")
+    return SearchPage(query=q, results=hits, next_offset=offset + limit if more else None)
@@ -4,9 +4,10 @@ schemas.py — Pydantic v2 request/response models for the hiring workflow API.
 Separate Create / Update / Out shapes per resource to keep each endpoint clean.
 """
 
+import json
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel, ConfigDict
+from typing import Any, Dict, Literal, Optional, List
+from pydantic import BaseModel, ConfigDict, field_validator
 
 
 # ─── STEP ─────────────────────────────────────────────────────────────────────
@@ -30,6 +31,16 @@ class StepUpdate(BaseModel):
     output_file: Optional[str] = None
 
 
+class StepBulkItem(StepUpdate):
+    """One entry of PATCH /roles/{id}/steps — a StepUpdate addressed by step_number."""
+    step_number: int
+
+
+class RoleStepBulkItem(StepBulkItem):
+    """One entry of PATCH /roles/steps:batch — addressed by role_id + step_number."""
+    role_id: int
+
+
 # ─── ROLE ─────────────────────────────────────────────────────────────────────
 
 class RoleCreate(BaseModel):
@@ -50,6 +61,20 @@ class RoleUpdate(BaseModel):
     notes:                 Optional[str]  = None
 
 
+class RoleImportError(BaseModel):
+    """A rejected row from POST /roles:bulk — index is 0-based, CSV header excluded."""
+    index:  int
+    errors: List[str]
+
+
+class RoleImportResult(BaseModel):
+    """Outcome of a bulk role import; role_ids follow input order of created rows."""
+    created:  int
+    failed:   int
+    role_ids: List[int]
+    errors:   List[RoleImportError]
+
+
 class RoleOut(BaseModel):
     """Full role record returned by the API, including its steps."""
     model_config = ConfigDict(from_attributes=True)
@@ -93,6 +118,18 @@ class CVGenerateRequest(BaseModel):
     output_filename: Optional[str] = "CV.pdf"
 
 
+class CVPreviewRequest(BaseModel):
+    """
+    Payload for POST /cv/preview.
+
+    Same CV text as CVGenerateRequest. `format` picks a styled HTML page
+    (default) or a PNG of the first page at `resolution` DPI.
+    """
+    cv_content: str
+    format:     Literal["html", "png"] = "html"
+    resolution: int                    = 96   # PNG only; clamped to 36–300
+
+
 class CVGenerateResponse(BaseModel):
     """
     Returned when generation fails before writing a file.
@@ -101,6 +138,109 @@ class CVGenerateResponse(BaseModel):
     detail: str
 
 
+# ─── ANALYTICS ────────────────────────────────────────────────────────────────
+
+class FunnelStep(BaseModel):
+    """Step count per status for one pipeline step."""
+    step_number: int
+    step_name:   str
+    statuses:    Dict[str, int]
+
+
+class OutcomeSummary(BaseModel):
+    """Roles by outcome; interview_rate = interviewed / (interviewed + rejected)."""
+    roles:          int
+    interviewed:    int
+    rejected:       int
+    open:           int
+    interview_rate: Optional[float]
+
+
+class StepDuration(BaseModel):
+    """Average gap between the previous step's completed_at and this one's."""
+    step_number: int
+    step_name:   str
+    samples:     int
+    avg_hours:   float
+
+
+class CalibrationBucket(BaseModel):
+    """Mean predicted interview_probability vs observed interview rate among decided roles."""
+    bucket:    str
+    decided:   int
+    predicted: Optional[float]
+    observed:  Optional[float]
+
+
+class PipelineAnalytics(BaseModel):
+    """Response of GET /analytics/pipeline."""
+    total_roles:            int
+    overall:                OutcomeSummary
+    funnel:                 List[FunnelStep]
+    conversion_by_go_no_go: Dict[str, OutcomeSummary]
+    step_durations:         List[StepDuration]
+    calibration:            List[CalibrationBucket]
+
+
+# ─── CHANGES ──────────────────────────────────────────────────────────────────
+
+class ChangeOut(BaseModel):
+    """
+    One entry of GET /changes.
+
+    `data` is the role (RoleOutSlim fields) or step (StepOut) after the
+    change, or null for a delete. A role `create` implies its 10 seeded
+    pending steps, which get no entries of their own.
+    """
+    id:         int
+    entity:     str   # "role" | "step"
+    entity_id:  int
+    role_id:    int
+    op:         str   # "create" | "update" | "delete"
+    changed_at: datetime
+    data:       Optional[Dict[str, Any]] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @field_validator("data", mode="before")
+    @classmethod
+    def _load_data(cls, value):
+        # Stored as a JSON string in change_log.data
+        if isinstance(value, str):
+            return json.loads(value)
+        return value
+
+
+class ChangePage(BaseModel):
+    """Response of GET /changes — pass `cursor` back as `since`."""
+    changes: List[ChangeOut]
+    cursor:  int
+    more:    bool   # another page is already waiting
+
+
+# ─── SEARCH ───────────────────────────────────────────────────────────────────
+
+class SearchHit(BaseModel):
+    """One role matching GET /search; highlights are escaped HTML with matches in <mark>…</mark>."""
+    role_id:               int
+    company:               str
+    role_title:            str
+    status:                str
+    go_no_go:              Optional[str]
+    interview_probability: Optional[float]
+    score:                 float   # -bm25 — higher is a better match
+    company_highlight:     str
+    role_title_highlight:  str
+    snippet:               str     # excerpt of the best-matching field
+
+
+class SearchPage(BaseModel):
+    """Response of GET /search — next_offset is null on the last page."""
+    query:       str
+    results:     List[SearchHit]
+    next_offset: Optional[int]
+
+
 # ─── ANALYZE ──────────────────────────────────────────────────────────────────
 
 class CompanyAnalysisResponse(BaseModel):
@@ -136,3 +276,48 @@ class CompanyAnalysisResponse(BaseModel):
 
     # 0–100 estimated interview probability given current positioning
     interview_probability: int
+
+
+class AnalysisJobOut(BaseModel):
+    """
+    Background analysis run returned by POST /roles/{id}/analyze and the job
+    polling endpoints. `result` is populated once status is "complete";
+    `error` once status is "failed".
+    """
+    model_config = ConfigDict(from_attributes=True)
+
+    id:          int
+    role_id:     int
+    status:      str
+    result:      Optional[CompanyAnalysisResponse] = None
+    error:       Optional[str] = None
+    # Token usage across the run — cache_* show prompt-cache reuse
+    input_tokens:       Optional[int] = None
+    output_tokens:      Optional[int] = None
+    cache_read_tokens:  Optional[int] = None
+    cache_write_tokens: Optional[int] = None
+    iteration_input_tokens: Optional[List[int]] = None
+    created_at:  datetime
+    started_at:  Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @field_validator("result", mode="before")
+    @classmethod
+    def _load_result(cls, value):
+        # Stored as a JSON string in analysis_jobs.result
+        if isinstance(value, str):
+            return json.loads(value)
+        return value
+
+
+class AnalyzeBatchRequest(BaseModel):
+    """
+    Payload for POST /roles/analyze:batch.
+
+    Budgets apply per role. Omitted values fall back to the server defaults.
+    """
+    role_ids:       List[int]
+    concurrency:    Optional[int] = None   # simultaneous research loops
+    max_iterations: Optional[int] = None   # per-role loop cap (≤ server max)
+    token_budget:   Optional[int] = None   # per-role input + output tokens
+    refresh:        bool          = False  # bypass the brief cache
@@ -0,0 +1,205 @@
+"""
+search.py — Full-text search over roles and their positioning briefs.
+
+An SQLite FTS5 table, `role_search`, holds one document per role (rowid =
+roles.id) with four columns: company, role_title, notes, and brief — the
+text fields of the role's latest completed CompanyAnalysisResponse, which
+is already persisted as JSON on analysis_jobs.result. Triggers on roles and
+analysis_jobs keep it in sync inside the writing transaction, so no code
+path has to remember to reindex.
+
+The table and triggers are created with the schema (an after_create hook on
+Base.metadata) and for older databases by migration 5. FTS5 is SQLite-only;
+on other backends nothing is created and search() raises SearchUnavailable.
+
+Highlights and snippets are HTML: the indexed text is escaped and only the
+<mark> tags around matches are markup.
+"""
+
+import html
+import re
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+
+from api.database import Base
+from api.schemas import SearchHit
+
+HIGHLIGHT_OPEN  = "<mark>"
+HIGHLIGHT_CLOSE = "</mark>"
+SNIPPET_TOKENS  = 16
+# FTS5 wraps matches in these private-use characters; _markup() escapes the
+# text around them and only then turns them into HIGHLIGHT_OPEN / _CLOSE
+_OPEN_SENTINEL  = "\ue000"
+_CLOSE_SENTINEL = "\ue001"
+# bm25 column weights: company, role_title, notes, brief
+_WEIGHTS = (5.0, 3.0, 1.0, 1.0)
+
+# Brief fields indexed — list fields are flattened to their items
+_BRIEF_FIELDS = (
+    "company_briefing", "founder_profile", "positioning_angle",
+    "recent_signals", "language_to_mirror", "proof_points",
+)
+
+
+class SearchUnavailable(Exception):
+    """The database backend has no FTS5 index (not SQLite)."""
+
+
+def _brief_text(result: str) -> str:
+    """SQL expression: searchable text of a CompanyAnalysisResponse JSON column."""
+    fields = " || ' ' || ".join(
+        f"coalesce((SELECT group_concat(value, ' ') FROM json_each({result}, '$.{name}')), '')"
+        for name in _BRIEF_FIELDS
+    )
+    return f"CASE WHEN json_valid({result}) THEN {fields} ELSE {result} END"
+
+
+_BRIEF_UPDATE = f"""
+    UPDATE role_search SET brief = {_brief_text("new.result")} WHERE rowid = new.role_id;
+"""
+
+_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS role_search USING fts5(
+        company, role_title, notes, brief,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS role_search_insert AFTER INSERT ON roles BEGIN
+        INSERT INTO role_search (rowid, company, role_title, notes, brief)
+        VALUES (new.id, new.company, new.role_title, coalesce(new.notes, ''), '');
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS role_search_update AFTER UPDATE OF company, role_title, notes ON roles BEGIN
+        UPDATE role_search
+        SET company = new.company, role_title = new.role_title, notes = coalesce(new.notes, '')
+        WHERE rowid = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS role_search_delete AFTER DELETE ON roles BEGIN
+        DELETE FROM role_search WHERE rowid = old.id;
+    END
+    """,
+    # Cache hits insert an already-complete job; pooled runs complete by update
+    f"""
+    CREATE TRIGGER IF NOT EXISTS role_search_brief_insert AFTER INSERT ON analysis_jobs
+    WHEN new.status = 'complete' AND new.result IS NOT NULL BEGIN
+        {_BRIEF_UPDATE}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS role_search_brief_update AFTER UPDATE OF status, result ON analysis_jobs
+    WHEN new.status = 'complete' AND new.result IS NOT NULL BEGIN
+        {_BRIEF_UPDATE}
+    END
+    """,
+]
+
+
+# ─── SCHEMA ───────────────────────────────────────────────────────────────────
+
+def install(conn: Connection) -> None:
+    """Create the FTS table and its triggers (SQLite only; idempotent)."""
+    if conn.dialect.name != "sqlite":
+        return
+    for statement in _DDL:
+        conn.exec_driver_sql(statement)
+
+
+def rebuild(conn: Connection) -> None:
+    """Reindex every role with its latest completed brief."""
+    if conn.dialect.name != "sqlite":
+        return
+    conn.exec_driver_sql("DELETE FROM role_search")
+    conn.exec_driver_sql(f"""
+        INSERT INTO role_search (rowid, company, role_title, notes, brief)
+        SELECT r.id, r.company, r.role_title, coalesce(r.notes, ''),
+               coalesce((
+                   SELECT {_brief_text("j.result")} FROM analysis_jobs j
+                   WHERE j.role_id = r.id AND j.status = 'complete' AND j.result IS NOT NULL
+                   ORDER BY j.finished_at DESC, j.id DESC LIMIT 1
+               ), '')
+        FROM roles r
+    """)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_index(target, connection, **kw) -> None:
+    install(connection)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_index(target, connection, **kw) -> None:
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("DROP TABLE IF EXISTS role_search")
+
+
+# ─── QUERY ────────────────────────────────────────────────────────────────────
+
+_TERM = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def match_expression(query: str) -> str:
+    """
+    Turn user input into a safe FTS5 MATCH string.
+
+    Words and "quoted phrases" are matched literally and all must appear;
+    a trailing * on a word makes it a prefix match (fin* → fintech).
+    """
+    terms = []
+    for phrase, word in _TERM.findall(query):
+        prefix = word.endswith("*")
+        term   = (phrase or word).rstrip("*") if prefix else (phrase or word)
+        if term.strip():
+            terms.append('"' + term.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def _markup(highlighted: str) -> str:
+    """HTML-escape FTS5 highlight()/snippet() output, then mark its matches."""
+    return (
+        html.escape(highlighted)
+        .replace(_OPEN_SENTINEL, HIGHLIGHT_OPEN)
+        .replace(_CLOSE_SENTINEL, HIGHLIGHT_CLOSE)
+    )
+
+
+def search(conn: Connection, query: str, *, limit: int, offset: int = 0) -> tuple[list[SearchHit], bool]:
+    """Ranked page of roles matching query; the flag says whether more follow."""
+    if conn.dialect.name != "sqlite":
+        raise SearchUnavailable("Full-text search needs the SQLite backend (FTS5)")
+
+    rows = conn.execute(text(f"""
+        SELECT r.id, r.company, r.role_title, r.status, r.go_no_go, r.interview_probability,
+               bm25(role_search, {", ".join(map(str, _WEIGHTS))}) AS score,
+               highlight(role_search, 0, :open, :close),
+               highlight(role_search, 1, :open, :close),
+               snippet(role_search, -1, :open, :close, '…', :tokens)
+        FROM role_search JOIN roles r ON r.id = role_search.rowid
+        WHERE role_search MATCH :match
+        ORDER BY score, r.id
+        LIMIT :limit OFFSET :offset
+    """), {
+        "match":  match_expression(query),
+        "open":   _OPEN_SENTINEL,
+        "close":  _CLOSE_SENTINEL,
+        "tokens": SNIPPET_TOKENS,
+        "limit":  limit + 1,   # one extra row tells whether another page exists
+        "offset": offset,
+    }).all()
+
+    hits = [
+        SearchHit(
+            role_id=row[0], company=row[1], role_title=row[2], status=row[3],
+            go_no_go=row[4], interview_probability=row[5], score=round(-row[6], 6),
+            company_highlight=_markup(row[7]), role_title_highlight=_markup(row[8]),
+            snippet=_markup(row[9]),
+        )
+        for row in rows[:limit]
+    ]
+    return hits, len(rows) > limit
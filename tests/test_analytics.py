@@ -0,0 +1,134 @@
+"""
+test_analytics.py — Pipeline counters kept by the write endpoints match rebuild().
+
+Every roles write path is driven through the API, then the counter tables
+are compared with a full rebuild() from roles and steps, and
+GET /analytics/pipeline with the report the rebuilt counters give.
+"""
+
+import random
+
+import pytest
+from sqlalchemy import select
+
+from api.analytics import pipeline_report, rebuild
+from api.models import RoleAggregate, StepAggregate, StepGapAggregate
+from api.routes.analytics import router as analytics_router
+from api.routes.roles import bulk_router, router as roles_router
+
+_STATUSES = ["active", "submitted", "interviewing", "rejected", "offer", "archived"]
+
+
+def _counters(conn) -> dict:
+    """Every non-zero counter row; zero rows are left behind by decrements, not by rebuild()."""
+    snapshot = {}
+    for model in (RoleAggregate, StepAggregate, StepGapAggregate):
+        table = model.__table__
+        keys  = [column.name for column in table.primary_key]
+        for row in conn.execute(select(table)).mappings():
+            values = tuple(round(row[c.name], 3) for c in table.columns if c.name not in keys)
+            if any(values):
+                snapshot[(table.name, *(row[key] for key in keys))] = values
+    return snapshot
+
+
+def _assert_matches_rebuild(backend, client) -> None:
+    reported = client.get("/analytics/pipeline").json()
+    with backend.connect() as conn:
+        incremental = _counters(conn)
+        rebuild(conn)
+        assert _counters(conn) == incremental
+        assert reported == pipeline_report(conn)
+        conn.rollback()
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(bulk_router, roles_router, analytics_router)
+
+
+def _create(client, **values) -> int:
+    response = client.post("/roles", json={"company": "Acme", "role_title": "Engineer", **values})
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def test_create_role(backend, client):
+    _create(client)
+    _create(client, status="submitted", go_no_go="go", interview_probability=0.35)
+    _create(client, status="offer", go_no_go="no-go", interview_probability=0.9)
+    _assert_matches_rebuild(backend, client)
+
+
+def test_update_role(backend, client):
+    role_id = _create(client, go_no_go="go", interview_probability=0.2)
+    for values in (
+        {"status": "interviewing"},
+        {"interview_probability": 0.75},
+        {"go_no_go": "no-go", "status": "rejected"},
+        {"notes": "no counter change"},
+    ):
+        assert client.patch(f"/roles/{role_id}", json=values).status_code == 200
+    _assert_matches_rebuild(backend, client)
+
+
+def test_update_step(backend, client):
+    role_id = _create(client)
+    for step_number, status in ((0, "complete"), (1, "in_progress"), (1, "complete"), (3, "skipped")):
+        response = client.patch(f"/roles/{role_id}/steps/{step_number}", json={"status": status})
+        assert response.status_code == 200, response.text
+    _assert_matches_rebuild(backend, client)
+
+
+def test_bulk_step_updates(backend, client):
+    first, second = _create(client), _create(client)
+    response = client.patch(f"/roles/{first}/steps", json=[
+        {"step_number": n, "status": "complete"} for n in range(4)
+    ])
+    assert response.status_code == 200, response.text
+    response = client.patch("/roles/steps:batch", json=[
+        {"role_id": first, "step_number": 4, "status": "in_progress"},
+        {"role_id": second, "step_number": 0, "status": "complete"},
+        {"role_id": second, "step_number": 2, "status": "complete"},
+    ])
+    assert response.status_code == 200, response.text
+    _assert_matches_rebuild(backend, client)
+
+
+def test_delete_role(backend, client):
+    keep, doomed = _create(client, go_no_go="go"), _create(client, status="offer", interview_probability=0.6)
+    for role_id in (keep, doomed):
+        client.patch(f"/roles/{role_id}/steps", json=[{"step_number": n, "status": "complete"} for n in range(3)])
+    assert client.delete(f"/roles/{doomed}").status_code == 204
+    _assert_matches_rebuild(backend, client)
+
+
+def test_mixed_workload(backend, client):
+    rng = random.Random(21)
+    bulk = client.post("/roles:bulk", json=[
+        {"company": f"Company {n}", "role_title": "Engineer", "status": rng.choice(_STATUSES),
+         "interview_probability": round(rng.random(), 2)}
+        for n in range(20)
+    ])
+    role_ids = bulk.json()["role_ids"]
+
+    for _ in range(150):
+        roll = rng.random()
+        if roll < 0.1:
+            role_ids.append(_create(client, status=rng.choice(_STATUSES), go_no_go=rng.choice(["go", "no-go", None])))
+        elif roll < 0.3:
+            client.patch(f"/roles/{rng.choice(role_ids)}", json={
+                "status": rng.choice(_STATUSES), "interview_probability": round(rng.random(), 2),
+            })
+        elif roll < 0.6:
+            client.patch(f"/roles/{rng.choice(role_ids)}/steps/{rng.randrange(10)}",
+                         json={"status": rng.choice(["in_progress", "complete", "skipped"])})
+        elif roll < 0.9:
+            client.patch(f"/roles/{rng.choice(role_ids)}/steps", json=[
+                {"step_number": n, "status": rng.choice(["complete", "in_progress"])}
+                for n in rng.sample(range(10), 3)
+            ])
+        else:
+            assert client.delete(f"/roles/{role_ids.pop(rng.randrange(len(role_ids)))}").status_code == 204
+
+    _assert_matches_rebuild(backend, client)
@@ -0,0 +1,370 @@
+"""
+test_analyze_jobs.py — Analyze runs on the bounded worker pool, and the SSE stream.
+
+anthropic.Anthropic is replaced by a stub whose calls block on an event,
+so runs can be held mid-flight to check the worker cap, the queue depth
+(429 once both are full) and each job's queued → running → complete /
+failed transitions — all offline. The stream endpoint gets an
+AsyncAnthropic stub instead and is checked for database calls made on the
+event loop.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import anthropic
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api import research_store
+from api.database import SessionLocal
+from api.jobs import JobQueue
+from api.models import AnalysisJob, Role
+from api.routes import analyze
+
+_BRIEF = {
+    "company_briefing":      "Builds payments infrastructure.",
+    "founder_profile":       "Second-time founder.",
+    "recent_signals":        ["Launched an API"],
+    "positioning_angle":     "Lead with platform work.",
+    "language_to_mirror":    ["developer-first"],
+    "proof_points":          ["Scaled the billing platform"],
+    "go_no_go":              "go",
+    "interview_probability": 70,
+}
+_NOTES = {category: {"notes": f"{category} notes", "sources": []} for category in research_store.CATEGORIES}
+
+
+def _response(request: dict) -> SimpleNamespace:
+    """A final end_turn message — research notes when tools were sent, else the brief."""
+    text = json.dumps(_NOTES if request.get("tools") else _BRIEF)
+    return SimpleNamespace(
+        stop_reason="end_turn",
+        content=[SimpleNamespace(type="text", text=text)],
+        usage=SimpleNamespace(
+            input_tokens=100, output_tokens=50,
+            cache_read_input_tokens=0, cache_creation_input_tokens=0,
+        ),
+    )
+
+
+class _StubMessages:
+    """messages.create that blocks on `gate` and records how many calls overlap."""
+
+    def __init__(self) -> None:
+        self.gate   = threading.Event()
+        self.error  = None
+        self.active = 0
+        self.peak   = 0
+        self._lock  = threading.Lock()
+
+    def create(self, **kwargs):
+        with self._lock:
+            self.active += 1
+            self.peak    = max(self.peak, self.active)
+        try:
+            assert self.gate.wait(10), "stub call was never released"
+            if self.error is not None:
+                raise self.error
+            return _response(kwargs)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+@pytest.fixture
+def stub(app_db, monkeypatch):
+    messages = _StubMessages()
+
+    class StubAnthropic:
+        def __init__(self, api_key=None, **_):
+            self.messages = messages
+
+    queue = JobQueue(max_workers=2, max_queued=1, name="test-analyze")
+    monkeypatch.setattr(anthropic, "Anthropic", StubAnthropic)
+    monkeypatch.setattr(analyze, "_queue", queue)
+    monkeypatch.setattr(analyze, "_read_master_files", lambda: ("identity", "profile"))
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    yield messages
+    messages.gate.set()
+    queue.shutdown(wait=True)
+
+
+@pytest.fixture
+def client(app_db):
+    app = FastAPI()
+    app.include_router(analyze.router)
+    return TestClient(app)
+
+
+def _roles(count: int) -> list[int]:
+    """Roles at distinct companies, so no run reuses another's research or brief."""
+    db = SessionLocal()
+    try:
+        roles = [Role(company=f"Company {time.monotonic_ns()}-{i}", role_title="Engineer") for i in range(count)]
+        db.add_all(roles)
+        db.commit()
+        return [role.id for role in roles]
+    finally:
+        db.close()
+
+
+def _statuses(job_ids: list[int]) -> list[str]:
+    db = SessionLocal()
+    try:
+        return [db.get(AnalysisJob, job_id).status for job_id in job_ids]
+    finally:
+        db.close()
+
+
+def _wait_for(condition, timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for condition"
+        time.sleep(0.01)
+
+
+def test_worker_cap_and_queue_depth(stub, client):
+    role_ids = _roles(4)
+
+    # 2 workers + 1 waiting slot: three runs are accepted, the fourth is shed
+    accepted = [client.post(f"/roles/{role_id}/analyze") for role_id in role_ids[:3]]
+    assert [response.status_code for response in accepted] == [202, 202, 202]
+    job_ids = [response.json()["id"] for response in accepted]
+
+    _wait_for(lambda: stub.active == 2)
+    assert sorted(_statuses(job_ids)) == ["queued", "running", "running"]
+
+    rejected = client.post(f"/roles/{role_ids[3]}/analyze")
+    assert rejected.status_code == 429
+    assert rejected.headers["Retry-After"] == str(analyze._RETRY_AFTER)
+    assert client.get(f"/roles/{role_ids[3]}/analyze/jobs").json() == []
+
+    stub.gate.set()
+    _wait_for(lambda: _statuses(job_ids) == ["complete"] * 3)
+    assert stub.peak == 2
+
+    job = client.get(f"/roles/{role_ids[0]}/analyze/jobs/{job_ids[0]}").json()
+    assert job["result"]["go_no_go"] == "go"
+    assert job["started_at"] is not None and job["finished_at"] is not None
+    assert job["input_tokens"] == 200   # research + synthesis
+
+
+def test_job_lifecycle_to_failed(stub, client):
+    (role_id,) = _roles(1)
+    stub.error = RuntimeError("upstream overloaded")
+
+    response = client.post(f"/roles/{role_id}/analyze")
+    assert response.status_code == 202
+    assert response.json()["status"] == "queued"
+    job_id = response.json()["id"]
+
+    _wait_for(lambda: _statuses([job_id]) == ["running"])
+    stub.gate.set()
+    _wait_for(lambda: _statuses([job_id]) == ["failed"])
+
+    job = client.get(f"/roles/{role_id}/analyze/jobs/{job_id}").json()
+    assert "upstream overloaded" in job["error"]
+    assert job["result"] is None
+
+
+def test_batch_shares_the_worker_pool(stub, client):
+    role_ids = _roles(4)
+    responses = []
+    batch = threading.Thread(target=lambda: responses.append(
+        client.post("/roles/analyze:batch", json={"role_ids": role_ids, "concurrency": 4}),
+    ))
+    batch.start()
+
+    # The batch asks for 4 but the pool holds 2 running + 1 waiting
+    _wait_for(lambda: stub.active == 2)
+    assert analyze._queue.stats()["capacity"] == 0
+
+    stub.gate.set()
+    batch.join(10)
+    lines = [json.loads(line) for line in responses[0].text.splitlines()]
+    assert sorted(line["role_id"] for line in lines) == sorted(role_ids)
+    assert {line["status"] for line in lines} == {"complete"}
+    assert stub.peak == 2
+
+
+def test_batch_rejected_when_pool_full(stub, client):
+    role_ids = _roles(5)
+    for role_id in role_ids[:3]:
+        assert client.post(f"/roles/{role_id}/analyze").status_code == 202
+
+    response = client.post("/roles/analyze:batch", json={"role_ids": role_ids[3:]})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == str(analyze._RETRY_AFTER)
+    for role_id in role_ids[3:]:
+        assert client.get(f"/roles/{role_id}/analyze/jobs").json() == []
+
+
+class _StubStream:
+    """Async context manager standing in for AsyncAnthropic().messages.stream(...)."""
+
+    def __init__(self, request: dict) -> None:
+        self.response = _response(request)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def __aiter__(self):
+        yield SimpleNamespace(type="text", text=self.response.content[0].text)
+
+    @property
+    async def text_stream(self):
+        yield self.response.content[0].text
+
+    async def get_final_message(self):
+        return self.response
+
+
+def test_stream_keeps_database_calls_off_the_event_loop(app_db, client, monkeypatch):
+    class StubAsyncAnthropic:
+        def __init__(self, api_key=None, **_):
+            self.messages = SimpleNamespace(stream=lambda **request: _StubStream(request))
+
+        async def close(self):
+            pass
+
+    on_loop = []
+
+    def off_loop(fn):
+        def wrapper(*args, **kwargs):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(fn.__name__)
+            except RuntimeError:
+                pass   # a worker thread — no event loop here
+            return fn(*args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(anthropic, "AsyncAnthropic", StubAsyncAnthropic)
+    monkeypatch.setattr(analyze, "_read_master_files", lambda: ("identity", "profile"))
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    for module, name in (
+        (analyze, "_get_role_or_404"), (analyze.brief_cache, "get"), (analyze.brief_cache, "put"),
+        (analyze.research_store, "load_fresh"), (analyze.research_store, "save"), (analyze, "_finish_job"),
+    ):
+        monkeypatch.setattr(module, name, off_loop(getattr(module, name)))
+
+    (role_id,) = _roles(1)
+    response = client.post(f"/roles/{role_id}/analyze/stream")
+    assert response.status_code == 200
+    events = [line.split(": ", 1)[1] for line in response.text.splitlines() if line.startswith("event: ")]
+    assert events[0] == "job" and events[-1] == "result"
+
+    # Second run: served from the brief cache the first one wrote
+    replay = client.post(f"/roles/{role_id}/analyze/stream")
+    assert replay.headers["X-Cache"] == "HIT"
+    assert on_loop == []
+
+    jobs = client.get(f"/roles/{role_id}/analyze/jobs").json()
+    assert [job["status"] for job in jobs] == ["complete", "complete"]
+
+
+def test_stream_checks_the_synthesis_ceiling(app_db, client, monkeypatch):
+    big_notes = {category: {"notes": "x" * 20_000, "sources": []} for category in research_store.CATEGORIES}
+    requests  = []
+
+    class BigNotesStream(_StubStream):
+        def __init__(self, request: dict) -> None:
+            super().__init__(request)
+            self.response.content[0].text = json.dumps(big_notes)
+
+    class StubAsyncAnthropic:
+        def __init__(self, api_key=None, **_):
+            self.messages = SimpleNamespace(stream=self._stream)
+
+        def _stream(self, **request):
+            requests.append(request)
+            return BigNotesStream(request)
+
+        async def close(self):
+            pass
+
+    monkeypatch.setattr(anthropic, "AsyncAnthropic", StubAsyncAnthropic)
+    monkeypatch.setattr(analyze, "_read_master_files", lambda: ("identity", "profile"))
+    monkeypatch.setattr(analyze, "_INPUT_TOKEN_CEILING", 10_000)
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+
+    (role_id,) = _roles(1)
+    response = client.post(f"/roles/{role_id}/analyze/stream")
+    events = [line.split(": ", 1)[1] for line in response.text.splitlines() if line.startswith("event: ")]
+    assert events[-1] == "error"
+    assert "over the ceiling" in response.text
+    assert [bool(request.get("tools")) for request in requests] == [True]   # synthesis never sent
+    assert [job["status"] for job in client.get(f"/roles/{role_id}/analyze/jobs").json()] == ["failed"]
+
+
+def test_batch_survives_a_failed_cache_write(stub, client, monkeypatch):
+    def broken_put(*args, **kwargs):
+        raise RuntimeError("brief cache unavailable")
+
+    monkeypatch.setattr(analyze.brief_cache, "put", broken_put)
+    role_ids = _roles(2)
+    stub.gate.set()
+
+    response = client.post("/roles/analyze:batch", json={"role_ids": role_ids})
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["role_id"] for line in lines) == sorted(role_ids)
+    assert {line["status"] for line in lines} == {"complete"}
+
+
+def test_batch_reports_a_crashed_worker_as_failed(stub, client, monkeypatch):
+    real_run_job = analyze._run_job
+    role_ids = _roles(3)
+    crashing = role_ids[1]
+
+    def run_job(job_id, *args, **kwargs):
+        db = SessionLocal()
+        try:
+            role_id = db.get(AnalysisJob, job_id).role_id
+        finally:
+            db.close()
+        if role_id == crashing:
+            raise RuntimeError("worker crashed")
+        return real_run_job(job_id, *args, **kwargs)
+
+    monkeypatch.setattr(analyze, "_run_job", run_job)
+    stub.gate.set()
+
+    response = client.post("/roles/analyze:batch", json={"role_ids": role_ids, "concurrency": 1})
+    lines = {line["role_id"]: line for line in map(json.loads, response.text.splitlines())}
+    assert sorted(lines) == sorted(role_ids)
+    assert lines[crashing]["status"] == "failed"
+    assert "worker crashed" in lines[crashing]["error"]
+    assert [lines[role_id]["status"] for role_id in role_ids if role_id != crashing] == ["complete"] * 2
+    assert _statuses([lines[crashing]["id"]]) == ["failed"]
+
+
+def test_batch_deadline_fails_roles_that_never_got_a_slot(stub, client, monkeypatch):
+    monkeypatch.setattr(analyze, "_BATCH_DEADLINE", 0.5)
+    monkeypatch.setattr(analyze, "_BATCH_RESUBMIT_DELAY", 0.05)
+    singles, batched = _roles(2), _roles(3)
+    for role_id in singles:   # hold both workers
+        assert client.post(f"/roles/{role_id}/analyze").status_code == 202
+    _wait_for(lambda: stub.active == 2)
+
+    # One batch role takes the waiting slot; the other two never get one
+    started  = time.monotonic()
+    releaser = threading.Timer(1.0, stub.gate.set)
+    releaser.start()
+    response = client.post("/roles/analyze:batch", json={"role_ids": batched, "concurrency": 4})
+    releaser.join()
+
+    lines = {line["role_id"]: line for line in map(json.loads, response.text.splitlines())}
+    assert sorted(lines) == sorted(batched)
+    assert lines[batched[0]]["status"] == "complete"
+    for role_id in batched[1:]:
+        assert lines[role_id]["status"] == "failed"
+        assert "deadline" in lines[role_id]["error"]
+    assert time.monotonic() - started < 5
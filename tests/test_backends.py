@@ -0,0 +1,103 @@
+"""
+test_backends.py — Storage-backend specific paths, on SQLite and PostgreSQL.
+
+Every test takes the `backend` fixture (tests/conftest.py), so the
+PostgreSQL-only pieces — pool pre-ping and recycling, the change-log
+advisory lock, the ON CONFLICT counter upserts — run whenever DATABASE_URL
+points at a PostgreSQL server, and are reported as skipped otherwise.
+"""
+
+import threading
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+
+from api import analytics, changes
+from api.database import DB_POOL_PRE_PING, DB_POOL_RECYCLE, DB_POOL_SIZE, Base
+from api.migrations import MIGRATIONS, applied_versions, migrate
+from api.models import RoleAggregate, StepAggregate, StepGapAggregate
+from api.role_import import import_roles
+
+
+def test_engine_pool_settings(backend):
+    assert isinstance(backend.pool, QueuePool)
+    assert backend.pool.size() == DB_POOL_SIZE
+
+    if backend.dialect.name == "sqlite":
+        with backend.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar().lower() == "wal"
+        return
+
+    assert backend.pool._pre_ping is DB_POOL_PRE_PING
+    assert backend.pool._recycle == DB_POOL_RECYCLE
+
+    # A pooled connection the server has dropped is replaced on checkout
+    with backend.connect() as first, backend.connect() as second:
+        pids = [conn.execute(text("SELECT pg_backend_pid()")).scalar() for conn in (first, second)]
+    with backend.connect() as killer:
+        killer.execute(text("SELECT pg_terminate_backend(:pid)"), {"pid": pids[0]})
+    with backend.connect() as first, backend.connect() as second:
+        assert [conn.execute(text("SELECT 1")).scalar() for conn in (first, second)] == [1, 1]
+
+
+def test_migrations_applied_once(backend):
+    assert applied_versions(backend) == {migration.version for migration in MIGRATIONS}
+    assert migrate(backend, lambda: Base.metadata.create_all(bind=backend)) == []
+
+
+def test_concurrent_change_log_appends_read_back_in_order(backend):
+    writers, commits = 4, 10
+
+    def write(writer: int) -> None:
+        for n in range(commits):
+            with Session(backend) as db:
+                changes.record(db, [changes.role_entry("delete", writer * 100 + n)])
+                db.commit()
+
+    threads = [threading.Thread(target=write, args=(writer,)) for writer in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with Session(backend) as db:
+        entries, more = changes.read_since(db, 0, limit=1000)
+        assert changes.head(db) == entries[-1].id
+
+    ids = [entry.id for entry in entries]
+    assert not more and len(ids) == writers * commits
+    assert ids == sorted(ids)
+    for writer in range(writers):
+        mine = [entry.entity_id for entry in entries if entry.entity_id // 100 == writer]
+        assert mine == [writer * 100 + n for n in range(commits)]
+
+
+def _counters(conn) -> dict:
+    return {
+        model.__tablename__: sorted(
+            tuple(round(value, 6) if isinstance(value, float) else value for value in row)
+            for row in conn.execute(select(model.__table__))
+        )
+        for model in (RoleAggregate, StepAggregate, StepGapAggregate)
+    }
+
+
+def test_counter_upserts_match_a_rebuild(backend):
+    statuses = ("active", "submitted", "interviewing", "rejected", "offer")
+    with Session(backend) as db:
+        for batch in range(3):   # later batches hit existing counter rows (ON CONFLICT … DO UPDATE)
+            result = import_roles(db, [
+                {"company": f"Company {batch}-{i}", "role_title": "Engineer",
+                 "status": statuses[i % len(statuses)], "go_no_go": ("go", "no-go", None)[i % 3],
+                 "interview_probability": (i % 10) / 10 if i % 4 else None}
+                for i in range(40)
+            ], chunk_size=15)
+            assert result.failed == 0
+
+    with backend.begin() as conn:
+        incremental = _counters(conn)
+        report      = analytics.pipeline_report(conn)
+        analytics.rebuild(conn)
+        assert _counters(conn) == incremental
+        assert analytics.pipeline_report(conn) == report
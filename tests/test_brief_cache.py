@@ -0,0 +1,78 @@
+"""
+test_brief_cache.py — Brief cache keys, TTL expiry and LRU eviction.
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from api import brief_cache
+from api.models import BriefCacheEntry
+
+_INPUTS = dict(identity="me", profile="profile", system_prompt="prompt", model="model")
+
+
+def _key(company: str = "Acme", role_title: str = "Engineer", **inputs) -> str:
+    return brief_cache.make_key(company=company, role_title=role_title, **{**_INPUTS, **inputs})
+
+
+def _backdate(db, key: str, **columns) -> None:
+    db.execute(update(BriefCacheEntry).where(BriefCacheEntry.key == key).values(**columns))
+    db.commit()
+
+
+def test_key_ignores_case_and_spacing_only():
+    assert _key("Acme  Inc", " staff ENGINEER") == _key("acme inc", "Staff Engineer")
+    assert _key("Acme Inc") != _key("Acme Co")
+    assert _key(profile="edited profile") != _key()
+    assert _key(model="other model") != _key()
+
+
+def test_hit_then_expiry(sessions, monkeypatch):
+    monkeypatch.setattr(brief_cache, "_TTL", timedelta(hours=1))
+    with sessions() as db:
+        key = _key()
+        assert brief_cache.get(db, key) is None
+        brief_cache.put(db, key, "Acme", "Engineer", '{"brief": 1}')
+        assert brief_cache.get(db, key) == '{"brief": 1}'
+
+        _backdate(db, key, created_at=datetime.utcnow() - timedelta(hours=2))
+        assert brief_cache.get(db, key) is None
+        assert db.get(BriefCacheEntry, key) is None   # deleted on read
+
+
+def test_least_recently_used_rows_are_evicted(sessions, monkeypatch):
+    monkeypatch.setattr(brief_cache, "_MAX_ENTRIES", 2)
+    with sessions() as db:
+        keys = [_key(f"Company {n}") for n in range(3)]
+        for n, key in enumerate(keys[:2]):
+            brief_cache.put(db, key, f"Company {n}", "Engineer", f'{{"n": {n}}}')
+            _backdate(db, key, last_used_at=datetime.utcnow() - timedelta(minutes=10 - n))
+
+        assert brief_cache.get(db, keys[0]) == '{"n": 0}'   # now the most recently used
+        brief_cache.put(db, keys[2], "Company 2", "Engineer", '{"n": 2}')
+
+        assert brief_cache.get(db, keys[1]) is None
+        assert brief_cache.get(db, keys[0]) == '{"n": 0}'
+        assert brief_cache.get(db, keys[2]) == '{"n": 2}'
+
+
+def test_put_drops_expired_rows(sessions, monkeypatch):
+    monkeypatch.setattr(brief_cache, "_TTL", timedelta(hours=1))
+    with sessions() as db:
+        stale, fresh = _key("Stale"), _key("Fresh")
+        brief_cache.put(db, stale, "Stale", "Engineer", "{}")
+        _backdate(db, stale, created_at=datetime.utcnow() - timedelta(hours=2))
+
+        brief_cache.put(db, fresh, "Fresh", "Engineer", "{}")
+        db.expire_all()
+        assert [entry.key for entry in db.query(BriefCacheEntry)] == [fresh]
+
+
+def test_put_replaces_an_existing_entry(sessions):
+    with sessions() as db:
+        key = _key()
+        brief_cache.put(db, key, "Acme", "Engineer", '{"v": 1}')
+        brief_cache.put(db, key, "Acme", "Engineer", '{"v": 2}')
+        assert brief_cache.get(db, key) == '{"v": 2}'
+        assert db.query(BriefCacheEntry).count() == 1
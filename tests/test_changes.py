@@ -0,0 +1,153 @@
+"""
+test_changes.py — GET /changes long-poll, the SSE stream, pruning and 410s.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from api import changes
+from api.models import ChangeLogEntry
+from api.routes.changes import router as changes_router, stream_changes
+from api.routes.roles import router as roles_router
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(changes_router, roles_router)
+
+
+def _create(client, company: str = "Acme") -> int:
+    response = client.post("/roles", json={"company": company, "role_title": "Engineer"})
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def _prune_everything(sessions) -> int:
+    """Age every entry past the retention window and prune."""
+    with sessions() as db:
+        db.execute(update(ChangeLogEntry).values(changed_at=datetime.utcnow() - timedelta(days=365)))
+        db.commit()
+        return changes.prune(db)
+
+
+def test_feed_returns_writes_after_the_cursor(client):
+    cursor = client.get("/changes").json()["cursor"]
+    role_id = _create(client)
+    client.patch(f"/roles/{role_id}/steps/1", json={"status": "complete"})
+
+    page = client.get("/changes", params={"since": cursor}).json()
+    assert [(c["entity"], c["op"]) for c in page["changes"]] == [("role", "create"), ("step", "update")]
+    assert page["cursor"] == page["changes"][-1]["id"] and page["more"] is False
+
+    paged = client.get("/changes", params={"since": cursor, "limit": 1}).json()
+    assert len(paged["changes"]) == 1 and paged["more"] is True
+
+
+def test_long_poll_returns_when_a_change_is_committed(client):
+    cursor = client.get("/changes").json()["cursor"]
+    result = {}
+
+    def poll():
+        started = time.monotonic()
+        result["page"] = client.get("/changes", params={"since": cursor, "wait": 10}).json()
+        result["seconds"] = time.monotonic() - started
+
+    waiter = threading.Thread(target=poll)
+    waiter.start()
+    time.sleep(0.3)
+    _create(client, "Globex")
+    waiter.join(timeout=15)
+
+    assert [c["op"] for c in result["page"]["changes"]] == ["create"]
+    assert result["page"]["changes"][0]["data"]["company"] == "Globex"
+    assert result["seconds"] < 5
+
+
+def test_long_poll_times_out_empty(client):
+    cursor = client.get("/changes").json()["cursor"]
+    page = client.get("/changes", params={"since": cursor, "wait": 0.3}).json()
+    assert page == {"changes": [], "cursor": cursor, "more": False}
+
+
+def test_pruned_cursor_gets_410(client, sessions):
+    _create(client, "Before")
+    first = client.get("/changes").json()["cursor"]
+    for n in range(3):
+        _create(client, f"Company {n}")
+    assert _prune_everything(sessions) == 3
+
+    assert client.get("/changes", params={"since": first}).status_code == 410
+    head = client.get("/changes").json()["cursor"]
+    assert client.get("/changes", params={"since": head}).json()["changes"] == []
+
+
+def test_prune_never_rewinds_the_list_version(client, sessions):
+    _create(client)
+    _create(client)
+    _prune_everything(sessions)
+    stale = client.get("/roles")
+    assert stale.status_code == 200
+
+    _create(client, "Initech")
+    _prune_everything(sessions)
+    fresh = client.get("/roles", headers={"If-None-Match": stale.headers["etag"]})
+    assert fresh.status_code == 200
+    assert "Initech" in fresh.text
+
+
+class _Request:
+    """Stands in for Starlette's Request: connected for `polls` loop turns."""
+
+    def __init__(self, polls: int) -> None:
+        self.polls = polls
+
+    async def is_disconnected(self) -> bool:
+        self.polls -= 1
+        return self.polls < 0
+
+
+def _stream(sessions, **kwargs) -> list[tuple[str, str, dict]]:
+    """Run /changes/stream until the fake client disconnects; (id, event, data) per event."""
+    async def run():
+        with sessions() as db:
+            kwargs.setdefault("since", None)
+            kwargs.setdefault("last_event_id", None)
+            response = await stream_changes(db=db, **kwargs)
+            return [chunk async for chunk in response.body_iterator]
+
+    events = []
+    for chunk in asyncio.run(run()):
+        fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+        events.append((fields.get("id"), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_stream_delivers_changes_and_resumes(client, sessions):
+    start = client.get("/changes").json()["cursor"]
+    ids = [_create(client, f"Company {n}") for n in range(3)]
+
+    events = _stream(sessions, request=_Request(polls=1), since=start)
+    assert events[0] == (None, "cursor", {"cursor": start})
+    delivered = [(event, data["entity_id"]) for _, event, data in events[1:]]
+    assert delivered == [("change", role_id) for role_id in ids]
+
+    # Reconnect with Last-Event-ID: only what came after it
+    resumed = _stream(sessions, request=_Request(polls=1), last_event_id=events[1][0])
+    assert [data["entity_id"] for _, event, data in resumed if event == "change"] == ids[1:]
+
+
+def test_stream_resets_on_a_pruned_cursor(client, sessions):
+    _create(client, "Before")
+    first = client.get("/changes").json()["cursor"]
+    for n in range(3):
+        _create(client, f"Company {n}")
+    _prune_everything(sessions)
+
+    events = _stream(sessions, request=_Request(polls=5), since=first)
+    assert [event for _, event, _ in events] == ["cursor", "reset"]
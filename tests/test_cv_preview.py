@@ -0,0 +1,97 @@
+"""
+test_cv_preview.py — SectionCache: only changed [SECTION] blocks are rebuilt.
+"""
+
+import pytest
+
+from api.cv_preview import SectionCache, split_sections
+
+_CV = """Jane Doe
+[SUMMARY]
+Builds payments platforms.
+[EXPERIENCE]
+Acme — Staff Engineer
+[SKILLS]
+Python, SQL
+"""
+
+
+class _Generator:
+    """parse / generate pair that records which sections were rebuilt."""
+
+    def __init__(self) -> None:
+        self.parsed: list[str] = []
+
+    def parse(self, section: str) -> str:
+        if "[BROKEN]" in section:
+            raise ValueError("unparseable section")
+        self.parsed.append(section.split("\n", 1)[0] if section.startswith("[") else section.split("\n")[1])
+        return section
+
+    def generate(self, section: str) -> str:
+        return f"<div>{section}</div>"
+
+
+def _build(cache, generator, text: str = _CV, fingerprint: str = "v1"):
+    generator.parsed.clear()
+    return cache.build_body(text, fingerprint, generator.parse, generator.generate)
+
+
+def test_split_sections_round_trips():
+    sections = split_sections(_CV)
+    assert len(sections) == 3
+    assert sections[0].startswith("Jane Doe\n[SUMMARY]")   # preamble stays with the first block
+    assert "".join(sections) == _CV
+    assert split_sections("no markers") == ["no markers"]
+
+
+def test_only_edited_sections_are_rebuilt():
+    cache, generator = SectionCache(100), _Generator()
+    body, rebuilt, reused = _build(cache, generator)
+    assert (rebuilt, reused) == (3, 0)
+    assert body == "".join(f"<div>{section}</div>" for section in split_sections(_CV))
+
+    assert _build(cache, generator)[1:] == (0, 3)
+    assert generator.parsed == []
+
+    edited = _CV.replace("Python, SQL", "Python, SQL, Go")
+    body, rebuilt, reused = _build(cache, generator, edited)
+    assert (rebuilt, reused) == (1, 2)
+    assert generator.parsed == ["[SKILLS]"]
+    assert body.endswith("<div>[SKILLS]\nPython, SQL, Go\n</div>")
+
+    # Reordering sections reuses every fragment, in the new order
+    first, second, third = split_sections(edited)
+    reordered = first + third + second
+    body, rebuilt, reused = _build(cache, generator, reordered)
+    assert (rebuilt, reused) == (0, 3)
+    assert body == "".join(f"<div>{section}</div>" for section in (first, third, second))
+
+
+def test_fingerprint_change_rebuilds_everything():
+    cache, generator = SectionCache(100), _Generator()
+    _build(cache, generator)
+    assert _build(cache, generator, fingerprint="v2")[1:] == (3, 0)
+    assert _build(cache, generator, fingerprint="v2")[1:] == (0, 3)
+
+
+def test_least_recently_used_fragments_are_dropped():
+    cache, generator = SectionCache(3), _Generator()
+    first, second, third = split_sections(_CV)
+    _build(cache, generator)
+    _build(cache, generator, "[NEW]\nOne more section\n")
+    assert cache.stats()["entries"] == 3
+
+    # The oldest fragment was the one evicted
+    assert _build(cache, generator, second + third)[1:] == (0, 2)
+    assert _build(cache, generator, first)[1:] == (1, 0)
+
+
+def test_parse_errors_propagate():
+    cache, generator = SectionCache(100), _Generator()
+    with pytest.raises(ValueError, match="unparseable"):
+        _build(cache, generator, _CV + "[BROKEN]\nx\n")
+    assert _build(cache, generator)[1:] == (0, 3)   # sections before the error were kept
+
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (3, 3, 4)   # the failed build's misses count
@@ -0,0 +1,211 @@
+"""
+test_cv_routes.py — POST /cv/generate, the PDF cache behind it, the
+streamed ZIP of POST /cv/generate:batch, and the POST /cv/preview edit loop.
+
+Runs api.routes.cv through the `cv_routes` fixture (a stub generate_cv) with
+a stub renderer that counts renders, so no WeasyPrint or Pango is needed.
+"""
+
+import io
+import json
+import tempfile
+import zipfile
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.cv_preview import SectionCache
+from api.pdf_cache import PDFCache
+
+_CV = "[SUMMARY]\nBuilds payments platforms.\n\n[EXPERIENCE]\nAcme — Staff Engineer"
+
+
+class _StubRenderer:
+    """Stands in for PDFRenderer: a fake PDF per body, and a count of renders."""
+
+    def __init__(self) -> None:
+        self.renders = 0
+
+    def render(self, body: str) -> bytes:
+        self.renders += 1
+        return b"%PDF-1.7\n" + body.encode() + b"\n" + b"0" * 200_000
+
+    def render_html(self, body: str) -> str:
+        return f"<html><body>{body}</body></html>"
+
+
+@pytest.fixture
+def cv(cv_routes, tmp_path, monkeypatch):
+    """api.routes.cv with a stub renderer and empty PDF and section caches of its own."""
+    monkeypatch.setattr(cv_routes, "_renderer", _StubRenderer())
+    monkeypatch.setattr(cv_routes, "_pdf_cache", PDFCache(tmp_path / "pdfs", 10 * 1024 * 1024))
+    monkeypatch.setattr(cv_routes, "_section_cache", SectionCache(100))
+    monkeypatch.setattr(cv_routes, "_check_render_ready", lambda: None)
+    return cv_routes
+
+
+@pytest.fixture
+def client(cv):
+    app = FastAPI()
+    app.include_router(cv.router)
+    return TestClient(app)
+
+
+def _generate(client, cv_content: str = _CV, **headers):
+    return client.post("/cv/generate", json={"cv_content": cv_content, "output_filename": "Jane.pdf"},
+                       headers=headers)
+
+
+def test_render_once_then_serve_from_the_cache(cv, client):
+    first = _generate(client)
+    assert first.status_code == 200
+    assert first.headers["x-cache"] == "MISS"
+    assert first.headers["content-type"] == "application/pdf"
+    assert first.headers["content-disposition"] == 'attachment; filename="Jane.pdf"'
+    assert first.content.startswith(b"%PDF-1.7\n<section>[SUMMARY]")
+    assert int(first.headers["content-length"]) == len(first.content)
+
+    second = _generate(client)
+    assert second.headers["x-cache"] == "HIT"
+    assert second.content == first.content
+    assert int(second.headers["content-length"]) == len(first.content)
+    assert second.headers["etag"] == first.headers["etag"]
+    assert cv._renderer.renders == 1
+
+    changed = _generate(client, _CV + "\n\n[SKILLS]\nPython")
+    assert changed.headers["x-cache"] == "MISS" and changed.headers["etag"] != first.headers["etag"]
+    assert cv._renderer.renders == 2
+
+
+def test_matching_etag_gets_304_without_rendering(cv, client):
+    etag = _generate(client).headers["etag"]
+    revalidated = _generate(client, **{"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert cv._pdf_cache.stats()["hits"] == 0   # answered before the cache was read
+    assert cv._renderer.renders == 1
+
+
+def test_hits_stream_from_the_cache_file(cv, client, monkeypatch):
+    _generate(client)
+
+    def read_into_memory(key):
+        raise AssertionError("a hit must not read the whole PDF into memory")
+
+    monkeypatch.setattr(cv._pdf_cache, "get", read_into_memory)
+    assert _generate(client).headers["x-cache"] == "HIT"
+
+
+def test_no_temp_files_are_written(cv, client):
+    before = set(Path(tempfile.gettempdir()).glob("*.pdf"))
+    for n in range(3):
+        _generate(client, f"{_CV} {n}")
+        _generate(client, f"{_CV} {n}")
+    assert set(Path(tempfile.gettempdir()).glob("*.pdf")) == before
+
+
+def test_parse_error_is_422(cv, client):
+    response = _generate(client, "[BROKEN]")
+    assert response.status_code == 422
+    assert "unparseable section" in response.json()["detail"]
+
+
+def test_etag_still_gets_304_after_eviction(cv, client):
+    etag = _generate(client).headers["etag"]
+    for n in range(60):   # ~200 KB each: pushes the first PDF out of the 10 MB cache
+        _generate(client, f"{_CV} {n}")
+    assert cv._pdf_cache.stats()["evictions"] > 0
+
+    assert _generate(client, **{"If-None-Match": etag}).status_code == 304
+    rerendered = _generate(client)
+    assert rerendered.headers["x-cache"] == "MISS" and rerendered.headers["etag"] == etag
+
+
+def test_cache_counters(cv, client):
+    _generate(client)
+    _generate(client)
+    _generate(client)
+    stats = client.get("/cv/cache").json()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (2, 1, 0.6667)
+    assert stats["entries"] == 1 and stats["max_bytes"] == 10 * 1024 * 1024
+    assert set(stats["sections"]) == {"entries", "hits", "misses"}
+
+
+# ─── BATCH ────────────────────────────────────────────────────────────────────
+
+def _batch(client, payloads: list[dict]) -> zipfile.ZipFile:
+    response = client.post("/cv/generate:batch", json=payloads)
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == "application/zip"
+    assert response.headers["content-disposition"] == 'attachment; filename="CVs.zip"'
+    return zipfile.ZipFile(io.BytesIO(response.content))
+
+
+def test_batch_streams_every_pdf_and_a_manifest(cv, client, monkeypatch):
+    monkeypatch.setattr(cv, "_RENDER_WORKERS", 3)   # three renders in flight
+    single = _generate(client).content               # cached before the batch
+
+    archive = _batch(client, [
+        {"cv_content": _CV, "output_filename": "Jane.pdf"},
+        {"cv_content": "[BROKEN]", "output_filename": "Broken.pdf"},
+        *({"cv_content": f"{_CV} {n}", "output_filename": "Role.pdf"} for n in range(3)),
+        {"cv_content": _CV + " other", "output_filename": 'a/"b".pdf'},
+    ])
+    assert archive.testzip() is None
+    names = archive.namelist()
+    assert names[-1] == "manifest.json"
+    assert sorted(names[:-1]) == ["Jane.pdf", "Role-2.pdf", "Role-3.pdf", "Role.pdf", "a_b.pdf"]
+
+    # Entries were written without seeking, i.e. as they were streamed out
+    assert all(info.flag_bits & 0x08 for info in archive.infolist())
+    assert archive.read("Jane.pdf") == single
+    for n, name in enumerate(["Role.pdf", "Role-2.pdf", "Role-3.pdf"]):
+        assert archive.read(name) == cv._renderer.render(cv.generate_body(cv.parse_cv(f"{_CV} {n}")))
+
+    manifest = json.loads(archive.read("manifest.json"))
+    assert [entry["index"] for entry in manifest] == list(range(6))
+    assert [entry["status"] for entry in manifest] == ["ok", "error", "ok", "ok", "ok", "ok"]
+    assert manifest[0]["cache"] == "HIT" and manifest[2]["cache"] == "MISS"
+    assert manifest[1]["filename"] == "Broken.pdf" and "unparseable section" in manifest[1]["detail"]
+
+
+def test_batch_limits(cv, client, monkeypatch):
+    assert client.post("/cv/generate:batch", json=[]).status_code == 422
+    monkeypatch.setattr(cv, "_BATCH_MAX_CVS", 2)
+    too_many = [{"cv_content": _CV}] * 3
+    assert client.post("/cv/generate:batch", json=too_many).status_code == 422
+
+
+# ─── PREVIEW ──────────────────────────────────────────────────────────────────
+
+def _preview(client, cv_content: str = _CV):
+    response = client.post("/cv/preview", json={"cv_content": cv_content, "format": "html"})
+    assert response.status_code == 200, response.text
+    return response, (int(response.headers["x-sections-rebuilt"]), int(response.headers["x-sections-reused"]))
+
+
+def test_preview_rebuilds_only_edited_sections(cv, client, monkeypatch):
+    first, counts = _preview(client)
+    assert counts == (2, 0)
+    assert first.text.startswith("<html><body><section>[SUMMARY]")
+    assert first.headers["cache-control"] == "no-store"
+
+    assert _preview(client)[1] == (0, 2)
+    edited, counts = _preview(client, _CV.replace("Staff", "Principal"))
+    assert counts == (1, 1) and "Principal Engineer" in edited.text
+    assert cv._renderer.renders == 0   # HTML previews never lay out
+
+    # A template or generate_cv change invalidates every fragment
+    monkeypatch.setattr(cv, "_render_fingerprint", lambda: "edited template")
+    assert _preview(client)[1] == (2, 0)
+
+    stats = client.get("/cv/cache").json()["sections"]
+    assert (stats["hits"], stats["misses"]) == (3, 5)
+
+
+def test_preview_parse_error_is_422(cv, client):
+    response = client.post("/cv/preview", json={"cv_content": _CV + "\n\n[BROKEN]", "format": "html"})
+    assert response.status_code == 422
+    assert "unparseable section" in response.json()["detail"]
@@ -0,0 +1,88 @@
+"""
+test_database.py — make_engine's SQLite tuning: pragmas on every connection,
+WAL readers alongside a writer, busy_timeout waits, and the sized pool.
+"""
+
+import threading
+import time
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from api.database import make_engine
+
+
+def _pragma(conn, name: str):
+    return conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = make_engine(tmp_path / "tuned.db", busy_timeout_ms=300, mmap_size_mb=8, cache_size_mb=4,
+                         pool_size=2, max_overflow=1, pool_timeout=0.2)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (n INTEGER)"))
+    yield engine
+    engine.dispose()
+
+
+def test_every_connection_is_tuned(engine):
+    with engine.connect() as first, engine.connect() as second:
+        for conn in (first, second):
+            assert _pragma(conn, "journal_mode").lower() == "wal"
+            assert _pragma(conn, "synchronous") == 1            # NORMAL
+            assert _pragma(conn, "busy_timeout") == 300
+            assert _pragma(conn, "mmap_size") == 8 * 1024 * 1024
+            assert _pragma(conn, "cache_size") == -4 * 1024
+
+
+def test_readers_are_not_blocked_by_a_writer(engine):
+    with engine.connect() as writer, engine.connect() as reader:
+        writer.execute(text("INSERT INTO t VALUES (1)"))   # transaction left open
+        assert reader.execute(text("SELECT count(*) FROM t")).scalar() == 0
+        writer.commit()
+        reader.rollback()
+        assert reader.execute(text("SELECT count(*) FROM t")).scalar() == 1
+
+
+def test_writers_wait_for_the_lock_up_to_busy_timeout(engine):
+    with engine.connect() as holder, engine.connect() as waiter:
+        holder.execute(text("INSERT INTO t VALUES (1)"))
+
+        started = time.monotonic()
+        with pytest.raises(OperationalError, match="locked"):
+            waiter.execute(text("INSERT INTO t VALUES (2)"))
+        assert time.monotonic() - started >= 0.25
+        waiter.rollback()
+
+        # Released within the timeout: the second writer waits, then succeeds
+        threading.Timer(0.1, holder.commit).start()
+        waiter.execute(text("INSERT INTO t VALUES (2)"))
+        waiter.commit()
+        assert waiter.execute(text("SELECT count(*) FROM t")).scalar() == 2
+
+
+def test_pool_is_sized_and_bounded(engine):
+    assert isinstance(engine.pool, QueuePool)
+    assert engine.pool.size() == 2
+
+    connections = [engine.connect() for _ in range(3)]   # pool_size + max_overflow
+    try:
+        with pytest.raises(PoolTimeout):
+            engine.connect()
+    finally:
+        for conn in connections:
+            conn.close()
+    assert engine.pool.checkedin() == 2   # the overflow connection was closed
+
+
+def test_in_memory_database_is_shared():
+    engine = make_engine("sqlite://")
+    assert isinstance(engine.pool, StaticPool)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (n INTEGER)"))
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM t")).scalar() == 0
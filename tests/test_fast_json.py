@@ -0,0 +1,67 @@
+"""
+test_fast_json.py — FAST_JSON_RESPONSES renders the same JSON under its own ETags.
+"""
+
+import json
+
+import pytest
+from sqlalchemy.orm import Session
+
+from api import fast_json
+from api.role_import import import_roles
+from api.routes.roles import router
+
+
+@pytest.fixture
+def client(backend, make_client):
+    with Session(backend) as db:
+        import_roles(db, [
+            {"company": "Acme", "role_title": "Engineer", "interview_probability": 1e-7, "notes": "naïve — ok"},
+            {"company": "Globex", "role_title": "Lead", "interview_probability": 0.25},
+        ])
+    return make_client(router)
+
+
+def _both_paths(client, monkeypatch, path: str) -> dict:
+    responses = {}
+    for encoder, enabled in (("models", False), ("orjson", True)):
+        monkeypatch.setattr(fast_json, "FAST_JSON_RESPONSES", enabled)
+        assert fast_json.encoder() == encoder
+        responses[encoder] = client.get(path)
+        assert responses[encoder].status_code == 200
+    return responses
+
+
+@pytest.mark.parametrize("path", ["/roles", "/roles?include=steps", "/roles/1", "/roles/1/steps"])
+def test_fast_path_same_json_different_etag(client, monkeypatch, path):
+    responses = _both_paths(client, monkeypatch, path)
+
+    assert json.loads(responses["models"].content) == json.loads(responses["orjson"].content)
+    assert responses["models"].headers["etag"] != responses["orjson"].headers["etag"]
+
+
+def test_small_floats_are_formatted_differently(client, monkeypatch):
+    responses = _both_paths(client, monkeypatch, "/roles")
+
+    assert b'"interview_probability":1e-07' in responses["models"].content
+    assert b'"interview_probability":1e-7' in responses["orjson"].content
+    assert json.loads(responses["orjson"].content)[1]["interview_probability"] == 1e-7
+
+
+def test_etag_from_the_other_path_does_not_validate(client, monkeypatch):
+    default = _both_paths(client, monkeypatch, "/roles")["models"]
+
+    fast = client.get("/roles", headers={"If-None-Match": default.headers["etag"]})
+    assert fast.status_code == 200
+    assert b"1e-7" in fast.content and fast.headers["etag"] != default.headers["etag"]
+    assert client.get("/roles", headers={"If-None-Match": fast.headers["etag"]}).status_code == 304
+
+
+def test_stdlib_fallback_has_its_own_etag(client, monkeypatch):
+    orjson_etag = _both_paths(client, monkeypatch, "/roles/1")["orjson"].headers["etag"]
+
+    monkeypatch.setattr(fast_json, "orjson", None)
+    assert fast_json.encoder() == "json"
+    fallback = client.get("/roles/1")
+    assert fallback.headers["etag"] != orjson_etag
+    assert json.loads(fallback.content) == json.loads(client.get("/roles/1").content)
@@ -0,0 +1,67 @@
+"""
+test_migrations.py — Older database files are brought up to the current models.
+
+Builds the schema as an earlier release left it, runs migrate() the way
+init_db() does at startup, and checks the result matches the models.
+"""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import Session
+
+from api.database import Base, make_engine
+from api.migrations import MIGRATIONS, applied_versions, migrate
+from api.models import AnalysisJob, Role
+
+# analysis_jobs as first shipped, before the token-usage columns
+_OLD_ANALYSIS_JOBS = """
+CREATE TABLE analysis_jobs (
+    id          INTEGER PRIMARY KEY,
+    role_id     INTEGER NOT NULL REFERENCES roles (id),
+    status      VARCHAR(20) NOT NULL,
+    result      TEXT,
+    error       TEXT,
+    created_at  DATETIME NOT NULL,
+    started_at  DATETIME,
+    finished_at DATETIME
+)
+"""
+
+
+def test_old_analysis_jobs_table_gains_usage_columns(tmp_path):
+    engine = make_engine(tmp_path / "old.db")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE analysis_jobs"))
+        conn.execute(text(_OLD_ANALYSIS_JOBS))
+        conn.execute(text(
+            "INSERT INTO roles (company, role_title, status, created_at, updated_at) "
+            "VALUES ('Acme', 'Engineer', 'active', '2025-01-01', '2025-01-01')"
+        ))
+        conn.execute(text(
+            "INSERT INTO analysis_jobs (role_id, status, created_at) VALUES (1, 'complete', '2025-01-01')"
+        ))
+
+    applied = migrate(engine, lambda: Base.metadata.create_all(bind=engine))
+
+    assert applied == [migration.version for migration in MIGRATIONS]
+    columns = {column["name"] for column in inspect(engine).get_columns("analysis_jobs")}
+    assert set(AnalysisJob.__table__.c.keys()) <= columns
+
+    with Session(engine) as db:
+        role = db.get(Role, 1)
+        job  = AnalysisJob(role_id=role.id, status="complete", input_tokens=120,
+                           cache_read_tokens=80, iteration_input_tokens=[40, 80])
+        db.add(job)
+        db.commit()
+        assert db.get(AnalysisJob, job.id).iteration_input_tokens == [40, 80]
+        assert db.get(AnalysisJob, 1).input_tokens is None
+    engine.dispose()
+
+
+def test_fresh_database_is_stamped_current(tmp_path):
+    engine = make_engine(tmp_path / "fresh.db")
+    assert migrate(engine, lambda: Base.metadata.create_all(bind=engine)) == []
+    assert applied_versions(engine) == {migration.version for migration in MIGRATIONS}
+    # Running again is a no-op
+    assert migrate(engine, lambda: Base.metadata.create_all(bind=engine)) == []
+    engine.dispose()
@@ -0,0 +1,78 @@
+"""
+test_pdf_cache.py — PDFCache hits, byte-bounded LRU eviction and restarts.
+"""
+
+import os
+
+from api.pdf_cache import PDFCache
+
+
+def _pdf(size: int, fill: bytes = b"x") -> bytes:
+    return b"%PDF" + fill * (size - 4)
+
+
+def test_hits_and_misses_are_counted(tmp_path):
+    cache = PDFCache(tmp_path, 1000)
+    assert cache.get("a") is None
+    cache.put("a", _pdf(100))
+
+    assert cache.get("a") == _pdf(100)
+    assert cache.get("a") == _pdf(100)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (2, 1, 0.6667)
+    assert (stats["entries"], stats["bytes"]) == (1, 100)
+
+
+def test_least_recently_used_is_evicted_by_bytes(tmp_path):
+    cache = PDFCache(tmp_path, 300)
+    for key in "abc":
+        cache.put(key, _pdf(100, key.encode()))
+    cache.get("a")                 # a is now the most recently used
+    cache.put("d", _pdf(100))      # over 300 bytes: b goes
+
+    assert sorted(path.stem for path in tmp_path.glob("*.pdf")) == ["a", "c", "d"]
+    assert cache.get("b") is None
+    assert cache.get("a") == _pdf(100, b"a")
+    assert cache.stats()["evictions"] == 1 and cache.stats()["bytes"] == 300
+
+
+def test_oversized_pdf_is_not_stored(tmp_path):
+    cache = PDFCache(tmp_path, 100)
+    cache.put("big", _pdf(101))
+    assert cache.get("big") is None
+    assert list(tmp_path.glob("*.pdf")) == []
+
+
+def test_recency_survives_a_restart(tmp_path):
+    cache = PDFCache(tmp_path, 1000)
+    cache.put("old", _pdf(100))
+    cache.put("new", _pdf(100))
+    os.utime(tmp_path / "old.pdf", (1_000, 1_000))
+    os.utime(tmp_path / "new.pdf", (2_000, 2_000))
+    cache.get("old")               # touched: now newer on disk than "new"
+
+    restarted = PDFCache(tmp_path, 100)   # room for one — the least recent goes
+    assert restarted.get("new") is None
+    assert restarted.get("old") == _pdf(100)
+    assert restarted.stats()["evictions"] == 1
+
+
+def test_file_removed_behind_its_back_is_a_miss(tmp_path):
+    cache = PDFCache(tmp_path, 1000)
+    cache.put("a", _pdf(100))
+    (tmp_path / "a.pdf").unlink()
+
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["bytes"]) == (0, 1, 0, 0)
+
+
+def test_open_file_outlives_its_eviction(tmp_path):
+    cache = PDFCache(tmp_path, 100)
+    cache.put("a", _pdf(100, b"a"))
+    handle = cache.open("a")
+    cache.put("b", _pdf(100, b"b"))    # evicts and unlinks a
+
+    with handle:
+        assert handle.read() == _pdf(100, b"a")
+    assert not (tmp_path / "a.pdf").exists()
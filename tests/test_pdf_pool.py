@@ -0,0 +1,71 @@
+"""
+test_pdf_pool.py — RenderPool capacity, timeouts and recovery.
+
+Workers run a stub renderer that sleeps for the number of seconds in the
+body, so no WeasyPrint (or Pango) is needed.
+"""
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from api import pdf_pool
+from api.pdf_pool import PoolFull, RenderPool
+
+
+class _SleepyRenderer:
+    def render(self, body: str) -> bytes:
+        time.sleep(float(body))
+        return b"%PDF-" + body.encode()
+
+
+def _init_sleepy() -> None:
+    pdf_pool._worker_renderer = _SleepyRenderer()
+
+
+class _SleepyPool(RenderPool):
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_sleepy,
+        )
+
+
+@pytest.fixture
+def pool():
+    pool = _SleepyPool(Path("unused.html"), workers=1, max_queued=0, timeout=1.0)
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+def test_full_pool_raises(pool):
+    busy = threading.Thread(target=pool.render, args=("0.5",))
+    busy.start()
+    time.sleep(0.1)
+    with pytest.raises(PoolFull):
+        pool.render("0")
+    busy.join()
+    assert pool.render("0") == b"%PDF-0"
+
+
+def test_timed_out_render_frees_its_worker_and_slot(pool):
+    for _ in range(3):   # more hangs than the pool has slots
+        stuck = pool._executor
+        processes = list(stuck._processes.values())
+        started = time.monotonic()
+        with pytest.raises(TimeoutError):
+            pool.render("60")
+        assert time.monotonic() - started < 5
+
+        for process in processes:
+            process.join(timeout=5)
+            assert not process.is_alive()
+        assert pool._executor is not stuck
+
+    assert pool.render("0") == b"%PDF-0"
@@ -0,0 +1,138 @@
+"""
+PDFRenderer output against a plain WeasyPrint render of the same document,
+and its template / font-configuration handling.
+
+The render comparisons are skipped when WeasyPrint or its native libraries
+(Pango) aren't available; the rest run on a stand-in weasyprint module.
+"""
+
+import os
+import sys
+import threading
+from types import ModuleType
+
+import pytest
+
+try:
+    from weasyprint import HTML
+except (ImportError, OSError):   # not installed, or Pango missing
+    HTML = None
+
+from api.pdf_render import PDFRenderer
+
+needs_weasyprint = pytest.mark.skipif(HTML is None, reason="WeasyPrint is not available")
+
+_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8">
+<style>
+  @page { size: A5; margin: 12mm; }
+  body  { font-family: sans-serif; font-size: 11pt; }
+  .name { color: red; font-size: 20pt; margin-bottom: 4mm; }
+  .note { color: green !important; }
+</style>
+</head><body>{{BODY}}</body></html>
+"""
+
+# Author styles in the body — they only win over the template if the
+# template's CSS is still author-origin and earlier in the document
+_BODY = """
+<style>.name { color: blue; }</style>
+<p class="name">Jane Doe</p>
+<p class="note" style="color: black">Always green</p>
+<p style="font-size: 8pt">Small print</p>
+""" + "<p>Filler paragraph to push onto a second page.</p>" * 60
+
+
+def _boxes(document) -> list[tuple]:
+    """Every laid-out box on every page: kind, tag, geometry and the styles under test."""
+    flat = []
+
+    def walk(box):
+        flat.append((
+            type(box).__name__, box.element_tag,
+            round(box.position_x, 2), round(box.position_y, 2),
+            round(box.width, 2), round(box.height, 2),
+            str(box.style["color"]), box.style["font_size"],
+        ))
+        for child in getattr(box, "children", ()):
+            walk(child)
+
+    for page in document.pages:
+        walk(page._page_box)
+    return flat
+
+
+def _baseline(template_path, body: str):
+    html = template_path.read_text(encoding="utf-8").replace("{{BODY}}", body)
+    return HTML(string=html, base_url=str(template_path.parent)).render()
+
+
+@needs_weasyprint
+def test_render_matches_a_plain_weasyprint_render(tmp_path):
+    template = tmp_path / "CV_template.html"
+    template.write_text(_TEMPLATE, encoding="utf-8")
+    renderer = PDFRenderer(template)
+    renderer.warm()
+
+    expected = _boxes(_baseline(template, _BODY))
+    assert len(renderer.layout(_BODY).pages) == 2
+    assert _boxes(renderer.layout(_BODY)) == expected
+    assert _boxes(renderer.layout(_BODY)) == expected   # warm, second time round
+    assert renderer.render(_BODY).startswith(b"%PDF")
+
+
+@needs_weasyprint
+def test_template_change_is_picked_up(tmp_path):
+    template = tmp_path / "CV_template.html"
+    template.write_text(_TEMPLATE, encoding="utf-8")
+    renderer = PDFRenderer(template)
+    renderer.layout(_BODY)
+
+    template.write_text(_TEMPLATE.replace("size: A5", "size: A4"), encoding="utf-8")
+    stat = template.stat()
+    os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert _boxes(renderer.layout(_BODY)) == _boxes(_baseline(template, _BODY))
+
+
+def _template(tmp_path):
+    template = tmp_path / "CV_template.html"
+    template.write_text(_TEMPLATE, encoding="utf-8")
+    return template
+
+
+def test_html_preview_does_not_import_weasyprint(tmp_path, monkeypatch):
+    for name in ("weasyprint", "weasyprint.text", "weasyprint.text.fonts"):
+        monkeypatch.setitem(sys.modules, name, None)   # any import now raises ImportError
+
+    html = PDFRenderer(_template(tmp_path)).render_html("<p>Jane</p>")
+    assert "<p>Jane</p>" in html and "size: A5" in html
+
+
+def test_each_thread_gets_its_own_font_configuration(tmp_path, monkeypatch):
+    class FontConfiguration:
+        pass
+
+    fonts = ModuleType("weasyprint.text.fonts")
+    fonts.FontConfiguration = FontConfiguration
+    for name, module in (("weasyprint", ModuleType("weasyprint")),
+                         ("weasyprint.text", ModuleType("weasyprint.text")),
+                         ("weasyprint.text.fonts", fonts)):
+        monkeypatch.setitem(sys.modules, name, module)
+
+    template = _template(tmp_path)
+    renderer = PDFRenderer(template)
+    _, mtime = renderer._current()
+    mine     = renderer._font_config(mtime)
+    assert renderer._font_config(mtime) is mine   # warm on the same thread
+
+    theirs = []
+    worker = threading.Thread(target=lambda: theirs.append(renderer._font_config(mtime)))
+    worker.start()
+    worker.join()
+    assert isinstance(theirs[0], FontConfiguration) and theirs[0] is not mine
+
+    stat = template.stat()
+    os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    _, changed = renderer._current()
+    assert renderer._font_config(changed) is not mine   # template changed: fonts start afresh
@@ -0,0 +1,102 @@
+"""
+test_query_plans.py — The hot roles/steps queries use their indexes.
+
+Builds the exact statements behind update_step, the bulk step lookup and
+GET /roles (unfiltered, filtered, and past a cursor) and runs EXPLAIN QUERY
+PLAN on a migrated SQLite database — both one created fresh and one brought
+up from a schema without the listing indexes. Each statement must search
+the named index; none may scan roles or steps or sort in a temp B-tree.
+The one exception is the unfiltered first page, whose plan is a walk of
+ix_roles_created_at_id that LIMIT stops early.
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from api.database import Base, make_engine
+from api.migrations import migrate
+from api.models import Step
+from api.role_import import import_roles
+from api.routes.roles import role_page_query, step_lookup_query
+
+_CURSOR = (datetime(2030, 1, 1), 10_000)
+
+# Indexes the migrations create; the "upgraded" database starts without them
+_MIGRATED_INDEXES = (
+    "ix_roles_created_at_id", "ix_roles_status_created_at_id", "ix_roles_go_no_go_created_at_id",
+    "ix_roles_company_key_created_at_id", "uq_steps_role_id_step_number",
+)
+
+
+# The plan each statement must start with. The unfiltered first page is the
+# one allowed SCAN: an ordered walk of its index that LIMIT stops early.
+_EXPECTED = {
+    "update_step lookup":          "SEARCH steps USING INDEX uq_steps_role_id_step_number (",
+    # Either role_id-leading steps index serves the (role_id, step_number) IN list
+    "bulk step lookup":            ("SEARCH steps USING INDEX ix_steps_role_id (",
+                                    "SEARCH steps USING INDEX uq_steps_role_id_step_number ("),
+    "list roles":                  "SCAN roles USING INDEX ix_roles_created_at_id",
+    "list roles, cursor":          "SEARCH roles USING INDEX ix_roles_created_at_id (",
+    "list roles, status":          "SEARCH roles USING INDEX ix_roles_status_created_at_id (",
+    "list roles, status + cursor": "SEARCH roles USING INDEX ix_roles_status_created_at_id (",
+    "list roles, go_no_go":        "SEARCH roles USING INDEX ix_roles_go_no_go_created_at_id (",
+    "list roles, company":         "SEARCH roles USING INDEX ix_roles_company_key_created_at_id (",
+    "list steps for role":         "SEARCH steps USING INDEX uq_steps_role_id_step_number (",
+}
+
+
+def _list_query(db: Session, **filters):
+    return role_page_query(db, **filters).statement
+
+
+def _statements(db: Session) -> dict:
+    return {
+        "update_step lookup":          select(Step).where(Step.role_id == 1, Step.step_number == 3),
+        "bulk step lookup":            step_lookup_query(db, [(1, 0), (2, 3)]).statement,
+        "list roles":                  _list_query(db),
+        "list roles, cursor":          _list_query(db, cursor=_CURSOR),
+        "list roles, status":          _list_query(db, statuses=["active"]),
+        "list roles, status + cursor": _list_query(db, statuses=["active"], cursor=_CURSOR),
+        "list roles, go_no_go":        _list_query(db, go_no_go="go"),
+        "list roles, company":         _list_query(db, company="acme"),
+        "list steps for role":         select(Step).where(Step.role_id == 1).order_by(Step.step_number),
+    }
+
+
+@pytest.fixture(scope="module", params=["fresh", "upgraded"])
+def db(request, tmp_path_factory):
+    engine = make_engine(tmp_path_factory.mktemp(request.param) / "plans.db")
+    if request.param == "fresh":
+        migrate(engine, lambda: Base.metadata.create_all(bind=engine))
+    else:
+        # Tables as a release from before api/migrations.py left them
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            for name in _MIGRATED_INDEXES:
+                conn.execute(text(f"DROP INDEX {name}"))
+        assert migrate(engine, lambda: None)
+
+    with Session(engine) as session:
+        import_roles(session, [
+            {"company": f"Company {i % 300}", "role_title": f"Role {i}",
+             "status": ("active", "submitted", "rejected")[i % 3], "go_no_go": "go"}
+            for i in range(3000)
+        ])
+        session.execute(text("ANALYZE"))
+        yield session
+    engine.dispose()
+
+
+@pytest.mark.parametrize("name", list(_EXPECTED))
+def test_query_uses_its_index(db, name):
+    statement = _statements(db)[name]
+    sql  = str(statement.compile(db.get_bind(), compile_kwargs={"literal_binds": True}))
+    plan = [row[-1] for row in db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+    assert plan[0].startswith(_EXPECTED[name]), plan
+    scans = [line for line in plan if line.startswith(("SCAN roles", "SCAN steps"))]
+    assert scans == ([plan[0]] if name == "list roles" else []), plan
+    assert not any("TEMP B-TREE" in line for line in plan), plan
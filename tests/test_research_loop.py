@@ -0,0 +1,137 @@
+"""
+test_research_loop.py — History compaction and the per-request input ceiling.
+
+A stub client plays a research loop where every turn brings back a large
+web-search result. It reports each request's input tokens as chars / 3,
+so the loop's chars-based estimate has to calibrate from measured usage.
+"""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+from anthropic.types import ServerToolUseBlock, TextBlock, WebSearchResultBlock, WebSearchToolResultBlock
+
+from api import research_store
+from api.database import SessionLocal
+from api.routes import analyze
+
+_RESULT_CHARS = 30_000   # encrypted page content per search, ~10k tokens at chars / 3
+
+
+def _search_turn(n: int) -> list:
+    return [
+        ServerToolUseBlock(id=f"srvtoolu_{n}", name="web_search", input={"query": f"query {n}"},
+                           type="server_tool_use"),
+        WebSearchToolResultBlock(
+            tool_use_id=f"srvtoolu_{n}", type="web_search_tool_result",
+            content=[WebSearchResultBlock(encrypted_content="x" * _RESULT_CHARS, title=f"Result {n}",
+                                          url=f"https://example.com/{n}", type="web_search_result")],
+        ),
+    ]
+
+
+class _StubMessages:
+    """Searches for `turns` requests, then answers; records each request's input tokens."""
+
+    def __init__(self, turns: int) -> None:
+        self.turns = turns
+        self.sent: list[int] = []
+
+    def create(self, **request):
+        tokens = analyze._request_chars(request["system"], request["messages"]) // 3
+        self.sent.append(tokens)
+        final   = len(self.sent) > self.turns
+        content = [TextBlock(text="{}", type="text")] if final else _search_turn(len(self.sent))
+        return SimpleNamespace(
+            stop_reason="end_turn" if final else "tool_use",
+            content=content,
+            usage=SimpleNamespace(input_tokens=tokens, output_tokens=10,
+                                  cache_read_input_tokens=0, cache_creation_input_tokens=0),
+        )
+
+
+def _run(turns: int):
+    messages = _StubMessages(turns)
+    usage    = analyze._new_usage()
+    analyze._run_research_loop(
+        SimpleNamespace(messages=messages), analyze._RESEARCH_SYSTEM, "Research Acme", usage=usage,
+    )
+    return messages.sent, usage
+
+
+def test_requests_stay_under_the_ceiling(monkeypatch):
+    monkeypatch.setattr(analyze, "_COMPACT_KEEP_TURNS", 2)
+    monkeypatch.setattr(analyze, "_INPUT_TOKEN_CEILING", 15_000)
+
+    sent, usage = _run(turns=8)
+
+    # Two uncompacted turns would be ~20k tokens: every earlier turn is
+    # compacted before that request goes out, not after it was billed
+    assert len(sent) == 9
+    assert max(sent) < 15_000
+    assert usage["iteration_input_tokens"] == sent
+
+
+def test_history_kept_when_under_the_ceiling(monkeypatch):
+    monkeypatch.setattr(analyze, "_COMPACT_KEEP_TURNS", 2)
+    monkeypatch.setattr(analyze, "_INPUT_TOKEN_CEILING", 100_000)
+
+    sent, _ = _run(turns=6)
+
+    # The last two turns keep their results (~20k tokens); older ones are digests
+    assert sent[-1] > 2 * _RESULT_CHARS // 3
+    assert sent[-1] < 3 * _RESULT_CHARS // 3
+
+
+def test_request_over_the_ceiling_is_never_sent(monkeypatch):
+    monkeypatch.setattr(analyze, "_INPUT_TOKEN_CEILING", 50)
+    messages = _StubMessages(turns=0)
+
+    with pytest.raises(ValueError, match="over the ceiling"):
+        analyze._run_research_loop(SimpleNamespace(messages=messages), analyze._RESEARCH_SYSTEM, "Research Acme")
+    assert messages.sent == []
+
+
+def test_async_loop_checks_the_ceiling_before_sending(monkeypatch):
+    monkeypatch.setattr(analyze, "_INPUT_TOKEN_CEILING", 50)
+    streams = []
+    client  = SimpleNamespace(messages=SimpleNamespace(stream=lambda **request: streams.append(request)))
+
+    async def consume():
+        async for _ in analyze._research_events(client, analyze._RESEARCH_SYSTEM, "Research Acme"):
+            pass
+
+    with pytest.raises(ValueError, match="over the ceiling"):
+        asyncio.run(consume())
+    assert streams == []
+
+
+def test_synthesis_over_the_ceiling_is_never_sent(app_db, monkeypatch):
+    monkeypatch.setattr(analyze, "_INPUT_TOKEN_CEILING", 10_000)
+    notes = {category: {"notes": "x" * 20_000, "sources": []} for category in research_store.CATEGORIES}
+    sent  = []
+
+    def create(**request):
+        sent.append(request)
+        return SimpleNamespace(
+            stop_reason="end_turn",
+            content=[TextBlock(text=json.dumps(notes), type="text")],
+            usage=SimpleNamespace(input_tokens=1_000, output_tokens=10,
+                                  cache_read_input_tokens=0, cache_creation_input_tokens=0),
+        )
+
+    db = SessionLocal()
+    try:
+        with pytest.raises(RuntimeError, match="Synthesis failed.*over the ceiling"):
+            analyze._analyze(
+                SimpleNamespace(messages=SimpleNamespace(create=create)), db,
+                f"Acme {time.monotonic_ns()}", "Engineer", "identity", "profile", reuse_research=False,
+            )
+    finally:
+        db.close()
+
+    # Only the research request went out; the oversized synthesis was refused
+    assert len(sent) == 1 and sent[0]["tools"]
@@ -0,0 +1,124 @@
+"""
+test_research_store.py — Company research notes shared across roles.
+
+Drives analyze._analyze with a stub client that answers research requests
+(tools sent) with notes for the categories asked for, and synthesis requests
+with a brief, so reuse shows up as research calls that never happen.
+"""
+
+import json
+import re
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import update
+
+from api import research_store
+from api.models import CompanyResearch
+from api.routes import analyze
+
+_BRIEF = {
+    "company_briefing":      "Builds payments infrastructure.",
+    "founder_profile":       "Second-time founder.",
+    "recent_signals":        ["Launched an API"],
+    "positioning_angle":     "Lead with platform work.",
+    "language_to_mirror":    ["developer-first"],
+    "proof_points":          ["Scaled the billing platform"],
+    "go_no_go":              "go",
+    "interview_probability": 70,
+}
+
+
+class _StubMessages:
+    """Records the categories each research request asked for."""
+
+    def __init__(self) -> None:
+        self.researched: list[list[str]] = []
+        self.syntheses = 0
+
+    def create(self, **request):
+        if request.get("tools"):
+            categories = re.findall(r"^- (\w+):", request["messages"][0]["content"], re.M)
+            self.researched.append(categories)
+            text = json.dumps({c: {"notes": f"{c} notes {len(self.researched)}", "sources": []}
+                               for c in categories})
+        else:
+            self.syntheses += 1
+            text = json.dumps(_BRIEF)
+        return SimpleNamespace(
+            stop_reason="end_turn",
+            content=[SimpleNamespace(type="text", text=text)],
+            usage=SimpleNamespace(input_tokens=100, output_tokens=50,
+                                  cache_read_input_tokens=0, cache_creation_input_tokens=0),
+        )
+
+
+@pytest.fixture
+def analyse(sessions):
+    messages = _StubMessages()
+
+    def run(company: str, role_title: str = "Engineer", **options):
+        with sessions() as db:
+            analyze._analyze(SimpleNamespace(messages=messages), db, company, role_title,
+                             "identity", "profile", **options)
+        return messages
+
+    return run
+
+
+def _age(sessions, company: str, category: str, days: float) -> None:
+    with sessions() as db:
+        db.execute(
+            update(CompanyResearch)
+            .where(CompanyResearch.company_key == research_store.company_key(company),
+                   CompanyResearch.category == category)
+            .values(researched_at=datetime.utcnow() - timedelta(days=days))
+        )
+        db.commit()
+
+
+def test_second_role_at_a_company_skips_research(analyse):
+    messages = analyse("Acme Inc", "Backend Engineer")
+    assert messages.researched == [list(research_store.CATEGORIES)]
+
+    analyse("  acme   INC ", "Data Engineer")   # same company, spelled differently
+    assert len(messages.researched) == 1
+    assert messages.syntheses == 2
+
+    analyse("Globex")
+    assert len(messages.researched) == 2
+
+
+def test_only_stale_categories_are_researched_again(analyse, sessions):
+    analyse("Acme")
+    _age(sessions, "Acme", "signals", days=8)     # stale after 7 days
+    _age(sessions, "Acme", "founders", days=8)    # still fresh (90 days)
+
+    messages = analyse("Acme")
+    assert messages.researched[-1] == ["signals"]
+
+    with sessions() as db:
+        notes = research_store.load_fresh(db, "Acme")
+    assert set(notes) == set(research_store.CATEGORIES)
+    assert notes["signals"]["notes"] == "signals notes 2"
+    assert notes["founders"]["notes"] == "founders notes 1"
+
+
+def test_refresh_researches_everything_and_replaces_rows(analyse, sessions):
+    analyse("Acme")
+    messages = analyse("Acme", reuse_research=False)
+    assert messages.researched == [list(research_store.CATEGORIES)] * 2
+
+    with sessions() as db:
+        rows = db.query(CompanyResearch).all()
+    assert len(rows) == len(research_store.CATEGORIES)
+    assert {row.notes for row in rows} == {f"{c} notes 2" for c in research_store.CATEGORIES}
+
+
+def test_notes_are_looked_up_by_normalised_company(sessions):
+    with sessions() as db:
+        research_store.save(db, "Acme", {"company": {"notes": "Payments", "sources": ["https://acme.test"]}})
+        notes = research_store.load_fresh(db, "ACME")
+    assert list(notes) == ["company"]
+    assert notes["company"]["sources"] == ["https://acme.test"]
@@ -0,0 +1,108 @@
+"""
+test_response_cache.py — Conditional GETs and the JSON body cache on role reads.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from api.models import Role
+from api.response_cache import cache
+from api.routes.roles import router
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(router)
+
+
+def _create(client, company: str = "Acme") -> int:
+    response = client.post("/roles", json={"company": company, "role_title": "Engineer"})
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def _age(sessions, role_id: int, minutes: int = 5) -> datetime:
+    """Move the role's updated_at back, so its Last-Modified second is over; returns it."""
+    moment = datetime.utcnow().replace(microsecond=250_000) - timedelta(minutes=minutes)
+    with sessions() as db:
+        db.execute(update(Role).where(Role.id == role_id).values(updated_at=moment))
+        db.commit()
+    return moment
+
+
+def _http_date(moment: datetime) -> str:
+    return moment.strftime("%a, %d %b %Y %H:%M:%S GMT")
+
+
+def test_if_none_match_gets_304(client):
+    role_id = _create(client)
+    first = client.get(f"/roles/{role_id}")
+    assert first.status_code == 200 and first.headers["x-cache"] == "MISS"
+
+    revalidated = client.get(f"/roles/{role_id}", headers={"If-None-Match": first.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == first.headers["etag"]
+
+    other = client.get(f"/roles/{role_id}", headers={"If-None-Match": '"something-else"'})
+    assert other.status_code == 200 and other.headers["x-cache"] == "HIT"
+    assert other.json() == first.json()
+
+
+def test_if_modified_since(client, sessions):
+    role_id = _create(client)
+    updated_at = _age(sessions, role_id)
+
+    response = client.get(f"/roles/{role_id}")
+    assert response.headers["last-modified"] == _http_date(updated_at)
+
+    unchanged = client.get(f"/roles/{role_id}", headers={"If-Modified-Since": response.headers["last-modified"]})
+    assert unchanged.status_code == 304
+
+    earlier = _http_date(updated_at - timedelta(seconds=1))
+    assert client.get(f"/roles/{role_id}", headers={"If-Modified-Since": earlier}).status_code == 200
+
+    # If-None-Match decides alone when both are sent
+    both = client.get(f"/roles/{role_id}", headers={
+        "If-None-Match":     '"something-else"',
+        "If-Modified-Since": response.headers["last-modified"],
+    })
+    assert both.status_code == 200
+
+
+def test_same_second_write_is_not_a_304(client):
+    # Start early in a second so the whole exchange happens within it
+    time.sleep(1.02 - datetime.utcnow().microsecond / 1e6)
+    role_id = _create(client)
+    first = client.get(f"/roles/{role_id}")
+    assert "last-modified" not in first.headers   # its second isn't over yet
+
+    assert client.patch(f"/roles/{role_id}", json={"notes": "same second"}).status_code == 200
+    now = _http_date(datetime.utcnow())
+    response = client.get(f"/roles/{role_id}", headers={"If-Modified-Since": now})
+    assert response.status_code == 200
+    assert response.json()["notes"] == "same second"
+
+
+def test_writes_invalidate_cached_bodies(client):
+    role_id, other_id = _create(client, "Acme"), _create(client, "Globex")
+    for path in (f"/roles/{role_id}", f"/roles/{role_id}/steps", f"/roles/{other_id}", "/roles"):
+        client.get(path)
+        assert client.get(path).headers["x-cache"] == "HIT"
+    listed = client.get("/roles")
+
+    assert client.patch(f"/roles/{role_id}/steps/1", json={"status": "complete"}).status_code == 200
+    assert not any(key in cache._entries for key in (f"role:{role_id}", f"steps:{role_id}"))
+    assert not any(key.startswith("list:") for key in cache._entries)
+    assert f"role:{other_id}" in cache._entries
+
+    steps = client.get(f"/roles/{role_id}/steps")
+    assert steps.headers["x-cache"] == "MISS"
+    assert next(step for step in steps.json() if step["step_number"] == 1)["status"] == "complete"
+    assert client.get(f"/roles/{other_id}").headers["x-cache"] == "HIT"
+
+    relisted = client.get("/roles", headers={"If-None-Match": listed.headers["etag"]})
+    assert relisted.status_code == 200 and relisted.headers["x-cache"] == "MISS"
@@ -0,0 +1,76 @@
+"""
+test_role_filters.py — GET /roles filters, alone and combined with paging.
+"""
+
+import pytest
+
+from api.routes.roles import router
+
+
+@pytest.fixture
+def client(backend, make_client):
+    return make_client(router)
+
+
+def _create(client, company: str, **values) -> int:
+    response = client.post("/roles", json={"company": company, "role_title": "Engineer", **values})
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def _ids(client, **params) -> set[int]:
+    response = client.get("/roles", params=params)
+    assert response.status_code == 200, response.text
+    return {role["id"] for role in response.json()}
+
+
+def test_company_is_exact_ignoring_case_and_spacing(client):
+    acme = _create(client, "Acme  Inc")
+    _create(client, "Acme Incorporated")
+    assert _ids(client, company="acme inc") == {acme}
+    assert _ids(client, company=" ACME   INC ") == {acme}
+
+
+def test_company_contains_matches_wildcards_literally(client):
+    percent    = _create(client, "100% Remote")
+    underscore = _create(client, "data_co")
+    backslash  = _create(client, "Back\\slash Ltd")
+    _create(client, "1000 Remote")
+    _create(client, "dataxco")
+    _create(client, "Backslash Ltd")
+
+    assert _ids(client, company_contains="0% r") == {percent}
+    assert _ids(client, company_contains="A_C") == {underscore}
+    assert _ids(client, company_contains="k\\s") == {backslash}
+    assert _ids(client, company_contains="%") == {percent}
+    assert _ids(client, company_contains="_") == {underscore}
+    assert len(_ids(client, company_contains="co")) == 2   # plain substrings still match
+
+
+def test_status_go_no_go_and_probability(client):
+    strong  = _create(client, "Acme",    status="active",    go_no_go="go",    interview_probability=0.8)
+    weak    = _create(client, "Globex",  status="active",    go_no_go="no_go", interview_probability=0.2)
+    applied = _create(client, "Initech", status="submitted", go_no_go="go",    interview_probability=0.5)
+
+    assert _ids(client, status="active") == {strong, weak}
+    assert _ids(client, status=["active", "submitted"]) == {strong, weak, applied}
+    assert _ids(client, go_no_go="go") == {strong, applied}
+    assert _ids(client, min_probability=0.5) == {strong, applied}
+    assert _ids(client, max_probability=0.5) == {weak, applied}
+    assert _ids(client, go_no_go="go", max_probability=0.6) == {applied}
+    assert client.get("/roles", params={"min_probability": 1.5}).status_code == 422
+
+
+def test_filters_hold_across_pages(client):
+    matching = {_create(client, f"Fin_{n}") for n in range(5)}
+    for n in range(5):
+        _create(client, f"Finx{n}")
+
+    seen, params = set(), {"company_contains": "fin_", "limit": 2}
+    while True:
+        response = client.get("/roles", params=params)
+        seen |= {role["id"] for role in response.json()}
+        if "x-next-cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["x-next-cursor"]
+    assert seen == matching
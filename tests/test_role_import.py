@@ -0,0 +1,71 @@
+"""
+test_role_import.py — Bulk role import: id mapping and per-row failures.
+"""
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from api.models import Role, Step, PIPELINE_STEPS
+from api.role_import import import_roles
+
+
+def _role(i: int, **values) -> dict:
+    return {"company": f"Company {i}", "role_title": f"Engineer {i}", **values}
+
+
+def test_role_ids_follow_input_order(backend):
+    statements = []
+    event.listen(backend, "before_cursor_execute",
+                 lambda conn, cursor, sql, *args: statements.append(sql))
+
+    with Session(backend) as db:
+        result = import_roles(db, [_role(i) for i in range(25)], chunk_size=10)
+        companies = dict(db.query(Role.id, Role.company))
+        step_counts = [db.query(Step).filter(Step.role_id == role_id).count() for role_id in result.role_ids]
+
+    assert result.created == 25 and result.failed == 0
+    assert [companies[role_id] for role_id in result.role_ids] == [f"Company {i}" for i in range(25)]
+    assert step_counts == [len(PIPELINE_STEPS)] * 25
+    assert sum(sql.startswith("INSERT INTO roles") for sql in statements) == 3   # one per chunk
+
+
+def test_null_status_takes_the_column_default(backend):
+    with Session(backend) as db:
+        result = import_roles(db, [_role(0, status=None), _role(1, status="offer")])
+        statuses = [db.get(Role, role_id).status for role_id in result.role_ids]
+
+    assert result.failed == 0
+    assert statuses == ["active", "offer"]
+
+
+def test_column_constraint_violation_fails_only_that_row(backend):
+    records = [_role(0), _role(1, company="x" * 201), _role(2, go_no_go="definitely-not"), _role(3)]
+    with Session(backend) as db:
+        result = import_roles(db, records)
+        companies = [db.get(Role, role_id).company for role_id in result.role_ids]
+
+    assert companies == ["Company 0", "Company 3"]
+    assert [(error.index, error.errors) for error in result.errors] == [
+        (1, ["company: at most 200 characters"]),
+        (2, ["go_no_go: at most 10 characters"]),
+    ]
+
+
+def test_row_rejected_by_the_database_fails_alone(backend):
+    with backend.begin() as conn:
+        if backend.dialect.name == "sqlite":
+            conn.execute(text(
+                "CREATE TRIGGER reject_boom BEFORE INSERT ON roles WHEN NEW.company = 'Boom' "
+                "BEGIN SELECT RAISE(ABORT, 'boom rejected'); END"
+            ))
+        else:
+            conn.execute(text("ALTER TABLE roles ADD CONSTRAINT boom_rejected CHECK (company <> 'Boom')"))
+
+    records = [_role(0), _role(1, company="Boom"), _role(2)]
+    with Session(backend) as db:
+        result = import_roles(db, records)
+        companies = [db.get(Role, role_id).company for role_id in result.role_ids]
+
+    assert companies == ["Company 0", "Company 2"]
+    assert [error.index for error in result.errors] == [1]
+    assert "boom" in result.errors[0].errors[0]
@@ -0,0 +1,84 @@
+"""
+test_roles_queries.py — Every roles endpoint runs a fixed number of statements.
+
+Each endpoint is measured with count_queries() on a small table and again
+after it has grown forty-fold; the counts must not move (no N+1), and on
+SQLite they are pinned exactly. The response cache is cleared before each
+request so reads render in full.
+"""
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from api.database import count_queries
+from api.models import Role
+from api.response_cache import cache
+from api.role_import import import_roles
+from api.routes.roles import bulk_router, router
+
+_PINNED = {
+    "create":        7,
+    "bulk import":   5,
+    "list":          2,
+    "list + steps":  3,
+    "get":           3,
+    "steps":         2,
+    "patch role":    6,
+    "patch step":    8,
+    "bulk steps":    9,
+    "steps:batch":   7,
+    "delete":        8,
+}
+
+
+def _seed(engine, count: int) -> list[int]:
+    with Session(engine) as db:
+        start  = db.execute(select(func.count(Role.id))).scalar()
+        result = import_roles(db, [
+            {"company": f"Company {start + i}", "role_title": "Engineer", "status": "active"}
+            for i in range(count)
+        ])
+    return result.role_ids
+
+
+def _counts(client, engine, ids: list[int]) -> dict:
+    first, second, third, fourth, fifth = ids[:5]
+    requests = {
+        "create":       lambda: client.post("/roles", json={"company": "New", "role_title": "Lead"}),
+        "bulk import":  lambda: client.post("/roles:bulk", json=[
+            {"company": f"Bulk {n}", "role_title": "Lead"} for n in range(3)
+        ]),
+        "list":         lambda: client.get("/roles"),
+        "list + steps": lambda: client.get("/roles", params={"include": "steps"}),
+        "get":          lambda: client.get(f"/roles/{first}"),
+        "steps":        lambda: client.get(f"/roles/{first}/steps"),
+        "patch role":   lambda: client.patch(f"/roles/{first}", json={"status": "submitted"}),
+        "patch step":   lambda: client.patch(f"/roles/{first}/steps/1", json={"status": "complete"}),
+        "bulk steps":   lambda: client.patch(f"/roles/{second}/steps", json=[
+            {"step_number": 1, "status": "complete"}, {"step_number": 2, "status": "in_progress"},
+        ]),
+        "steps:batch":  lambda: client.patch("/roles/steps:batch", json=[
+            {"role_id": third, "step_number": 1, "status": "complete"},
+            {"role_id": fourth, "step_number": 2, "status": "complete"},
+        ]),
+        "delete":       lambda: client.delete(f"/roles/{fifth}"),
+    }
+    counts = {}
+    for name, send in requests.items():
+        cache.clear()
+        with count_queries(engine) as log:
+            response = send()
+        assert response.status_code < 300, (name, response.text)
+        counts[name] = log.count
+    return counts
+
+
+def test_statement_counts_do_not_grow_with_data(backend, make_client):
+    client = make_client(bulk_router, router)
+
+    small = _counts(client, backend, _seed(backend, 5))
+    large = _counts(client, backend, _seed(backend, 200))
+
+    assert small == large
+    if backend.dialect.name == "sqlite":
+        assert small == _PINNED
@@ -0,0 +1,90 @@
+"""
+test_search.py — GET /search: matching, ranking, paging and escaped highlights.
+
+FTS5 is SQLite-only, so every case is skipped on other backends.
+"""
+
+import json
+
+import pytest
+
+from api.models import AnalysisJob
+from api.routes.roles import router as roles_router
+from api.routes.search import router as search_router
+
+
+@pytest.fixture
+def client(backend, make_client):
+    if backend.dialect.name != "sqlite":
+        pytest.skip("full-text search needs SQLite (FTS5)")
+    return make_client(search_router, roles_router)
+
+
+def _create(client, company: str, role_title: str = "Engineer", **values) -> int:
+    response = client.post("/roles", json={"company": company, "role_title": role_title, **values})
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def _search(client, q: str, **params) -> dict:
+    response = client.get("/search", params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_company_and_title_rank_above_notes(client):
+    in_notes   = _create(client, "Initech", notes="Moving into payments next year")
+    in_company = _create(client, "Payments Corp")
+    in_title   = _create(client, "Globex", role_title="Payments Engineer")
+    _create(client, "Hooli", notes="Search and ads")
+
+    hits = _search(client, "payments")["results"]
+    assert [hit["role_id"] for hit in hits] == [in_company, in_title, in_notes]
+    assert hits[0]["company_highlight"] == "<mark>Payments</mark> Corp"
+    assert hits[1]["role_title_highlight"] == "<mark>Payments</mark> Engineer"
+
+
+def test_highlights_escape_the_indexed_text(client):
+    role_id = _create(
+        client, "<b>Fin</b> & Co", role_title='Engineer "<i>"',
+        notes="<script>alert(1)</script> builds fintech & payments",
+    )
+
+    (hit,) = _search(client, "fintech")["results"]
+    assert hit["role_id"] == role_id
+    assert hit["company_highlight"] == "&lt;b&gt;Fin&lt;/b&gt; &amp; Co"
+    assert hit["role_title_highlight"] == "Engineer &quot;&lt;i&gt;&quot;"
+    assert hit["snippet"] == "&lt;script&gt;alert(1)&lt;/script&gt; builds <mark>fintech</mark> &amp; payments"
+
+    (hit,) = _search(client, "fin")["results"]
+    assert hit["company_highlight"] == "&lt;b&gt;<mark>Fin</mark>&lt;/b&gt; &amp; Co"
+
+
+def test_brief_text_is_searchable(client, sessions):
+    role_id = _create(client, "Acme")
+    with sessions() as db:
+        db.add(AnalysisJob(role_id=role_id, status="complete", result=json.dumps({
+            "company_briefing": "Builds <b>observability</b> tooling", "recent_signals": ["Series B"],
+        })))
+        db.commit()
+
+    (hit,) = _search(client, "observability")["results"]
+    assert hit["role_id"] == role_id
+    assert "&lt;b&gt;<mark>observability</mark>&lt;/b&gt;" in hit["snippet"]
+
+
+def test_phrases_prefixes_and_paging(client):
+    ids = [_create(client, f"Fintech {n}", notes="open banking platform") for n in range(5)]
+    _create(client, "Banking Open")
+
+    assert {hit["role_id"] for hit in _search(client, '"open banking"', limit=10)["results"]} == set(ids)
+    assert len(_search(client, "fint*", limit=10)["results"]) == 5
+
+    first = _search(client, "fintech", limit=2)
+    rest  = _search(client, "fintech", limit=10, offset=first["next_offset"])
+    assert first["next_offset"] == 2 and rest["next_offset"] is None
+    assert sorted(hit["role_id"] for hit in first["results"] + rest["results"]) == ids
+
+
+def test_query_without_terms_is_rejected(client):
+    assert client.get("/search", params={"q": '""'}).status_code == 422
@@ -0,0 +1,89 @@
+"""
+test_step_updates.py — PATCH /roles/{id}/steps and PATCH /roles/steps:batch.
+"""
+
+import pytest
+
+from api.routes import roles
+from api.routes.roles import router
+
+
+@pytest.fixture
+def client(backend, make_client):
+    return make_client(router)
+
+
+def _create(client, company: str = "Acme") -> int:
+    response = client.post("/roles", json={"company": company, "role_title": "Engineer"})
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def _steps(client, role_id: int) -> dict[int, dict]:
+    return {step["step_number"]: step for step in client.get(f"/roles/{role_id}/steps").json()}
+
+
+def test_role_steps_update_together(client):
+    role_id = _create(client)
+    before  = client.get(f"/roles/{role_id}").json()["updated_at"]
+
+    response = client.patch(f"/roles/{role_id}/steps", json=[
+        {"step_number": 2, "status": "in_progress", "output_file": "brief.md"},
+        {"step_number": 1, "status": "complete"},
+    ])
+    assert response.status_code == 200, response.text
+    updated = response.json()
+    assert [step["step_number"] for step in updated] == [1, 2]
+    assert updated[0]["completed_at"] is not None
+    assert (updated[1]["status"], updated[1]["output_file"], updated[1]["completed_at"]) == \
+           ("in_progress", "brief.md", None)
+
+    steps = _steps(client, role_id)
+    assert steps[1] == updated[0] and steps[2] == updated[1]
+    assert steps[3]["status"] == "pending"
+    assert client.get(f"/roles/{role_id}").json()["updated_at"] > before
+
+    # Completing an already complete step keeps its first stamp
+    again = client.patch(f"/roles/{role_id}/steps", json=[{"step_number": 1, "status": "complete"}])
+    assert again.json()[0]["completed_at"] == updated[0]["completed_at"]
+
+
+def test_batch_updates_steps_across_roles(client):
+    acme, globex = _create(client, "Acme"), _create(client, "Globex")
+    response = client.patch("/roles/steps:batch", json=[
+        {"role_id": globex, "step_number": 1, "status": "skipped"},
+        {"role_id": acme,   "step_number": 3, "status": "complete"},
+        {"role_id": acme,   "step_number": 1, "output_file": "notes.md"},
+    ])
+    assert response.status_code == 200, response.text
+    assert [(step["role_id"], step["step_number"]) for step in response.json()] == \
+           [(acme, 1), (acme, 3), (globex, 1)]
+
+    assert _steps(client, acme)[1]["output_file"] == "notes.md"
+    assert _steps(client, acme)[1]["status"] == "pending"   # fields left out are untouched
+    assert _steps(client, acme)[3]["completed_at"] is not None
+    assert _steps(client, globex)[1]["status"] == "skipped"
+    assert client.patch("/roles/steps:batch", json=[]).json() == []
+
+
+@pytest.mark.parametrize("items, status, detail", [
+    ([{"step_number": 1, "status": "complete"}, {"step_number": 99, "status": "complete"}],
+     404, "step 99"),
+    ([{"step_number": 1, "status": "complete"}, {"step_number": 1, "status": "skipped"}],
+     422, "Duplicate step updates"),
+])
+def test_nothing_is_written_when_any_item_fails(client, items, status, detail):
+    role_id  = _create(client)
+    response = client.patch("/roles/steps:batch", json=[{"role_id": role_id, **item} for item in items])
+    assert response.status_code == status
+    assert detail in response.json()["detail"]
+    assert _steps(client, role_id)[1]["status"] == "pending"
+
+
+def test_limits_and_unknown_role(client, monkeypatch):
+    role_id = _create(client)
+    assert client.patch("/roles/999999/steps", json=[{"step_number": 1, "status": "complete"}]).status_code == 404
+
+    monkeypatch.setattr(roles, "_BULK_STEPS_MAX", 2)
+    too_many = [{"step_number": n, "status": "complete"} for n in (1, 2, 3)]
+    assert client.patch(f"/roles/{role_id}/steps", json=too_many).status_code == 422